@@ -1,93 +1,210 @@
+import time
+STARTUP_T0 = time.perf_counter() # Início do processo, para o relatório de partida
+
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import configparser
-import pygame
-import pyautogui
-import time
-from ctypes import windll, Structure, c_long, byref
+from ctypes import windll
 import threading
 import os
 
+from pygopher.engine import (
+    GopherEngine, EngineListener, INPUT_MODES, INPUT_MODE_POLLING, SPEED_MED_MULTIPLIER,
+)
+from pygopher.output import create_default_sink
+from pygopher.motion import VirtualCursor, Win32CursorBackend
+from pygopher.metrics import STAGE_FRAME, STAGE_INPUT_TO_INJECT
+from pygopher.session import SessionRecorder
+from pygopher.config import DEFAULT_MAPPINGS, apply_config
+from pygopher.bindings import DEFAULT_TIMED_BINDINGS
+from pygopher.devices import DeviceManager, format_hotplug, MAX_BUTTONS
+from pygopher.curves import DEFAULT_CURVE, AXIS_MAX
+from pygopher.filters import DEFAULT_FILTERS
+from pygopher.scroll import DEFAULT_SCROLL
+from pygopher.sources import DEFAULT_SOURCE_SETTINGS, SOURCE_PYGAME
+from pygopher.uichannel import UpdateChannel
+from pygopher.persist import ConfigWriter
+from pygopher.profiles import DEFAULT_PROFILE_SETTINGS, AutoSwitcher, create_foreground_detector, load_profile_set
+from pygopher.startup import StartupReport
+from pygopher.trace import FrameTracer
+from pygopher.telemetry import TelemetryRing
+from pygopher.remote import DEFAULT_PROCESS_SETTINGS, EngineProcess
+from pygopher.reload import DEFAULT_RELOAD_SETTINGS, ConfigWatcher
+
 # --- Configurações Globais ---
 CONFIG_FILE = 'gopher_config.ini'
-DEAD_ZONE = 4000  # Limiar para movimento do analógico (evita drift)
-SCROLL_DEAD_ZONE = 5000 # Limiar para rolagem do analógico
-FPS = 150 # Frames por segundo para o loop do controle
-SLEEP_AMOUNT = 1.0 / FPS # Tempo de espera entre cada iteração do loop
-
-# Estrutura para obter a posição do cursor do mouse (Windows API)
-class POINT(Structure):
-    _fields_ = [("x", c_long), ("y", c_long)]
+LOOP_STATS_REFRESH_MS = 1000 # Intervalo de atualização das estatísticas do loop na interface
+UI_DRAIN_MS = 50 # Intervalo de consumo das mensagens do thread do controle
+VISUALIZER_REFRESH_MS = 50 # Intervalo de redesenho do visualizador da aba de Status
+
+# --- Visualizador da Aba de Status ---
+class TelemetryView:
+    """Canvas do visualizador: analógico sobre as zonas mortas, tempo de frame e botões.
+
+    Os itens do canvas são criados uma única vez; cada redesenho só muda coordenadas e,
+    para os botões que mudaram, cores. Os dados vêm de um TelemetryRing (pygopher.telemetry).
+    """
+    STICK_SIZE = 140 # Lado do quadro do analógico (px)
+    GRAPH_WIDTH = 300 # Largura do gráfico de tempo de frame (px)
+    GRAPH_SAMPLES = 150 # Frames mostrados no gráfico (1 s a 150 FPS)
+    GRAPH_MIN_SCALE_NS = 200000 # Topo mínimo do gráfico: frames rápidos não viram ruído ampliado
+    BUTTON_COLUMNS = 8
+    BUTTON_STEP = 16 # Distância entre dois botões (px)
+    HEIGHT = 160
+    DOT_RADIUS = 4
+
+    def __init__(self, parent):
+        width = self.STICK_SIZE + self.GRAPH_WIDTH + self.BUTTON_COLUMNS * self.BUTTON_STEP + 40
+        self.canvas = canvas = tk.Canvas(parent, width=width, height=self.HEIGHT, background="white",
+                                         highlightthickness=0)
+        self.written = -1 # Contagem do TelemetryRing no último redesenho
+        self.curve = None # Curva cujas zonas mortas estão desenhadas
+        self.mask = None # Máscara de botões desenhada
+
+        # Analógico esquerdo: curso inteiro, zonas mortas, leitura bruta (cinza) e filtrada (azul)
+        half = self.STICK_SIZE / 2
+        self.center = center = half + 5
+        self.radius = radius = half - 5
+        canvas.create_oval(center - radius, center - radius, center + radius, center + radius, outline="gray")
+        canvas.create_line(center - radius, center, center + radius, center, fill="#ddd")
+        canvas.create_line(center, center - radius, center, center + radius, fill="#ddd")
+        self.dead_zone_oval = canvas.create_oval(0, 0, 0, 0, outline="orange", dash=(3, 2))
+        self.dead_zone_square = canvas.create_rectangle(0, 0, 0, 0, outline="orange", dash=(3, 2), state="hidden")
+        self.outer_dead_zone = canvas.create_oval(0, 0, 0, 0, outline="orange", state="hidden")
+        self.raw_dot = canvas.create_oval(0, 0, 0, 0, fill="gray", outline="")
+        self.stick_dot = canvas.create_oval(0, 0, 0, 0, fill="blue", outline="")
+        self.stick_text = canvas.create_text(5, self.HEIGHT - 8, anchor=tk.W, text="")
+
+        # Tempo de frame dos últimos GRAPH_SAMPLES frames, com escala automática
+        self.graph_left = left = self.STICK_SIZE + 15
+        self.graph_bottom = bottom = self.HEIGHT - 20
+        canvas.create_rectangle(left, 5, left + self.GRAPH_WIDTH, bottom, outline="gray")
+        self.graph_line = canvas.create_line(left, bottom, left, bottom, fill="green")
+        self.graph_text = canvas.create_text(left, self.HEIGHT - 8, anchor=tk.W, text="")
+
+        # Botões (bit i = botão i) e, na última linha, os gatilhos
+        origin = left + self.GRAPH_WIDTH + 15
+        self.buttons = []
+        for bit in range(MAX_BUTTONS + 2):
+            row, column = divmod(bit, self.BUTTON_COLUMNS)
+            x, y = origin + column * self.BUTTON_STEP, 5 + row * self.BUTTON_STEP
+            self.buttons.append(canvas.create_rectangle(x, y, x + self.BUTTON_STEP - 4, y + self.BUTTON_STEP - 4,
+                                                        outline="gray", fill=""))
+        trigger_y = 5 + ((MAX_BUTTONS + 1) // self.BUTTON_COLUMNS) * self.BUTTON_STEP + 6
+        for bit, label in ((MAX_BUTTONS, "LT"), (MAX_BUTTONS + 1, "RT")):
+            x = origin + (bit % self.BUTTON_COLUMNS) * self.BUTTON_STEP + (self.BUTTON_STEP - 4) / 2
+            canvas.create_text(x, trigger_y + self.BUTTON_STEP, text=label, font=("TkDefaultFont", 7))
+
+    def update(self, samples, written, curve):
+        """Redesenha a partir das amostras do TelemetryRing (da mais antiga à mais nova)."""
+        self.written = written
+        if not samples:
+            return
+        canvas = self.canvas
+        _, raw_x, raw_y, stick_x, stick_y, frame_ns, mask = samples[-1]
+        if curve is not self.curve:
+            self._draw_dead_zones(curve)
+        center, radius, dot = self.center, self.radius, self.DOT_RADIUS
+        x, y = center + raw_x * radius, center + raw_y * radius
+        canvas.coords(self.raw_dot, x - dot, y - dot, x + dot, y + dot)
+        x, y = center + stick_x * radius, center + stick_y * radius
+        canvas.coords(self.stick_dot, x - dot, y - dot, x + dot, y + dot)
+        canvas.itemconfigure(self.stick_text, text=f"({stick_x:+.2f}, {stick_y:+.2f})")
+
+        frames = [sample[5] for sample in samples[-self.GRAPH_SAMPLES:]]
+        peak = max(frames)
+        scale = max(peak, self.GRAPH_MIN_SCALE_NS)
+        step = self.GRAPH_WIDTH / (self.GRAPH_SAMPLES - 1)
+        left, bottom, height = self.graph_left, self.graph_bottom, self.graph_bottom - 10
+        start = left + (self.GRAPH_SAMPLES - len(frames)) * step # Poucas amostras ficam à direita
+        coords = []
+        for i, value in enumerate(frames):
+            coords.append(start + i * step)
+            coords.append(bottom - value * height / scale)
+        if len(coords) == 2:
+            coords.extend(coords) # Uma linha precisa de dois pontos
+        canvas.coords(self.graph_line, *coords)
+        canvas.itemconfigure(self.graph_text, text=f"Frame: último {frame_ns / 1000:.0f} µs - "
+                                                   f"máx {peak / 1000:.0f} µs (topo {scale / 1000:.0f} µs)")
+
+        if mask != self.mask:
+            changed = -1 if self.mask is None else mask ^ self.mask # -1: todos os bits
+            for bit, item in enumerate(self.buttons):
+                if changed >> bit & 1:
+                    canvas.itemconfigure(item, fill="green" if mask >> bit & 1 else "")
+            self.mask = mask
+
+    def _draw_dead_zones(self, curve):
+        """Posiciona a zona morta (círculo se radial, quadrado se por eixo) e a zona morta externa."""
+        canvas = self.canvas
+        center, radius = self.center, self.radius
+        inner = radius * curve.dead_zone / AXIS_MAX
+        box = (center - inner, center - inner, center + inner, center + inner)
+        canvas.coords(self.dead_zone_oval, *box)
+        canvas.coords(self.dead_zone_square, *box)
+        canvas.itemconfigure(self.dead_zone_oval, state="normal" if curve.radial else "hidden")
+        canvas.itemconfigure(self.dead_zone_square, state="hidden" if curve.radial else "normal")
+        outer = radius * (AXIS_MAX - curve.outer_dead_zone) / AXIS_MAX
+        canvas.coords(self.outer_dead_zone, center - outer, center - outer, center + outer, center + outer)
+        canvas.itemconfigure(self.outer_dead_zone, state="normal" if curve.outer_dead_zone else "hidden")
+        self.curve = curve
 
 # --- Classe Principal da Aplicação ---
-class Gopher360App:
-    def __init__(self, root):
+class Gopher360App(EngineListener):
+    def __init__(self, root, startup=None):
         self.root = root
         self.root.title("Gopher360 - Python")
         self.root.geometry("800x600")
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing) # Garante que o thread pare ao fechar
 
         # Variáveis de estado da aplicação
-        self.running = False
-        self.disabled = False
         self.hidden = False
         self.controller_thread = None
-
-        # Configurações de velocidade do mouse
-        self.base_speed = 0.000002 # Reduzida drasticamente para testar uma sensibilidade muito baixa
-        self.sensitivity_multiplier = 1.0 # Multiplicador de sensibilidade ajustável pelo usuário
-        self.current_speed = self.base_speed * self.sensitivity_multiplier
-
-        self.SPEED_LOW_MULTIPLIER = 0.5 # Multiplicador para velocidade 'Baixa'
-        self.SPEED_MED_MULTIPLIER = 1.0 # Multiplicador para velocidade 'Média'
-        self.SPEED_HIGH_MULTIPLIER = 2.0 # Multiplicador para velocidade 'Alta'
-
-
-        # Mapeamentos padrão dos botões do controle para ações
-        # IMPORTANTE: mouse_left/right/middle e outros usam os índices de botões do Pygame (0, 1, 2, etc.)
-        # Outros mapeamentos (dpad_up, start, etc.) usam códigos de tecla virtuais do Windows (hex)
-        self.default_mappings = {
-            # Cliques do mouse (usando índices de botões do Pygame)
-            'mouse_left': '0x0',    # Botão 'A' (índice 0)
-            'mouse_right': '0x1',   # Botão 'B' (índice 1)
-            'mouse_middle': '0x2',  # Botão 'X' (índice 2)
-
-            # Funções do Gopher360
-            'hide_window': '0x7A', # F11
-            'disable_gopher': '0x24', # Home
-            'speed_change': '0x21', # Page Up
-
-            # Mapeamentos de teclas (usando códigos de tecla virtuais do Windows)
-            'dpad_up': '0x26',      # Seta para cima
-            'dpad_down': '0x28',    # Seta para baixo
-            'dpad_left': '0x25',    # Seta para esquerda
-            'dpad_right': '0x27',   # Seta para direita
-            'start': '0x0D',        # Enter
-            'back': '0x08',         # Backspace
-            'left_thumb': '0x71',   # F2
-            'right_thumb': '0x72',  # F3
-            'left_shoulder': '0xA0', # Shift esquerdo
-            'right_shoulder': '0xA1', # Shift direito
-            'a_button': '0x0',      # Ação separada para 'A' se não for clique do mouse
-            'b_button': '0x0',      # Ação separada para 'B' se não for clique do mouse
-            'x_button': '0x0',      # Ação separada para 'X' se não for clique do mouse
-            'y_button': '0x0',      # Ação separada para 'Y' se não for clique do mouse
-            'left_trigger': '0x20', # Espaço
-            'right_trigger': '0x08' # Backspace (exemplo, você pode mudar)
-        }
-
-        # Inicializa Pygame para o controle
-        pygame.init()
-        pygame.joystick.init()
-        self.joystick = None
+        self.engine_process = None # EngineProcess enquanto o motor roda em um processo separado (engine_process = true)
+        self.recorder = None # Gravação de sessão em andamento (SessionRecorder)
+        self.config_tab_built = False # A aba de Configurações só é montada quando aberta pela primeira vez
+        self.startup = startup if startup is not None else StartupReport()
+        # Mensagens do thread do controle para a interface (consumidas em _drain_ui_channel)
+        self.ui_channel = UpdateChannel()
+        # Gravação do .ini em segundo plano, agrupada e atômica: nenhum I/O de disco nos threads da interface e do controle
+        self.persist = ConfigWriter(CONFIG_FILE)
+        self.persist_error_shown = None # Última falha de gravação já avisada ao usuário
+
+        # Motor de entrada: lê o controle e injeta mouse/teclado (estado de execução, velocidade e bindings)
+        self.engine = GopherEngine(create_default_sink(), VirtualCursor(Win32CursorBackend()), listener=self)
+
+        # Mapeamentos padrão dos botões do controle para ações (ver pygopher.config.DEFAULT_MAPPINGS)
+        # e parâmetros padrão da curva de resposta, dos filtros, da rolagem, dos perfis e das ações com tempo
+        # (editados só no .ini)
+        self.default_mappings = dict(DEFAULT_MAPPINGS, **DEFAULT_CURVE, **DEFAULT_FILTERS, **DEFAULT_SCROLL,
+                                     **DEFAULT_PROFILE_SETTINGS, **DEFAULT_SOURCE_SETTINGS,
+                                     **DEFAULT_TIMED_BINDINGS, **DEFAULT_PROCESS_SETTINGS, **DEFAULT_RELOAD_SETTINGS)
+
+        # O Pygame só é importado e inicializado depois que a janela aparece (ver _init_pygame)
+        self.pygame = None
+        self.devices = None # DeviceManager: controles abertos, conectados e removidos a quente
 
         # Variáveis StringVar para atualização da GUI
         self.status_var = tk.StringVar(value="Iniciando...")
         self.control_status_var = tk.StringVar(value="Nenhum controle conectado")
         self.gopher_status_var = tk.StringVar(value="Inativo")
         # Ajustei para 6 casas decimais para mostrar a sensibilidade super baixa
-        self.speed_var = tk.StringVar(value=f"Velocidade: Média ({self.current_speed:.6f})")
+        self.speed_var = tk.StringVar(value=f"Velocidade: Média ({self.engine.current_speed:.6f})")
         self.disabled_var = tk.StringVar(value="Gopher: Habilitado")
+        self.input_mode_var = tk.StringVar(value=self.engine.input_mode)
+        self.loop_stats_var = tk.StringVar(value="Loop: parado")
+        self.frame_latency_var = tk.StringVar(value="Frame: sem amostras")
+        self.input_latency_var = tk.StringVar(value="Entrada → injeção: sem amostras")
+        self.startup_var = tk.StringVar(value="Partida: medindo...")
+        self.persist_var = tk.StringVar(value="Gravação: nenhuma")
+        self.profile_var = tk.StringVar(value=self.engine.profile.name)
+        self.profile_combo = None # Combobox de perfis da aba de Status (criado em _create_status_tab)
+        self.trace_var = tk.BooleanVar(value=False) # Perfil de frames ligado (não é salvo no .ini)
+        self.tracer = None # Último FrameTracer criado; continua disponível para exportar depois de desligado
+        self.telemetry_var = tk.BooleanVar(value=False) # Visualizador da aba de Status ligado (não é salvo no .ini)
+        self.telemetry = None # TelemetryRing do motor no mesmo processo (o do processo separado é do EngineProcess)
+        self.telemetry_view = None # TelemetryView (criado em _create_status_tab)
+        self.telemetry_job = None # Próximo redesenho agendado com root.after
 
         # ConfigParser para carregar/salvar configurações
         # NOTA: self.config é inicializado aqui, mas pode ser re-inicializado em load_config
@@ -95,35 +212,63 @@ class Gopher360App:
         self.config = configparser.ConfigParser()
         self.load_config() # Carrega configurações ou cria o arquivo padrão
 
+        # Recarga a quente do .ini editado fora do programa: lido e compilado no thread do vigia,
+        # instalado em _drain_ui_channel (ver pygopher.reload)
+        self.config_watcher = None
+        if self.config.getboolean('DEFAULT', 'config_hot_reload', fallback=True):
+            self.config_watcher = ConfigWatcher(
+                CONFIG_FILE, lambda config, profile_set: self.ui_channel.post('config_reload', (config, profile_set)),
+                lambda message: self.ui_channel.post('config_error', message),
+                writer=self.persist, defaults=self.default_mappings)
+            self.config_watcher.start()
+
+        # Troca automática de perfil pelo aplicativo em primeiro plano (chaves apps das seções [profile:...])
+        self.auto_switcher = None
+        self._start_auto_switcher()
+
         # Cria a interface do usuário
         self.create_widgets()
 
-        # Tenta conectar ao controle após a interface estar pronta
-        self.connect_controller()
-        self.status_var.set("Pronto")
+        self.startup.mark("janela")
+
+        # Conecta ao controle só depois que a janela for desenhada, para ela aparecer sem esperar o Pygame
+        self.root.after_idle(self._finish_startup)
+
+        # Atualiza as estatísticas do loop periodicamente, a partir do thread da interface
+        self.root.after(LOOP_STATS_REFRESH_MS, self._refresh_loop_stats)
+        self.root.after(UI_DRAIN_MS, self._drain_ui_channel)
 
     def create_widgets(self,):
         """Cria e organiza todos os widgets da interface gráfica."""
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
 
-        # Aba de Configurações
-        config_frame = ttk.Frame(notebook)
-        notebook.add(config_frame, text="Configurações")
-        self._create_config_tab(config_frame)
+        # Aba de Configurações (montada sob demanda em _on_tab_changed)
+        self.config_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.config_frame, text="Configurações")
 
         # Aba de Status
-        status_frame = ttk.Frame(notebook)
-        notebook.add(status_frame, text="Status")
-        self._create_status_tab(status_frame)
+        self.status_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.status_frame, text="Status")
+        self._create_status_tab(self.status_frame)
+
+        # Começa na aba de Status; a de Configurações é construída na primeira vez que for aberta
+        self.notebook.select(self.status_frame)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Barra de status na parte inferior da janela
         status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, pady=(2,0))
 
+    def _on_tab_changed(self, event=None):
+        """Monta a aba de Configurações na primeira vez que ela é selecionada."""
+        if not self.config_tab_built and self.notebook.select() == str(self.config_frame):
+            self._create_config_tab(self.config_frame)
+            self.config_tab_built = True
+
     def _create_config_tab(self, parent):
         """Cria os widgets para a aba de Configurações."""
         canvas = tk.Canvas(parent)
@@ -227,7 +372,7 @@ class Gopher360App:
         control_frame = ttk.LabelFrame(parent, text="Status do Controle", padding="10")
         control_frame.pack(fill=tk.X, pady=5)
         ttk.Label(control_frame, textvariable=self.control_status_var).pack(pady=2)
-        ttk.Button(control_frame, text="Reconectar Controle", command=self.connect_controller).pack(pady=5)
+        ttk.Button(control_frame, text="Procurar Controles", command=self.connect_controller).pack(pady=5)
 
         # Status do Gopher
         gopher_frame = ttk.LabelFrame(parent, text="Status do Gopher", padding="10")
@@ -241,35 +386,107 @@ class Gopher360App:
         self.stop_button = ttk.Button(button_frame, text="Parar Gopher", command=self.stop_gopher, state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=5)
 
+        mode_frame = ttk.Frame(gopher_frame)
+        mode_frame.pack(pady=2)
+        ttk.Label(mode_frame, text="Motor de entrada:").pack(side=tk.LEFT, padx=5)
+        mode_combo = ttk.Combobox(mode_frame, textvariable=self.input_mode_var, state="readonly", width=10,
+                                  values=INPUT_MODES)
+        mode_combo.pack(side=tk.LEFT, padx=5)
+        mode_combo.bind("<<ComboboxSelected>>", self._on_input_mode_selected)
+
+        profile_frame = ttk.Frame(gopher_frame)
+        profile_frame.pack(pady=2)
+        ttk.Label(profile_frame, text="Perfil:").pack(side=tk.LEFT, padx=5)
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var, state="readonly", width=16,
+                                          values=self.engine.profile_set.order)
+        self.profile_combo.pack(side=tk.LEFT, padx=5)
+        self.profile_combo.bind("<<ComboboxSelected>>", self._on_profile_selected)
+
+        self.record_button = ttk.Button(gopher_frame, text="Gravar Sessão", command=self.toggle_recording)
+        self.record_button.pack(pady=5)
+
         # Configurações Atuais
         settings_frame = ttk.LabelFrame(parent, text="Configurações Atuais", padding="10")
         settings_frame.pack(fill=tk.X, pady=5)
         ttk.Label(settings_frame, textvariable=self.speed_var).pack(anchor=tk.W, pady=2)
         ttk.Label(settings_frame, textvariable=self.disabled_var).pack(anchor=tk.W, pady=2)
+        ttk.Label(settings_frame, textvariable=self.loop_stats_var).pack(anchor=tk.W, pady=2)
+        ttk.Label(settings_frame, textvariable=self.frame_latency_var).pack(anchor=tk.W, pady=2)
+        ttk.Label(settings_frame, textvariable=self.input_latency_var).pack(anchor=tk.W, pady=2)
+        ttk.Button(settings_frame, text="Exportar Latências", command=self.export_latencies).pack(anchor=tk.W, pady=5)
+        trace_frame = ttk.Frame(settings_frame)
+        trace_frame.pack(anchor=tk.W, pady=2)
+        ttk.Checkbutton(trace_frame, text="Perfil de frames", variable=self.trace_var,
+                        command=self._on_trace_toggled).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(trace_frame, text="Exportar Trace", command=self.export_trace).pack(side=tk.LEFT)
+        ttk.Label(settings_frame, textvariable=self.startup_var).pack(anchor=tk.W, pady=2)
+        ttk.Label(settings_frame, textvariable=self.persist_var).pack(anchor=tk.W, pady=2)
+
+        # Visualizador: o canvas só ocupa espaço na aba enquanto estiver ligado
+        visualizer_frame = ttk.LabelFrame(parent, text="Visualizador", padding="10")
+        visualizer_frame.pack(fill=tk.X, pady=5)
+        ttk.Checkbutton(visualizer_frame, text="Mostrar analógico, tempo de frame e botões",
+                        variable=self.telemetry_var, command=self._on_telemetry_toggled).pack(anchor=tk.W)
+        self.telemetry_view = TelemetryView(visualizer_frame)
+
+    def _finish_startup(self):
+        """Segunda fase da partida: inicializa o Pygame e conecta o controle com a janela já visível."""
+        self.connect_controller()
+        self.startup.mark("controle")
+        self.startup_var.set(f"Partida: {self.startup.format()}")
+        self.status_var.set("Pronto")
+
+    def _init_pygame(self):
+        """Importa o Pygame e inicializa só o necessário para ler o controle."""
+        if self.pygame is None:
+            os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+            import pygame
+            # Vídeo é exigido pela fila de eventos (event.pump); áudio, fontes etc. ficam de fora
+            pygame.display.init()
+            pygame.joystick.init()
+            self.pygame = pygame
+            input_source = self.config.get('DEFAULT', 'input_source', fallback=SOURCE_PYGAME)
+            self.devices = DeviceManager(pygame, self.engine.cursor.backend, input_source)
+            if self.devices.source_error:
+                self.status_var.set(f"XInput indisponível ({self.devices.source_error}); usando o Pygame.")
+        return self.pygame
 
     def connect_controller(self):
-        """Tenta inicializar ou reconectar o joystick."""
+        """Abre os controles conectados que ainda não estão abertos (sem reiniciar os que já estão)."""
         try:
-            pygame.joystick.quit() # Garante que não há joysticks antigos inicializados
-            pygame.joystick.init() # Re-inicializa o módulo
+            self._init_pygame()
+            if not self.engine.running:
+                self.devices.poll() # Com o loop parado, os eventos de hotplug são tratados aqui
+            self.devices.scan()
 
-            if pygame.joystick.get_count() > 0:
-                self.joystick = pygame.joystick.Joystick(0)
-                self.joystick.init()
-                self.control_status_var.set(f"Controle conectado: {self.joystick.get_name()}")
+            if self.devices.devices:
+                self._update_devices_display()
                 self.status_var.set("Controle conectado com sucesso!")
             else:
-                self.joystick = None
                 self.control_status_var.set("Nenhum controle conectado")
                 self.status_var.set("Nenhum controle encontrado.")
-        except pygame.error as e:
-            self.joystick = None
-            self.control_status_var.set(f"Erro Pygame: {e}")
-            self.status_var.set(f"Erro ao conectar controle: {e}")
         except Exception as e:
-            self.joystick = None
-            self.control_status_var.set(f"Erro: {e}")
-            self.status_var.set(f"Erro inesperado ao conectar controle: {e}")
+            # pygame.error só pode ser testado depois do import preguiçoso
+            if self.pygame is not None and isinstance(e, self.pygame.error):
+                self.control_status_var.set(f"Erro Pygame: {e}")
+                self.status_var.set(f"Erro ao conectar controle: {e}")
+            else:
+                self.control_status_var.set(f"Erro: {e}")
+                self.status_var.set(f"Erro inesperado ao conectar controle: {e}")
+
+    def _update_devices_display(self):
+        """Mostra os controles abertos, o perfil de cada um e as estatísticas de conexão."""
+        devices = self.devices.devices if self.devices is not None else ()
+        if not devices:
+            self.control_status_var.set("Nenhum controle conectado")
+            return
+        names = []
+        controller_bindings = self.engine.profile_set.controller_bindings
+        for device in devices:
+            profile = next((key for key in device.profile_keys if key in controller_bindings), None)
+            names.append(f"{device.name} ({'perfil ' + profile if profile else 'padrão'})")
+        self.control_status_var.set(f"Controles conectados: {', '.join(names)}\n"
+                                    f"{format_hotplug(self.devices.stats)}")
 
     def load_config(self):
         """Carrega as configurações do arquivo .ini ou cria um novo com padrões."""
@@ -300,65 +517,98 @@ class Gopher360App:
             for key, value in self.default_mappings.items():
                 self.config['DEFAULT'][key] = value
             self.config['DEFAULT']['sensitivity_multiplier'] = str(1.0) # Salva a sensibilidade padrão
+            self.config['DEFAULT']['input_mode'] = INPUT_MODE_POLLING
+            self.engine.input_mode = INPUT_MODE_POLLING
 
-            self.sensitivity_multiplier = 1.0 # Reseta para padrão
-            self.current_speed = self.base_speed * self.sensitivity_multiplier
+            self.engine.set_sensitivity(1.0) # Reseta para padrão
             self.update_speed_display()
 
-            # Tenta salvar o novo arquivo de configuração padrão
-            try:
-                with open(CONFIG_FILE, 'w') as configfile:
-                    self.config.write(configfile)
-                self.status_var.set("Arquivo de configuração padrão criado e carregado.")
-            except Exception as write_e:
-                messagebox.showerror("Erro de Escrita", f"Não foi possível salvar o novo arquivo de configuração padrão. Verifique as permissões. Erro: {write_e}")
-                self.status_var.set("Falha ao criar arquivo de configuração padrão.")
+            # Agenda a gravação do novo arquivo de configuração padrão (falhas aparecem em _check_persist_error)
+            self.persist.replace(self.config)
+            self.status_var.set("Arquivo de configuração padrão criado e carregado.")
         else:
             # O arquivo foi lido e a seção DEFAULT existe.
             # Garante que todos os mapeamentos padrão existam (para compatibilidade futura)
+            changed = False
             for key, value in self.default_mappings.items():
                 if not self.config.has_option('DEFAULT', key):
                     self.config['DEFAULT'][key] = value # Adiciona se estiver faltando
+                    changed = True
 
             # Carrega a sensibilidade salva
-            self.sensitivity_multiplier = self.config.getfloat('DEFAULT', 'sensitivity_multiplier', fallback=1.0)
-            self.current_speed = self.base_speed * self.sensitivity_multiplier
+            self.engine.set_sensitivity(self.config.getfloat('DEFAULT', 'sensitivity_multiplier', fallback=1.0))
+            input_mode = self.config.get('DEFAULT', 'input_mode', fallback=INPUT_MODE_POLLING)
+            self.engine.input_mode = input_mode if input_mode in INPUT_MODES else INPUT_MODE_POLLING
+            if input_mode != self.engine.input_mode or not self.config.has_option('DEFAULT', 'input_mode'):
+                self.config['DEFAULT']['input_mode'] = self.engine.input_mode
+                changed = True
+            self.input_mode_var.set(self.engine.input_mode)
             self.update_speed_display()
 
-            # Salva o arquivo novamente para garantir que quaisquer novas chaves padrão foram adicionadas
-            try:
-                with open(CONFIG_FILE, 'w') as configfile:
-                    self.config.write(configfile)
-                self.status_var.set("Configurações carregadas e atualizadas com sucesso.")
-            except Exception as write_e:
-                messagebox.showwarning("Aviso", f"Não foi possível salvar a atualização das configurações. Erro: {write_e}")
-                self.status_var.set("Configurações carregadas, mas falha ao salvar atualizações.")
-
+            # Só reescreve o arquivo se alguma chave foi adicionada ou corrigida (evita I/O na partida)
+            if not changed:
+                self.persist.load(self.config) # Base das próximas gravações parciais (set), sem reescrever o arquivo
+                self.status_var.set("Configurações carregadas com sucesso.")
+                # As tabelas das curvas vêm do cache em disco (o resto da compilação leva ~1 ms)
+                self._rebuild_bindings(load_profile_set(CONFIG_FILE, self.config))
+                return
+            self.persist.replace(self.config)
+            self.status_var.set("Configurações carregadas e atualizadas com sucesso.")
+
+        self._rebuild_bindings()
+
+    def _rebuild_bindings(self, profile_set=None):
+        """Compila self.config (perfis, bindings, curva e filtros) e publica o resultado para o loop do controle."""
+        # Cada tabela é trocada com uma única atribuição: o thread do controle vê a antiga ou a nova,
+        # nunca um estado parcial
+        profile_set = apply_config(self.engine, self.config, profile_set)
+        # Com o motor em outro processo, ele recebe a configuração já compilada (só troca referências lá)
+        self._send_to_engine_process('config', (profile_set, self.engine.sensitivity_multiplier))
+        if profile_set.errors:
+            self.status_var.set(f"Erro: {profile_set.errors[0]}")
+        if self.profile_combo is not None:
+            self.profile_combo.configure(values=profile_set.order)
+
+
+    def _apply_reloaded_config(self, config, profile_set):
+        """Instala a configuração recarregada do .ini, já validada e compilada pelo vigia."""
+        self.config = config
+        self.persist.load(config) # Senão um set() posterior regravaria o .ini com a versão anterior à edição
+        self._rebuild_bindings(profile_set) # Só troca referências no motor (e envia ao processo separado)
+        self.input_mode_var.set(self.engine.input_mode)
+        self.update_speed_display()
+        if self.config_tab_built:
+            self._fill_config_entries()
+        self.status_var.set(f"Configuração recarregada de {CONFIG_FILE} ({len(profile_set.order)} perfis).")
 
-    def save_config(self):
-        """Salva as configurações atuais no arquivo .ini."""
+    def save_config(self, notify=True):
+        """Aplica as configurações da interface e agenda a gravação do arquivo .ini."""
         try:
-            # Atualiza os valores do config com os da interface
-            self.config['DEFAULT']['mouse_left'] = self.mouse_left_entry.get()
-            self.config['DEFAULT']['mouse_right'] = self.mouse_right_entry.get()
-            self.config['DEFAULT']['mouse_middle'] = self.mouse_middle_entry.get()
-            self.config['DEFAULT']['hide_window'] = self.hide_window_entry.get()
-            self.config['DEFAULT']['disable_gopher'] = self.disable_gopher_entry.get()
-            self.config['DEFAULT']['speed_change'] = self.speed_change_entry.get()
+            # Atualiza os valores do config com os da interface (se a aba já foi montada)
+            if self.config_tab_built:
+                self.config['DEFAULT']['mouse_left'] = self.mouse_left_entry.get()
+                self.config['DEFAULT']['mouse_right'] = self.mouse_right_entry.get()
+                self.config['DEFAULT']['mouse_middle'] = self.mouse_middle_entry.get()
+                self.config['DEFAULT']['hide_window'] = self.hide_window_entry.get()
+                self.config['DEFAULT']['disable_gopher'] = self.disable_gopher_entry.get()
+                self.config['DEFAULT']['speed_change'] = self.speed_change_entry.get()
 
-            # Salva todos os mapeamentos de teclas dinamicamente
-            for key, entry in self.entry_widgets.items():
-                self.config['DEFAULT'][key] = entry.get()
+                # Salva todos os mapeamentos de teclas dinamicamente
+                for key, entry in self.entry_widgets.items():
+                    self.config['DEFAULT'][key] = entry.get()
 
-            # Salva a sensibilidade atual
-            self.config['DEFAULT']['sensitivity_multiplier'] = str(self.sensitivity_multiplier)
+            # Salva a sensibilidade atual e o motor de entrada
+            self.config['DEFAULT']['sensitivity_multiplier'] = str(self.engine.sensitivity_multiplier)
+            self.config['DEFAULT']['input_mode'] = self.engine.input_mode
 
-            # Escreve no arquivo
-            with open(CONFIG_FILE, 'w') as configfile:
-                self.config.write(configfile)
+            self._rebuild_bindings()
+
+            # A escrita acontece em segundo plano (falhas aparecem em _check_persist_error)
+            self.persist.replace(self.config)
 
             self.status_var.set("Configurações salvas com sucesso!")
-            messagebox.showinfo("Sucesso", "Configurações salvas com sucesso!")
+            if notify:
+                messagebox.showinfo("Sucesso", "Configurações salvas com sucesso!")
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao salvar configurações: {str(e)}")
             self.status_var.set("Erro ao salvar configurações.")
@@ -373,314 +623,434 @@ class Gopher360App:
             # Re-inicializa o config parser para garantir um estado limpo para os padrões
             self.config = configparser.ConfigParser()
 
-            # Popula a interface e o objeto config com os valores padrão
-            self.mouse_left_entry.delete(0, tk.END)
-            self.mouse_left_entry.insert(0, self.default_mappings['mouse_left'])
-            self.config['DEFAULT']['mouse_left'] = self.default_mappings['mouse_left']
-
-            self.mouse_right_entry.delete(0, tk.END)
-            self.mouse_right_entry.insert(0, self.default_mappings['mouse_right'])
-            self.config['DEFAULT']['mouse_right'] = self.default_mappings['mouse_right']
-
-            self.mouse_middle_entry.delete(0, tk.END)
-            self.mouse_middle_entry.insert(0, self.default_mappings['mouse_middle'])
-            self.config['DEFAULT']['mouse_middle'] = self.default_mappings['mouse_middle']
-
-            self.hide_window_entry.delete(0, tk.END)
-            self.hide_window_entry.insert(0, self.default_mappings['hide_window'])
-            self.config['DEFAULT']['hide_window'] = self.default_mappings['hide_window']
-
-            self.disable_gopher_entry.delete(0, tk.END)
-            self.disable_gopher_entry.insert(0, self.default_mappings['disable_gopher'])
-            self.config['DEFAULT']['disable_gopher'] = self.default_mappings['disable_gopher']
-
-            self.speed_change_entry.delete(0, tk.END)
-            self.speed_change_entry.insert(0, self.default_mappings['speed_change'])
-            self.config['DEFAULT']['speed_change'] = self.default_mappings['speed_change']
-
-            for key, entry in self.entry_widgets.items():
-                entry.delete(0, tk.END)
-                entry.insert(0, self.default_mappings[key])
-                self.config['DEFAULT'][key] = self.default_mappings[key]
+            # Popula o objeto config com os valores padrão
+            for key, value in self.default_mappings.items():
+                self.config['DEFAULT'][key] = value
+            # E a interface, se a aba de Configurações já foi montada
+            if self.config_tab_built:
+                self._fill_config_entries()
 
 
-            self.sensitivity_multiplier = 1.0 # Reseta sensibilidade para o padrão
-            self.current_speed = self.base_speed * self.sensitivity_multiplier
+            self.engine.set_sensitivity(1.0) # Reseta sensibilidade para o padrão
             self.update_speed_display()
-            self.config['DEFAULT']['sensitivity_multiplier'] = str(self.sensitivity_multiplier)
+            self.config['DEFAULT']['sensitivity_multiplier'] = str(self.engine.sensitivity_multiplier)
+
+            self.engine.input_mode = INPUT_MODE_POLLING
+            self.input_mode_var.set(self.engine.input_mode)
+            self.config['DEFAULT']['input_mode'] = self.engine.input_mode
 
             self.status_var.set("Padrões carregados na interface.")
             # Salva automaticamente os padrões
-            self.save_config()
+            self.save_config(notify=False)
             messagebox.showinfo("Sucesso", "Configurações padrão carregadas e salvas com sucesso!")
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao carregar padrões: {str(e)}")
             self.status_var.set("Erro ao carregar padrões.")
 
+    def _persist_sensitivity(self):
+        """Agenda a gravação só da sensibilidade, sem reler a interface nem mostrar diálogo."""
+        value = str(self.engine.sensitivity_multiplier)
+        self.config['DEFAULT']['sensitivity_multiplier'] = value
+        self.persist.set('sensitivity_multiplier', value)
+
+    def _check_persist_error(self):
+        """Mostra as estatísticas de gravação e avisa (uma vez) sobre uma falha nova."""
+        persist = self.persist
+        self.persist_var.set(f"Gravação: {persist.writes} escritas ({persist.updates} alterações), "
+                             f"{persist.writes_per_second * 60:.1f}/min, última em {persist.last_flush_ms:.1f} ms "
+                             f"(máx {persist.max_flush_ms:.1f} ms){' - pendente' if persist.pending else ''}")
+        error = persist.last_error
+        if error is not None and error != self.persist_error_shown:
+            self.persist_error_shown = error
+            self.status_var.set("Erro ao salvar configurações.")
+            messagebox.showerror("Erro de Escrita", f"Não foi possível salvar o arquivo de configuração. "
+                                 f"Verifique as permissões. Erro: {error}")
+        elif error is None:
+            self.persist_error_shown = None
+
+    def _fill_config_entries(self):
+        """Copia os valores de self.config para os campos da aba de Configurações."""
+        entries = dict(self.entry_widgets)
+        entries.update({
+            'mouse_left': self.mouse_left_entry, 'mouse_right': self.mouse_right_entry,
+            'mouse_middle': self.mouse_middle_entry, 'hide_window': self.hide_window_entry,
+            'disable_gopher': self.disable_gopher_entry, 'speed_change': self.speed_change_entry,
+        })
+        for key, entry in entries.items():
+            entry.delete(0, tk.END)
+            entry.insert(0, self.config.get('DEFAULT', key))
+
     def adjust_sensitivity(self, delta):
         """Ajusta a sensibilidade do mouse."""
         # Limita a sensibilidade para evitar valores extremos (e negativos)
-        self.sensitivity_multiplier = max(0.001, min(10.0, self.sensitivity_multiplier + delta)) # Limites ajustados para ser bem flexível
-        self.current_speed = self.base_speed * self.sensitivity_multiplier
+        multiplier = max(0.001, min(10.0, self.engine.sensitivity_multiplier + delta)) # Limites ajustados para ser bem flexível
+        self.engine.set_sensitivity(multiplier)
+        self._send_to_engine_process('sensitivity', multiplier)
         self.update_speed_display()
-        self.status_var.set(f"Sensibilidade ajustada para {self.sensitivity_multiplier:.2f}x") # Mostrar 2 casas decimais
-        self.save_config() # Salva a sensibilidade ajustada
+        self.status_var.set(f"Sensibilidade ajustada para {multiplier:.2f}x") # Mostrar 2 casas decimais
+        self._persist_sensitivity() # Salva a sensibilidade ajustada
 
     def update_speed_display(self):
         """Atualiza o texto da velocidade na interface."""
         # Os nomes "Baixa", "Média", "Alta" são mais representativos agora
-        if self.sensitivity_multiplier < self.SPEED_MED_MULTIPLIER * 0.8: # Ajustei os limites para as categorias
+        multiplier = self.engine.sensitivity_multiplier
+        if multiplier < SPEED_MED_MULTIPLIER * 0.8: # Ajustei os limites para as categorias
             speed_name = "Baixa"
-        elif self.sensitivity_multiplier > self.SPEED_MED_MULTIPLIER * 1.2:
+        elif multiplier > SPEED_MED_MULTIPLIER * 1.2:
             speed_name = "Alta"
         else:
             speed_name = "Média"
-        self.speed_var.set(f"Velocidade: {speed_name} ({self.current_speed:.6f}) - Multiplicador: {self.sensitivity_multiplier:.2f}x")
+        self.speed_var.set(f"Velocidade: {speed_name} ({self.engine.current_speed:.6f}) - Multiplicador: {multiplier:.2f}x")
 
 
+    def _on_input_mode_selected(self, event=None):
+        """Troca o motor de entrada usado na próxima vez que o Gopher for iniciado."""
+        self.engine.input_mode = self.input_mode_var.get()
+        if self.engine.running or self.engine_process is not None:
+            self.status_var.set(f"Motor '{self.engine.input_mode}' será usado ao reiniciar o Gopher.")
+        else:
+            self.status_var.set(f"Motor de entrada: {self.engine.input_mode}")
+
+    def _on_profile_selected(self, event=None):
+        """Ativa o perfil escolhido na aba de Status (já compilado: só troca referências no motor)."""
+        self.engine.activate_profile(self.profile_var.get())
+        self._send_to_engine_process('profile', self.profile_var.get())
+
+    def _refresh_loop_stats(self):
+        """Mostra a taxa alcançada, prazos perdidos e excesso de sono do último segundo."""
+        engine = self.engine
+        if self.engine_process is not None:
+            self._refresh_process_stats()
+        elif engine.running and engine.input_mode == INPUT_MODE_POLLING and engine.scheduler:
+            stats = engine.scheduler.stats
+            self.loop_stats_var.set(
+                f"Loop: {stats['rate']:.0f} Hz{' (ocioso)' if stats['idle'] else ''} - "
+                f"prazos perdidos: {stats['missed']} - "
+                f"excesso de sono: média {stats['overshoot_avg_us']:.0f} µs, máx {stats['overshoot_max_us']:.0f} µs - "
+                f"{self._format_flush_stats()}")
+        elif engine.running:
+            self.loop_stats_var.set(f"Loop: motor {engine.input_mode} - {self._format_flush_stats()}")
+        else:
+            self.loop_stats_var.set("Loop: parado")
+        if self.engine_process is None:
+            self.frame_latency_var.set(self._format_latency("Frame", STAGE_FRAME))
+            self.input_latency_var.set(self._format_latency("Entrada → injeção", STAGE_INPUT_TO_INJECT))
+        self._check_persist_error()
+        if self.devices is not None:
+            if not engine.running:
+                self.devices.poll() # Conexões a quente com o loop parado; rodando, o próprio loop as trata
+            self._update_devices_display()
+        self.root.after(LOOP_STATS_REFRESH_MS, self._refresh_loop_stats)
+
+    def _refresh_process_stats(self):
+        """Mostra o estado publicado pelo processo do motor na memória compartilhada."""
+        if not self.engine_process.alive:
+            self.stop_gopher()
+            self.status_var.set("O processo do motor terminou inesperadamente.")
+            return
+        state = self.engine_process.read_state()
+        if state is None:
+            self.loop_stats_var.set("Loop: processo separado iniciando...")
+            return
+        flush = (f"injeção: último {state.flush_last_ns / 1000:.0f} µs, "
+                 f"máx {state.flush_max_ns / 1000:.0f} µs ({state.flush_count} lotes)")
+        if state.rate:
+            self.loop_stats_var.set(
+                f"Loop (processo separado): {state.rate:.0f} Hz{' (ocioso)' if state.idle else ''} - "
+                f"prazos perdidos: {state.missed} - "
+                f"excesso de sono: média {state.overshoot_avg_us:.0f} µs, máx {state.overshoot_max_us:.0f} µs - "
+                f"{flush}\nAnalógico ({state.stick_x:+.2f}, {state.stick_y:+.2f}) - botões 0x{state.buttons:X}")
+        else:
+            self.loop_stats_var.set(f"Loop (processo separado): motor {self.engine.input_mode} - {flush}")
+        self.frame_latency_var.set(self._format_summary("Frame", (state.frame_p50, state.frame_p99, state.frame_max)))
+        self.input_latency_var.set(self._format_summary("Entrada → injeção",
+                                                        (state.input_p50, state.input_p99, state.input_max)))
+
+    def _format_latency(self, label, stage):
+        """Formata p50/p99/máx de um estágio dos histogramas de latência."""
+        return self._format_summary(label, self.engine.metrics.summary(stage))
+
+    def _format_summary(self, label, summary):
+        """Formata um resumo (p50, p99, máx) em nanossegundos."""
+        p50, p99, max_value = summary
+        if not max_value:
+            return f"{label}: sem amostras"
+        return f"{label}: p50 {p50 / 1000:.0f} µs - p99 {p99 / 1000:.0f} µs - máx {max_value / 1000:.0f} µs"
+
+    def export_latencies(self):
+        """Exporta os histogramas de latência para um arquivo CSV escolhido pelo usuário."""
+        path = filedialog.asksaveasfilename(title="Exportar Latências", defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        if self._send_to_engine_process('export', ('latencies', path)):
+            self.status_var.set("Exportando latências do processo do motor...") # Resultado em _drain_ui_channel
+            return
+        try:
+            self.engine.metrics.export(path)
+            self.status_var.set(f"Latências exportadas para {os.path.basename(path)}.")
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao exportar latências: {str(e)}")
+            self.status_var.set("Erro ao exportar latências.")
+
+    def _on_trace_toggled(self):
+        """Liga ou desliga o perfil de frames do motor (spans por estágio, ver pygopher.trace)."""
+        if self.trace_var.get():
+            self.tracer = FrameTracer()
+            self.engine.tracer = self.tracer
+            self.status_var.set("Perfil de frames ligado.")
+        else:
+            self.engine.tracer = None
+            self.status_var.set("Perfil de frames desligado.")
+        self._send_to_engine_process('trace', self.trace_var.get())
+
+    def _on_telemetry_toggled(self):
+        """Liga ou desliga o visualizador (amostras por frame no TelemetryRing, ver pygopher.telemetry)."""
+        enabled = self.telemetry_var.get()
+        if enabled:
+            if self.telemetry is None:
+                self.telemetry = TelemetryRing()
+            self.engine.telemetry = self.telemetry
+            self.telemetry_view.canvas.pack(anchor=tk.W, pady=5)
+            self.telemetry_view.written = -1
+            if self.telemetry_job is None:
+                self.telemetry_job = self.root.after(VISUALIZER_REFRESH_MS, self._refresh_visualizer)
+            self.status_var.set("Visualizador ligado.")
+        else:
+            self.engine.telemetry = None
+            self.telemetry_view.canvas.pack_forget()
+            if self.telemetry_job is not None:
+                self.root.after_cancel(self.telemetry_job)
+                self.telemetry_job = None
+            self.status_var.set("Visualizador desligado.")
+        self._send_to_engine_process('telemetry', enabled)
+
+    def _refresh_visualizer(self):
+        """Redesenha o visualizador com as últimas amostras, no ritmo da interface e sem tocar no loop."""
+        self.telemetry_job = None
+        if not self.telemetry_var.get():
+            return
+        ring = self.engine_process.telemetry if self.engine_process is not None else self.telemetry
+        # Só redesenha com a janela visível, a aba de Status aberta e amostras novas
+        if (ring is not None and self.root.winfo_viewable()
+                and self.notebook.select() == str(self.status_frame)):
+            written = ring.written
+            if written != self.telemetry_view.written:
+                self.telemetry_view.update(ring.samples(TelemetryView.GRAPH_SAMPLES), written, self.engine.profile.curve)
+        self.telemetry_job = self.root.after(VISUALIZER_REFRESH_MS, self._refresh_visualizer)
+
+    def export_trace(self):
+        """Grava os spans do perfil de frames como JSON do Chrome (chrome://tracing ou Perfetto)."""
+        in_process = self.engine_process is not None and self.trace_var.get()
+        if not in_process and (self.tracer is None or not self.tracer.count):
+            self.status_var.set("Ligue o Perfil de frames e rode o Gopher antes de exportar.")
+            return
+        path = filedialog.asksaveasfilename(title="Exportar Trace", defaultextension=".json",
+                                            filetypes=[("Trace do Chrome", "*.json"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        if in_process and self._send_to_engine_process('export', ('trace', path)):
+            self.status_var.set("Exportando o trace do processo do motor...") # Resultado em _drain_ui_channel
+            return
+        try:
+            count = self.tracer.dump(path)
+            self.status_var.set(f"Trace exportado para {os.path.basename(path)} ({count} spans).")
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao exportar o trace: {str(e)}")
+            self.status_var.set("Erro ao exportar o trace.")
+
+    def _format_flush_stats(self):
+        """Resume a latência de entrega (flush) dos lotes de saída."""
+        output = self.engine.output
+        return (f"injeção: último {output.last_flush_ns / 1000:.0f} µs, "
+                f"máx {output.max_flush_ns / 1000:.0f} µs ({output.flush_count} lotes)")
+
+    def _format_engine_stats(self):
+        """Resume despertares e uso de CPU da última execução, para comparar os motores."""
+        stats = self.engine.stats
+        if not stats or stats['wall_time'] <= 0:
+            return ""
+        wall = stats['wall_time']
+        return (f"Motor {stats['mode']}: {stats['wakeups'] / wall:.1f} despertares/s, "
+                f"CPU {stats['cpu_time'] / wall:.2%} em {wall:.1f}s, {stats['skipped']} frames sem dados novos")
+
+    def toggle_recording(self):
+        """Inicia ou encerra a gravação dos frames lidos do controle em um arquivo de sessão."""
+        if self.recorder is not None:
+            recorder = self.recorder
+            self.engine.recorder = None # O motor para de gravar antes do arquivo ser fechado
+            self.recorder = None
+            recorder.close()
+            self.record_button.config(text="Gravar Sessão")
+            self.status_var.set(f"Sessão gravada: {recorder.frames} frames em {os.path.basename(recorder.path)}.")
+            return
+        if self.engine_process is not None:
+            self.status_var.set("A gravação de sessão não está disponível com o motor em processo separado.")
+            return
+
+        path = filedialog.asksaveasfilename(title="Gravar Sessão", defaultextension=".pgs",
+                                            filetypes=[("Sessão do Gopher", "*.pgs"), ("Todos os arquivos", "*.*")])
+        if not path:
+            return
+        try:
+            self.recorder = SessionRecorder(path)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao criar o arquivo de sessão: {str(e)}")
+            self.status_var.set("Erro ao iniciar a gravação.")
+            return
+        self.engine.recorder = self.recorder
+        self.record_button.config(text="Parar Gravação")
+        self.status_var.set(f"Gravando sessão em {os.path.basename(path)}...")
+
     def start_gopher(self):
         """Inicia o thread do controle para emulação."""
-        if not self.joystick:
+        if self.devices is None or not self.devices.devices:
             messagebox.showerror("Erro", "Nenhum controle conectado! Conecte um controle antes de iniciar.")
             return
 
-        if not self.running:
-            self.running = True
-            self.controller_thread = threading.Thread(target=self._controller_loop, daemon=True)
+        if self.engine.running or self.engine_process is not None:
+            return
+        if self.config.getboolean('DEFAULT', 'engine_process', fallback=False):
+            if self.recorder is not None:
+                self.toggle_recording() # O processo do motor não grava sessões
+            # A troca automática passa para o processo do motor: dois vigias trocariam o perfil em dobro
+            self._start_engine_process(self._stop_auto_switcher())
+        else:
+            self.engine.running = True
+            self.controller_thread = threading.Thread(target=self.engine.run, args=(self.devices,), daemon=True)
             self.controller_thread.start()
 
-            self.start_button.config(state=tk.DISABLED)
-            self.stop_button.config(state=tk.NORMAL)
-            self.gopher_status_var.set("Ativo - Controle em funcionamento")
-            self.status_var.set("Gopher iniciado com sucesso.")
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.gopher_status_var.set("Ativo - Controle em funcionamento"
+                                   f"{' (processo separado)' if self.engine_process is not None else ''}")
+        self.status_var.set("Gopher iniciado com sucesso.")
+
+    def _start_engine_process(self, manual_profile=None):
+        """Inicia o motor em um processo separado (ver pygopher.remote) com os ajustes atuais da interface.
+
+        manual_profile é o perfil escolhido pelo usuário antes de uma troca automática ainda ativa: o
+        processo começa nele e a própria troca automática do processo reativa o do aplicativo.
+        """
+        self.engine_process = EngineProcess()
+        self.engine_process.start(self.engine.profile_set, {
+            'input_mode': self.engine.input_mode,
+            'input_source': self.config.get('DEFAULT', 'input_source', fallback=SOURCE_PYGAME),
+            'sensitivity': self.engine.sensitivity_multiplier,
+            'profile': manual_profile or self.engine.profile.name,
+            'trace': self.trace_var.get(),
+            'telemetry': self.telemetry_var.get(),
+        })
+
+    def _start_auto_switcher(self):
+        """Liga a troca automática de perfil no motor deste processo (se houver um detector de janela)."""
+        detector = create_foreground_detector()
+        if detector is not None:
+            self.auto_switcher = AutoSwitcher(self.engine, detector)
+            self.auto_switcher.start()
+
+    def _stop_auto_switcher(self):
+        """Desliga a troca automática da interface. Retorna o perfil manual que ela restauraria (ou None)."""
+        switcher, self.auto_switcher = self.auto_switcher, None
+        if switcher is None:
+            return None
+        switcher.stop()
+        return switcher.manual_profile
+
+    def _send_to_engine_process(self, kind, value=None):
+        """Envia um comando ao processo do motor, se ele estiver rodando. Retorna se o comando foi enviado."""
+        return self.engine_process is not None and self.engine_process.send(kind, value)
 
     def stop_gopher(self):
-        """Para o thread do controle."""
-        if self.running:
-            self.running = False
+        """Para o thread (ou o processo) do controle."""
+        if self.engine_process is not None:
+            engine_process, self.engine_process = self.engine_process, None
+            self._forward_process_messages(engine_process.stop()) # Inclui as estatísticas finais ('stopped')
+            self._start_auto_switcher() # A troca automática volta para o motor da interface
+        elif self.engine.running:
+            self.engine.running = False
             if self.controller_thread and self.controller_thread.is_alive():
                 self.controller_thread.join(timeout=1) # Espera o thread terminar
+        else:
+            return
 
-            self.start_button.config(state=tk.NORMAL)
-            self.stop_button.config(state=tk.DISABLED)
-            self.gopher_status_var.set("Inativo")
-            self.status_var.set("Gopher parado.")
-
-    def _controller_loop(self):
-        """Loop principal que lê o controle e simula mouse/teclado."""
-        button_states = {} # Armazena o estado anterior dos botões
-        trigger_states = {'left': False, 'right': False} # Armazena o estado anterior dos gatilhos
-        x_rest, y_rest = 0.0, 0.0 # Acumuladores para sub-pixel de movimento
-
-        while self.running:
-            start_time = time.time()
-            pygame.event.pump() # Processa eventos internos do Pygame
-
-            if not self.disabled and self.joystick:
-                # --- Movimento do Mouse (Analógico Esquerdo) ---
-                x, y = self._get_mouse_position() # Posição atual do mouse
-                axis_x = self.joystick.get_axis(0) * 32767 # Eixo X do analógico esquerdo (horizontal)
-                axis_y = self.joystick.get_axis(1) * 32767 # Eixo Y do analógico esquerdo (vertical)
-
-                dx, dy = 0, 0
-
-                # Verifica se o movimento está fora da DEAD_ZONE
-                if (axis_x**2 + axis_y**2) > DEAD_ZONE**2:
-                    length = (axis_x**2 + axis_y**2)**0.5
-                    # Calcula o multiplicador de movimento
-                    # A velocidade é aplicada aqui, escalando com a distância do centro
-                    mult = self.current_speed * (length - DEAD_ZONE) / length * 1000
-
-                    dx = axis_x * mult
-                    dy = axis_y * mult # Eixo Y está correto agora (para cima/para baixo)
-
-                new_x = x + dx + x_rest
-                new_y = y + dy + y_rest
-
-                x_rest = new_x - int(new_x) # Acumula a parte fracionária
-                y_rest = new_y - int(new_y)
-
-                self._set_mouse_position(int(new_x), int(new_y))
-
-                # --- Rolagem do Mouse (Analógico Direito) ---
-                scroll_axis_y = self.joystick.get_axis(3) * 32767 # Eixo Y do analógico direito
-                if abs(scroll_axis_y) > SCROLL_DEAD_ZONE:
-                    scroll_amount = int(scroll_axis_y * 0.005) # Ajuste este valor se a rolagem for muito rápida
-                    pyautogui.scroll(scroll_amount)
-
-                # --- Leitura e Mapeamento dos Botões ---
-                num_buttons = self.joystick.get_numbuttons()
-                for button_idx in range(num_buttons):
-                    current_state = self.joystick.get_button(button_idx)
-                    prev_state = button_states.get(button_idx, False)
-
-                    if current_state and not prev_state:
-                        # Botão foi pressionado
-                        self._handle_button_press(button_idx)
-                    elif not current_state and prev_state:
-                        # Botão foi liberado
-                        self._handle_button_release(button_idx)
-
-                    button_states[button_idx] = current_state
-
-                # --- Leitura e Mapeamento dos Gatilhos ---
-                # Gatilhos retornam valores de -1 (não pressionado) a 1 (totalmente pressionado)
-                # Convertemos para 0 a 1 para facilitar a lógica (0=não, 1=pressionado)
-                left_trigger_val = (self.joystick.get_axis(4) + 1) / 2
-                right_trigger_val = (self.joystick.get_axis(5) + 1) / 2
-
-                # Limiar para considerar o gatilho "pressionado"
-                trigger_threshold = 0.5
-
-                if left_trigger_val > trigger_threshold and not trigger_states['left']:
-                    trigger_states['left'] = True
-                    self._handle_trigger('left', True)
-                elif left_trigger_val <= trigger_threshold and trigger_states['left']:
-                    trigger_states['left'] = False
-                    self._handle_trigger('left', False)
-
-                if right_trigger_val > trigger_threshold and not trigger_states['right']:
-                    trigger_states['right'] = True
-                    self._handle_trigger('right', True)
-                elif right_trigger_val <= trigger_threshold and trigger_states['right']:
-                    trigger_states['right'] = False
-                    self._handle_trigger('right', False)
-
-            # Controla a taxa de atualização do loop
-            elapsed = time.time() - start_time
-            if elapsed < SLEEP_AMOUNT:
-                time.sleep(SLEEP_AMOUNT - elapsed)
-
-    def _get_mouse_position(self):
-        """Retorna a posição atual do cursor do mouse."""
-        pt = POINT()
-        windll.user32.GetCursorPos(byref(pt))
-        return pt.x, pt.y
-
-    def _set_mouse_position(self, x, y):
-        """Define a posição do cursor do mouse."""
-        windll.user32.SetCursorPos(x, y)
-
-    def _handle_button_press(self, button_idx):
-        """Lida com o evento de botão pressionado."""
-        button_hex = hex(button_idx)
-
-        # Mapeamento para cliques do mouse
-        if button_hex == self.mouse_left_entry.get():
-            pyautogui.mouseDown(button='left')
-        elif button_hex == self.mouse_right_entry.get():
-            pyautogui.mouseDown(button='right')
-        elif button_hex == self.mouse_middle_entry.get():
-            pyautogui.mouseDown(button='middle')
-        # Mapeamento para funções do Gopher
-        elif button_hex == self.hide_window_entry.get():
-            self._toggle_window_visibility()
-        elif button_hex == self.disable_gopher_entry.get():
-            self.disabled = not self.disabled
-            self.disabled_var.set(f"Gopher: {'Desabilitado' if self.disabled else 'Habilitado'}")
-            self.status_var.set(f"Gopher {'desabilitado' if self.disabled else 'habilitado'}.")
-        elif button_hex == self.speed_change_entry.get():
-            if self.sensitivity_multiplier <= self.SPEED_LOW_MULTIPLIER:
-                self.sensitivity_multiplier = self.SPEED_MED_MULTIPLIER
-            elif self.sensitivity_multiplier <= self.SPEED_MED_MULTIPLIER:
-                self.sensitivity_multiplier = self.SPEED_HIGH_MULTIPLIER
-            else:
-                self.sensitivity_multiplier = self.SPEED_LOW_MULTIPLIER
-            self.current_speed = self.base_speed * self.sensitivity_multiplier
-            self.update_speed_display()
-            self.save_config() # Salva a nova velocidade
-
-        # Mapeamento para teclas do teclado
-        for key, entry_widget in self.entry_widgets.items():
-            if button_hex == entry_widget.get() and entry_widget.get() != '0x0': # '0x0' como valor nulo
-                pyautogui.keyDown(self._get_key_from_hex(entry_widget.get()))
-
-    def _handle_button_release(self, button_idx):
-        """Lida com o evento de botão liberado."""
-        button_hex = hex(button_idx)
-
-        # Mapeamento para cliques do mouse
-        if button_hex == self.mouse_left_entry.get():
-            pyautogui.mouseUp(button='left')
-        elif button_hex == self.mouse_right_entry.get():
-            pyautogui.mouseUp(button='right')
-        elif button_hex == self.mouse_middle_entry.get():
-            pyautogui.mouseUp(button='middle')
-
-        # Mapeamento para teclas do teclado
-        for key, entry_widget in self.entry_widgets.items():
-            if button_hex == entry_widget.get() and entry_widget.get() != '0x0':
-                pyautogui.keyUp(self._get_key_from_hex(entry_widget.get()))
-
-    def _handle_trigger(self, trigger_side, pressed):
-        """Lida com o evento de gatilho (esquerdo/direito) pressionado/liberado."""
-        if trigger_side == 'left':
-            key_hex = self.entry_widgets['left_trigger'].get()
-        else: # 'right'
-            key_hex = self.entry_widgets['right_trigger'].get()
-
-        if key_hex != '0x0':
-            key_to_press = self._get_key_from_hex(key_hex)
-            if key_to_press is not None: # Verifica se a tecla é válida
-                if pressed:
-                    pyautogui.keyDown(key_to_press)
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        self.gopher_status_var.set("Inativo")
+        self.status_var.set(f"Gopher parado. {self._format_engine_stats()}".strip())
+
+    # --- Avisos do motor (chamados a partir do thread do controle) ---
+    # Só publicam no canal: o Tkinter não é thread-safe e o loop do controle não pode esperar
+    # pela interface (nem por um diálogo). _drain_ui_channel aplica as mensagens no thread da interface.
+
+    def on_disabled_changed(self, disabled):
+        self.ui_channel.post('disabled', disabled)
+
+    def on_speed_changed(self, multiplier):
+        self.ui_channel.post('speed', multiplier)
+
+    def on_hide_window(self):
+        self.ui_channel.post_event('hide_window') # Cada pressionamento alterna: não pode ser fundido
+
+    def on_devices_changed(self, devices):
+        self.ui_channel.post('devices')
+
+    def on_profile_changed(self, name):
+        self.ui_channel.post('profile', name)
+
+    def _forward_process_messages(self, messages):
+        """Repassa ao canal da interface os avisos do processo do motor; a interface espelha velocidade e estatísticas."""
+        for kind, value in messages:
+            if kind == 'speed':
+                self.engine.set_sensitivity(value) # A interface mostra e salva a velocidade do motor
+            elif kind == 'profile':
+                # Trocado no processo do motor (acorde ou troca automática): a interface só mostra
+                self.profile_var.set(value)
+                self.status_var.set(f"Perfil '{value}' ativado no processo do motor.")
+                continue
+            elif kind == 'stopped':
+                self.engine.stats = value # Despertares e CPU da execução, para _format_engine_stats
+                continue
+            self.ui_channel.post_event(kind, value)
+
+    def _drain_ui_channel(self):
+        """Aplica na interface as mensagens publicadas pelo thread (ou pelo processo) do controle."""
+        if self.engine_process is not None:
+            self._forward_process_messages(self.engine_process.messages())
+        for kind, value in self.ui_channel.drain():
+            if kind == 'disabled':
+                self.disabled_var.set(f"Gopher: {'Desabilitado' if value else 'Habilitado'}")
+                self.status_var.set(f"Gopher {'desabilitado' if value else 'habilitado'}.")
+            elif kind == 'speed':
+                self.update_speed_display()
+                self._persist_sensitivity() # Salva a nova velocidade
+            elif kind == 'hide_window':
+                self._toggle_window_visibility()
+            elif kind == 'devices':
+                self._update_devices_display()
+            elif kind == 'profile':
+                self.profile_var.set(value)
+                self.status_var.set(f"Perfil '{value}' ativado (troca em {self.engine.last_switch_us:.1f} µs).")
+            elif kind == 'exported':
+                what, path, count, error = value
+                label = "o trace" if what == 'trace' else "latências"
+                if error is not None:
+                    messagebox.showerror("Erro", f"Falha ao exportar {label}: {error}")
+                    self.status_var.set(f"Erro ao exportar {label}.")
+                elif what == 'trace':
+                    self.status_var.set(f"Trace exportado para {os.path.basename(path)} ({count} spans).")
                 else:
-                    pyautogui.keyUp(key_to_press)
-
-    def _get_key_from_hex(self, hex_str):
-        """Converte um valor hexadecimal de código de tecla virtual do Windows para o nome da tecla do pyautogui."""
-        if not hex_str or hex_str.lower() == '0x0':
-            return None # Retorna None ou algum valor que indique "nenhuma tecla" para pyautogui
-
-        try:
-            # Remove o prefixo '0x' se existir e converte para inteiro
-            key_code = int(hex_str, 16)
-
-            # Mapeamento de códigos de tecla virtuais para nomes de teclas do pyautogui
-            # Este mapa não precisa incluir 'leftclick', 'rightclick' etc. pois eles são tratados pelos botões do mouse.
-            key_map = {
-                0x08: 'backspace', 0x09: 'tab',
-                0x0C: 'clear', 0x0D: 'enter',
-                0x10: 'shift', 0x11: 'ctrl', 0x12: 'alt',
-                0x13: 'pause', 0x14: 'capslock', 0x1B: 'esc',
-                0x20: 'space',
-                0x21: 'pgup', 0x22: 'pgdn',
-                0x23: 'end', 0x24: 'home',
-                0x25: 'left', 0x26: 'up', 0x27: 'right', 0x28: 'down',
-                0x2D: 'insert', 0x2E: 'delete',
-                0x30: '0', 0x31: '1', 0x32: '2', 0x33: '3', 0x34: '4',
-                0x35: '5', 0x36: '6', 0x37: '7', 0x38: '8', 0x39: '9',
-                0x41: 'a', 0x42: 'b', 0x43: 'c', 0x44: 'd', 0x45: 'e',
-                0x46: 'f', 0x47: 'g', 0x48: 'h', 0x49: 'i', 0x4A: 'j',
-                0x4B: 'k', 0x4C: 'l', 0x4D: 'm', 0x4E: 'n', 0x4F: 'o',
-                0x50: 'p', 0x51: 'q', 0x52: 'r', 0x53: 's', 0x54: 't',
-                0x55: 'u', 0x56: 'v', 0x57: 'w', 0x58: 'x', 0x59: 'y', 0x5A: 'z',
-                0x5B: 'winleft', 0x5C: 'winright',
-                0x60: 'num0', 0x61: 'num1', 0x62: 'num2', 0x63: 'num3',
-                0x64: 'num4', 0x65: 'num5', 0x66: 'num6', 0x67: 'num7',
-                0x68: 'num8', 0x69: 'num9',
-                0x6A: 'multiply', 0x6B: 'add', 0x6C: 'separator', 0x6D: 'subtract',
-                0x6E: 'decimal', 0x6F: 'divide',
-                0x70: 'f1', 0x71: 'f2', 0x72: 'f3', 0x73: 'f4', 0x74: 'f5',
-                0x75: 'f6', 0x76: 'f7', 0x77: 'f8', 0x78: 'f9', 0x79: 'f10',
-                0x7A: 'f11', 0x7B: 'f12',
-                0x90: 'numlock', 0x91: 'scrolllock',
-                0xA0: 'shiftleft', 0xA1: 'shiftright',
-                0xA2: 'ctrlleft', 0xA3: 'ctrlright',
-                0xA4: 'altleft', 0xA5: 'altright',
-                0xA6: 'browser_back', 0xA7: 'browser_forward', 0xA8: 'browser_refresh',
-                0xA9: 'browser_stop', 0xAA: 'browser_search', 0xAB: 'browser_favorites',
-                0xAC: 'browser_home', 0xAD: 'volumemute', 0xAE: 'volumedown',
-                0xAF: 'volumeup', 0xB0: 'nexttrack', 0xB1: 'prevtrack',
-                0xB2: 'stop', 0xB3: 'playpause', 0xB4: 'launchmail',
-                0xB5: 'launchmediaselect', 0xB6: 'launchapp1', 0xB7: 'launchapp2',
-                0xBA: ';', 0xBB: '=', 0xBC: ',', 0xBD: '-', 0xBE: '.', 0xBF: '/',
-                0xC0: '`', 0xDB: '[', 0xDC: '\\', 0xDD: ']', 0xDE: "'"
-            }
-            return key_map.get(key_code, None) # Retorna None se não encontrar o mapeamento
-        except ValueError:
-            self.status_var.set(f"Erro: Valor Hex Inválido: '{hex_str}'")
-            return None # Retorna None para valores hex inválidos
+                    self.status_var.set(f"Latências exportadas para {os.path.basename(path)}.")
+            elif kind == 'config_reload':
+                self._apply_reloaded_config(*value)
+            elif kind == 'config_error':
+                messagebox.showerror("Configuração", f"{value}\n\nA configuração em uso continua valendo.")
+                self.status_var.set("Alteração externa do .ini recusada.")
+            elif kind == 'error':
+                self.stop_gopher()
+                messagebox.showerror("Erro", f"Falha no processo do motor: {value}")
+                self.status_var.set("Erro no processo do motor.")
+        self.root.after(UI_DRAIN_MS, self._drain_ui_channel)
 
     def _toggle_window_visibility(self):
         """Alterna a visibilidade da janela do console."""
@@ -698,14 +1068,24 @@ class Gopher360App:
     def on_closing(self):
         """Lida com o fechamento da janela da aplicação."""
         self.stop_gopher() # Garante que o thread do controle pare
-        pygame.joystick.quit() # Desinicializa o joystick
-        pygame.quit() # Desinicializa o Pygame
+        if self.recorder is not None:
+            self.toggle_recording() # Fecha a sessão em gravação
+        self._stop_auto_switcher()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.persist.close() # Grava o que estiver pendente antes de sair
+        if self.pygame is not None: # Pode não ter sido inicializado se a janela fechou durante a partida
+            self.devices.close_all()
+            self.pygame.joystick.quit() # Desinicializa o joystick
+            self.pygame.quit() # Desinicializa o Pygame
         self.root.destroy() # Fecha a janela do Tkinter
 
 # --- Função Principal para Iniciar a Aplicação ---
 def main():
+    startup = StartupReport(STARTUP_T0)
+    startup.mark("imports")
     root = tk.Tk()
-    app = Gopher360App(root)
+    app = Gopher360App(root, startup)
     root.mainloop()
 
 if __name__ == "__main__":
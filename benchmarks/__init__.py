@@ -0,0 +1 @@
+"""Benchmarks do caminho crítico do loop do controle (ver benchmarks.__main__)."""
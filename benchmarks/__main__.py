@@ -0,0 +1,162 @@
+"""Executa os benchmarks e compara com as linhas de base gravadas.
+
+Uso: python -m benchmarks [-k filtro] [--save] [--tolerance 1.0] [--quick]
+
+Cada caso informa ns por operação (melhor de várias rodadas) e os bytes alocados por
+operação: os temporários (pico do tracemalloc acima do início da operação) e os retidos
+(crescimento líquido, que deve ser 0). Sem --save, o resultado é comparado com
+baselines.json e qualquer caso mais lento que a tolerância, ou que aloque mais do que a
+linha de base, é uma regressão: o comando termina com código 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.cases import CASES
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+REPEAT = 15 # Rodadas de tempo por caso; vale a melhor (rodadas curtas escapam de picos de carga da máquina)
+ALLOC_SAMPLES = 200 # Operações medidas com o tracemalloc ligado
+ALLOC_SLACK = 64 # Bytes por operação tolerados além da linha de base (inteiros e floats temporários)
+
+
+def measure_time(op, iterations, repeat=REPEAT):
+    """Melhor tempo (ns) por operação entre `repeat` rodadas de `iterations` operações."""
+    op() # Aquecimento: caches, primeiro frame, filtros criados sob demanda
+    best = float('inf')
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            for _ in range(iterations):
+                op()
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed / iterations)
+    return best
+
+
+def measure_allocations(op, samples=ALLOC_SAMPLES):
+    """(bytes temporários, bytes retidos) médios por operação, medidos com o tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        op()
+        gc.collect()
+        start = tracemalloc.get_traced_memory()[0]
+        transient = 0
+        for _ in range(samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            op()
+            transient += tracemalloc.get_traced_memory()[1] - before
+        gc.collect() # Ciclos já soltos não contam como retidos
+        retained = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return transient / samples, max(0.0, retained / samples)
+
+
+def run(pattern=None, quick=False):
+    """Roda os casos cujo nome contém `pattern` e retorna {nome: {'ns', 'alloc_bytes', 'retained_bytes'}}."""
+    results = {}
+    for name, factory, iterations in CASES:
+        if pattern and pattern not in name:
+            continue
+        if quick:
+            iterations = max(1, iterations // 10)
+        ns = measure_time(factory(), max(1, iterations // REPEAT), 2 if quick else REPEAT)
+        alloc, retained = measure_allocations(factory())
+        results[name] = {'ns': ns, 'alloc_bytes': alloc, 'retained_bytes': retained}
+    return results
+
+
+def machine():
+    return f"{platform.python_implementation()} {platform.python_version()} {platform.machine()} {platform.system()}"
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    data = {'machine': machine(), 'cases': {
+        name: {key: round(value, 1) for key, value in result.items()} for name, result in results.items()}}
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(temp_path, path)
+
+
+def compare(results, baseline, tolerance):
+    """Linhas do relatório e a lista de regressões em relação à linha de base."""
+    lines = [f"{'caso':<20} {'ns/op':>12} {'base':>12} {'razão':>7} {'alloc B/op':>11} {'retido B/op':>12}"]
+    regressions = []
+    cases = baseline['cases'] if baseline else {}
+    for name, result in results.items():
+        base = cases.get(name)
+        ratio = result['ns'] / base['ns'] if base and base['ns'] else None
+        lines.append(f"{name:<20} {result['ns']:>12.0f} {base['ns'] if base else '-':>12} "
+                     f"{f'{ratio:.2f}' if ratio is not None else '-':>7} "
+                     f"{result['alloc_bytes']:>11.0f} {result['retained_bytes']:>12.1f}")
+        if base is None:
+            continue
+        if ratio > 1.0 + tolerance:
+            regressions.append(f"{name}: {result['ns']:.0f} ns/op, {ratio:.2f}x a linha de base ({base['ns']:.0f} ns)")
+        if result['alloc_bytes'] > base['alloc_bytes'] + ALLOC_SLACK:
+            regressions.append(f"{name}: aloca {result['alloc_bytes']:.0f} B/op (linha de base {base['alloc_bytes']:.0f})")
+        if result['retained_bytes'] > base['retained_bytes'] * 1.25 + 1:
+            regressions.append(f"{name}: retém {result['retained_bytes']:.1f} B/op (linha de base "
+                               f"{base['retained_bytes']:.1f})")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks do loop do controle.")
+    parser.add_argument('-k', dest='pattern', help="só os casos cujo nome contém este texto")
+    parser.add_argument('--save', action='store_true', help="grava o resultado como nova linha de base")
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help="lentidão tolerada em relação à linha de base (padrão: %(default)s = até 2x)")
+    parser.add_argument('--quick', action='store_true', help="menos iterações (só para conferir que tudo roda)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="arquivo de linhas de base")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.quick)
+    baseline = None if args.save else load_baseline(args.baseline)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print('\n'.join(lines))
+
+    if args.save:
+        if args.pattern or args.quick:
+            print("Linha de base não gravada: use --save sem -k e sem --quick", file=sys.stderr)
+            return 2
+        save_baseline(results, args.baseline)
+        print(f"Linha de base gravada em {args.baseline} ({machine()})")
+        return 0
+    if baseline is None:
+        print(f"Sem linha de base em {args.baseline}; grave uma com --save", file=sys.stderr)
+        return 0
+    if baseline.get('machine') != machine():
+        print(f"Aviso: linha de base gravada em outra máquina ({baseline.get('machine')})", file=sys.stderr)
+    if regressions:
+        print(f"\nREGRESSÃO em {len(regressions)} medição(ões):", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        return 1
+    print("\nSem regressões em relação à linha de base.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
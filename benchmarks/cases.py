@@ -0,0 +1,164 @@
+"""Cenários medidos. Cada caso monta o seu estado fora da medição e devolve a operação a ser repetida.
+
+Os cenários do loop rodam GopherEngine.poll_frame (uma iteração do motor por polling,
+sem a espera) sobre um DeviceManager sem Pygame, com um FakeJoystick lido pela mesma
+PygameSource do motor real, um NullSink e um cursor em memória.
+"""
+import atexit
+import os
+import tempfile
+
+from pygopher.bindings import key_from_hex
+from pygopher.config import default_config, read_config, apply_config
+from pygopher.devices import DeviceManager
+from pygopher.engine import GopherEngine, FPS, IDLE_FPS, IDLE_AFTER_SECONDS
+from pygopher.motion import VirtualCursor
+from pygopher.persist import ConfigWriter
+from pygopher.profiles import compile_profile_set
+from pygopher.scheduler import FrameScheduler
+from pygopher.sources import PygameSource
+from pygopher.telemetry import TelemetryRing
+from pygopher.trace import FrameTracer
+
+from benchmarks.fakes import FakeJoystick, NullSink, NullCursorBackend
+
+
+def _engine():
+    engine = GopherEngine(NullSink(), VirtualCursor(NullCursorBackend()))
+    apply_config(engine, default_config())
+    return engine
+
+
+def _loop(joystick, tracer=None, telemetry=None):
+    """Motor pronto para poll_frame() com um único controle (o joystick falso)."""
+    engine = _engine()
+    engine.tracer = tracer
+    engine.telemetry = telemetry
+    devices = DeviceManager(None, NullCursorBackend())
+    devices.add_source(PygameSource(joystick, joystick.get_numbuttons()))
+    engine.prepare(devices)
+    scheduler = FrameScheduler(FPS, IDLE_FPS, IDLE_AFTER_SECONDS)
+    return lambda: engine.poll_frame(devices, scheduler)
+
+
+def loop_idle():
+    """Controle parado: depois do primeiro frame, o pacote repetido faz o motor pular o controle."""
+    return _loop(FakeJoystick())
+
+
+def loop_moving():
+    """Analógico esquerdo inclinado e parado: movimento do cursor em todo frame."""
+    joystick = FakeJoystick()
+    joystick.axes[0] = 0.6
+    joystick.axes[1] = -0.3
+    return _loop(joystick)
+
+
+def loop_moving_traced():
+    """loop_moving com o perfil de frames ligado (custo dos spans)."""
+    joystick = FakeJoystick()
+    joystick.axes[0] = 0.6
+    joystick.axes[1] = -0.3
+    return _loop(joystick, FrameTracer())
+
+
+def loop_moving_telemetry():
+    """loop_moving com o visualizador ligado (uma amostra por frame no TelemetryRing)."""
+    joystick = FakeJoystick()
+    joystick.axes[0] = 0.6
+    joystick.axes[1] = -0.3
+    return _loop(joystick, telemetry=TelemetryRing())
+
+
+def loop_button_storm():
+    """Todos os botões trocam de estado em todo frame (3 deles com cliques do mouse mapeados)."""
+    joystick = FakeJoystick()
+    states = ([1] * len(joystick.buttons), [0] * len(joystick.buttons))
+    frame = _loop(joystick)
+    counter = [0]
+
+    def op():
+        counter[0] += 1
+        joystick.buttons = states[counter[0] & 1]
+        frame()
+    return op
+
+
+def motion():
+    """Curva de resposta e cursor virtual para um frame do analógico esquerdo."""
+    engine = _engine()
+    engine.frame_profile = engine.active # O que o início de um frame faz
+    return lambda: engine.apply_motion(0.6, -0.3)
+
+
+def button_dispatch():
+    """Pressiona e solta os três botões de clique (bordas por XOR e tabela de bindings) e entrega o lote."""
+    engine = _engine()
+
+    def op():
+        engine.apply_state(0b111)
+        engine.apply_state(0)
+        engine.output.flush()
+    return op
+
+
+def button_edges():
+    """Frame sem mudanças com 16 botões segurados e analógicos parados: máscara, gatilhos e XOR com o estado anterior."""
+    engine = _engine()
+    axes = [0.0, 0.0, 0.0, 0.0, -1.0, -1.0]
+    mask = (1 << 16) - 1
+    engine.process_frame(axes, mask)
+    return lambda: engine.process_frame(axes, mask)
+
+
+def key_resolution():
+    """Código de tecla hex do .ini -> nome da tecla (o que a compilação dos bindings faz por opção)."""
+    return lambda: key_from_hex('0x26')
+
+
+def _config_file():
+    config = default_config()
+    config['profile:bench'] = {'stick_curve': 'exponential', 'apps': 'bench.exe'}
+    handle, path = tempfile.mkstemp(suffix='.ini', prefix='gopher-bench-')
+    with os.fdopen(handle, 'w') as f:
+        config.write(f)
+    atexit.register(os.remove, path)
+    return config, path
+
+
+def config_load():
+    """Leitura do .ini e compilação de todos os perfis (sem o cache em disco)."""
+    _, path = _config_file()
+    return lambda: compile_profile_set(read_config(path))
+
+
+def config_save():
+    """Custo no thread de quem salva: cópia da configuração para o ConfigWriter (a escrita é em segundo plano)."""
+    config, path = _config_file()
+    writer = ConfigWriter(path, debounce=3600) # Nenhuma escrita durante a medição
+    return lambda: writer.replace(config)
+
+
+def config_swap():
+    """Instalação de uma configuração recarregada já compilada: o que o loop do controle pode sentir."""
+    config, _ = _config_file()
+    engine = _engine()
+    profile_set = compile_profile_set(config)
+    return lambda: apply_config(engine, config, profile_set)
+
+
+# (nome, fábrica da operação, iterações medidas, divididas entre as rodadas)
+CASES = (
+    ('loop_idle', loop_idle, 20000),
+    ('loop_moving', loop_moving, 20000),
+    ('loop_moving_traced', loop_moving_traced, 20000),
+    ('loop_moving_telemetry', loop_moving_telemetry, 20000),
+    ('loop_button_storm', loop_button_storm, 20000),
+    ('motion', motion, 100000),
+    ('button_dispatch', button_dispatch, 50000),
+    ('button_edges', button_edges, 100000),
+    ('key_resolution', key_resolution, 200000),
+    ('config_load', config_load, 200),
+    ('config_save', config_save, 200),
+    ('config_swap', config_swap, 20000),
+)
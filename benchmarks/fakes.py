@@ -0,0 +1,60 @@
+"""Dispositivos falsos para os benchmarks: joystick, sink e cursor sem efeito no sistema."""
+from pygopher.output import OutputSink
+
+
+class FakeJoystick:
+    """Joystick com a mesma interface usada do pygame.joystick.Joystick; os valores são definidos pelo cenário."""
+
+    def __init__(self, button_count=12, name='Bench Pad', guid='bench'):
+        self.axes = [0.0, 0.0, 0.0, 0.0, -1.0, -1.0]
+        self.buttons = [0] * button_count
+        self.name = name
+        self.guid = guid
+
+    def init(self):
+        pass
+
+    def quit(self):
+        pass
+
+    def get_instance_id(self):
+        return 0
+
+    def get_name(self):
+        return self.name
+
+    def get_guid(self):
+        return self.guid
+
+    def get_numbuttons(self):
+        return len(self.buttons)
+
+    def get_axis(self, index):
+        return self.axes[index]
+
+    def get_button(self, index):
+        return self.buttons[index]
+
+
+class NullSink(OutputSink):
+    """Sink que descarta os eventos: mede o motor sem o custo de injetar no sistema."""
+
+    def _send(self, events):
+        pass
+
+
+class NullCursorBackend:
+    """Cursor que só guarda a posição (sem gravar a trajetória, para não alocar por frame)."""
+
+    def __init__(self, x=960, y=540):
+        self.x, self.y = x, y
+
+    def get_position(self):
+        return self.x, self.y
+
+    def set_position(self, x, y):
+        self.x, self.y = x, y
+
+    def move_by(self, dx, dy):
+        self.x += dx
+        self.y += dy
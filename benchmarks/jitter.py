@@ -0,0 +1,215 @@
+"""Jitter do ritmo dos frames com o motor em um thread ou em um processo separado.
+
+Uso: python -m benchmarks.jitter [--seconds 3] [--busy-ms 8] [--idle-ms 2] [--telemetry] [--reload]
+
+Roda o motor por polling de verdade (poll_frame + a espera do FrameScheduler) sobre o
+joystick falso, com o analógico inclinado para haver trabalho em todo frame, e mede o
+intervalo entre os inícios de frames. A carga simula a interface: o thread principal
+alterna trechos de Python puro (um callback pesado do Tk, ex: redesenhar a aba de
+Configurações) com pausas curtas. Com o motor em um thread, a carga disputa o GIL com
+o loop; com o motor em um processo (como pygopher.remote), não.
+
+Com --telemetry, o loop grava cada frame em um TelemetryRing e a carga também copia as
+últimas amostras no ritmo do visualizador da aba de Status; comparar com a execução sem
+a opção mostra o efeito do visualizador no ritmo dos frames.
+
+Com --reload, a carga passa a ser a recarga a quente (pygopher.reload): o .ini é
+reescrito a cada RELOAD_INTERVAL com uma zona morta nova e o ConfigWatcher o lê,
+compila (tabelas de curva incluídas) e instala no motor
+enquanto o loop roda no thread ao lado (só no modo thread: com o motor em um processo,
+a compilação nem acontece no processo dele).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from multiprocessing import get_context
+
+from pygopher.config import apply_config, default_config
+from pygopher.devices import DeviceManager
+from pygopher.engine import FPS, IDLE_FPS, IDLE_AFTER_SECONDS
+from pygopher.reload import ConfigWatcher
+from pygopher.scheduler import FrameScheduler
+from pygopher.sources import PygameSource
+from pygopher.telemetry import TelemetryRing
+
+from benchmarks.cases import _engine
+from benchmarks.fakes import FakeJoystick, NullCursorBackend
+
+SECONDS = 3.0 # Duração de cada cenário
+BUSY_MS = 8.0 # Duração de cada trecho de carga no thread principal
+IDLE_MS = 2.0 # Pausa entre dois trechos de carga
+VISUALIZER_INTERVAL = 0.05 # Segundos entre duas cópias do TelemetryRing (o VISUALIZER_REFRESH_MS da interface)
+GRAPH_SAMPLES = 150 # Amostras copiadas a cada redesenho
+RELOAD_INTERVAL = 0.1 # Segundos entre duas reescritas do .ini com --reload
+WATCH_INTERVAL = 0.02 # Intervalo do ConfigWatcher com --reload (o padrão é mais lento)
+
+
+def run_frames(seconds, telemetry=None, engine=None):
+    """Roda o loop por `seconds` e retorna os intervalos (ns) entre os inícios de frames consecutivos.
+
+    telemetry: nome do bloco de um TelemetryRing compartilhado, ou um TelemetryRing (mesmo processo).
+    """
+    joystick = FakeJoystick()
+    joystick.axes[0] = 0.6
+    joystick.axes[1] = -0.3
+    engine = engine or _engine()
+    devices = DeviceManager(None, NullCursorBackend())
+    devices.add_source(PygameSource(joystick, joystick.get_numbuttons()))
+    engine.prepare(devices)
+    ring = TelemetryRing.attach(telemetry) if isinstance(telemetry, str) else telemetry
+    engine.telemetry = ring
+    scheduler = FrameScheduler(FPS, IDLE_FPS, IDLE_AFTER_SECONDS)
+    clock = time.perf_counter_ns
+    starts = array('q')
+    end = clock() + int(seconds * 1e9)
+    while True:
+        now = clock()
+        if now >= end:
+            break
+        starts.append(now)
+        engine.poll_frame(devices, scheduler)
+        scheduler.wait()
+    if ring is not telemetry:
+        ring.close()
+    return array('q', (b - a for a, b in zip(starts, starts[1:])))
+
+
+def _process_main(seconds, conn, telemetry):
+    conn.send(run_frames(seconds, telemetry))
+    conn.close()
+
+
+def _gui_load(done, busy_ms, idle_ms, ring=None):
+    """Ocupa o thread principal com trechos de Python puro até done() ser verdadeiro.
+
+    Com um TelemetryRing, também copia as últimas amostras a cada VISUALIZER_INTERVAL.
+    """
+    next_copy = time.perf_counter()
+    while not done():
+        end = time.perf_counter() + busy_ms / 1000
+        while time.perf_counter() < end:
+            sum(range(200))
+        if ring is not None and time.perf_counter() >= next_copy:
+            ring.samples(GRAPH_SAMPLES)
+            next_copy += VISUALIZER_INTERVAL
+        time.sleep(idle_ms / 1000)
+
+
+def _reload_load(done, engine):
+    """Reescreve um .ini até done() ser verdadeiro; um ConfigWatcher instala cada versão no motor.
+
+    Cada versão tem uma zona morta nova, então toda recarga compila tabelas de curva (o pior
+    caso). Retorna (recargas, recusadas).
+    """
+    config = default_config()
+    handle, path = tempfile.mkstemp(suffix='.ini', prefix='gopher-jitter-')
+    os.close(handle)
+    with open(path, 'w') as f:
+        config.write(f)
+    watcher = ConfigWatcher(path, lambda config, profile_set: apply_config(engine, config, profile_set),
+                            lambda message: None, interval=WATCH_INTERVAL)
+    watcher.start()
+    try:
+        turn = 0
+        while not done():
+            time.sleep(RELOAD_INTERVAL)
+            turn += 1
+            config['DEFAULT']['stick_dead_zone'] = str(4000 + turn)
+            with open(path, 'w') as f:
+                config.write(f)
+    finally:
+        watcher.stop()
+        os.remove(path)
+    return watcher.reloads, watcher.rejected
+
+
+def measure(mode, load, seconds=SECONDS, busy_ms=BUSY_MS, idle_ms=IDLE_MS, telemetry=False, reload=False):
+    """Intervalos entre frames (ns) com o motor em 'thread' ou 'process', com ou sem carga no thread principal.
+
+    Com reload (só no modo thread), a carga é a recarga a quente do .ini em vez dos trechos de Python puro.
+    """
+    if mode == 'thread' and reload:
+        engine = _engine()
+        result = []
+        thread = threading.Thread(target=lambda: result.append(run_frames(seconds, engine=engine)), daemon=True)
+        thread.start()
+        if load:
+            reloads, rejected = _reload_load(lambda: not thread.is_alive(), engine)
+            if not reloads or rejected:
+                raise RuntimeError(f"Recarga a quente falhou: {reloads} recargas, {rejected} recusadas")
+        thread.join()
+        return result[0]
+    if mode == 'thread':
+        ring = TelemetryRing() if telemetry else None
+        result = []
+        thread = threading.Thread(target=lambda: result.append(run_frames(seconds, ring)), daemon=True)
+        thread.start()
+        if load:
+            _gui_load(lambda: not thread.is_alive(), busy_ms, idle_ms, ring)
+        thread.join()
+        return result[0]
+    ring = TelemetryRing.create() if telemetry else None
+    context = get_context('spawn')
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(target=_process_main, daemon=True,
+                              args=(seconds, writer, ring.name if ring is not None else None))
+    process.start()
+    writer.close()
+    try:
+        if load:
+            _gui_load(reader.poll, busy_ms, idle_ms, ring)
+        intervals = reader.recv()
+        process.join()
+    finally:
+        if ring is not None:
+            ring.close()
+    return intervals
+
+
+def summarize(intervals, period_ns=1e9 / FPS):
+    """{'media_ms', 'desvio_ms', 'p99_ms', 'max_ms', 'atrasados'}: atrasados = intervalos acima de 1,5 período."""
+    values = sorted(intervals)
+    return {
+        'media_ms': statistics.fmean(values) / 1e6,
+        'desvio_ms': statistics.pstdev(values) / 1e6,
+        'p99_ms': values[min(len(values) - 1, int(len(values) * 0.99))] / 1e6,
+        'max_ms': values[-1] / 1e6,
+        'atrasados': sum(1 for value in values if value > period_ns * 1.5),
+    }
+
+
+def main(argv=None):
+    """Mede o jitter dos frames nos quatro cenários (thread/processo, com/sem carga da interface)."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.jitter', description=main.__doc__)
+    parser.add_argument('--seconds', type=float, default=SECONDS, help="duração de cada cenário")
+    parser.add_argument('--busy-ms', type=float, default=BUSY_MS, help="duração de cada trecho de carga")
+    parser.add_argument('--idle-ms', type=float, default=IDLE_MS, help="pausa entre os trechos de carga")
+    parser.add_argument('--telemetry', action='store_true', help="liga o visualizador (TelemetryRing e cópias)")
+    parser.add_argument('--reload', action='store_true', help="a carga é a recarga a quente do .ini (só thread)")
+    args = parser.parse_args(argv)
+
+    if args.reload:
+        print(f"período alvo {1000 / FPS:.2f} ms ({FPS} FPS), .ini reescrito e recarregado a cada "
+              f"{RELOAD_INTERVAL * 1000:g} ms")
+    else:
+        print(f"período alvo {1000 / FPS:.2f} ms ({FPS} FPS), carga {args.busy_ms:g} ms a cada "
+              f"{args.busy_ms + args.idle_ms:g} ms{', visualizador ligado' if args.telemetry else ''}")
+    print(f"{'motor':<10} {'carga':<6} {'frames':>7} {'média ms':>9} {'desvio ms':>10} {'p99 ms':>7} "
+          f"{'máx ms':>7} {'atrasados':>10}")
+    for mode in ('thread',) if args.reload else ('thread', 'process'):
+        for load in (False, True):
+            intervals = measure(mode, load, args.seconds, args.busy_ms, args.idle_ms, args.telemetry, args.reload)
+            result = summarize(intervals)
+            print(f"{mode:<10} {'sim' if load else 'não':<6} {len(intervals):>7} {result['media_ms']:>9.2f} "
+                  f"{result['desvio_ms']:>10.3f} {result['p99_ms']:>7.2f} {result['max_ms']:>7.2f} "
+                  f"{result['atrasados']:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Núcleo do PYGopher: componentes do motor de entrada independentes da interface gráfica."""
@@ -0,0 +1,42 @@
+"""Ponto de entrada: python -m pygopher [--headless | --replay sessao.pgs] [--config gopher_config.ini]."""
+import argparse
+import logging
+import sys
+
+from pygopher.headless import run_headless
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pygopher', description="Usa um controle Xinput como mouse e teclado.")
+    parser.add_argument('--headless', action='store_true', help="roda só o motor de entrada, sem interface gráfica")
+    parser.add_argument('--config', default='gopher_config.ini', help="arquivo de configuração (padrão: %(default)s)")
+    parser.add_argument('--log', help="grava o log neste arquivo em vez do stderr")
+    parser.add_argument('--stats-interval', type=float, default=10.0,
+                        help="segundos entre os registros de estatísticas do loop (padrão: %(default)s)")
+    parser.add_argument('--trace', metavar='ARQUIVO.json',
+                        help="liga o perfil de frames e grava o trace do Chrome neste arquivo (SIGUSR1 e ao sair)")
+    parser.add_argument('--replay', metavar='SESSAO.pgs',
+                        help="reproduz uma sessão gravada sem controle nem injeção e imprime um resumo")
+    parser.add_argument('--realtime', action='store_true',
+                        help="com --replay, respeita os intervalos gravados em vez de reproduzir o mais rápido possível")
+    parser.add_argument('--output', metavar='ARQUIVO.txt',
+                        help="com --replay, grava o fluxo de eventos e a trajetória do cursor neste arquivo")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        from pygopher.replay import run_replay
+        return run_replay(args.replay, args.config, args.realtime, args.output)
+
+    if not args.headless:
+        # A interface gráfica continua no script original
+        from ControllerToMouse import main as gui_main
+        gui_main()
+        return 0
+
+    logging.basicConfig(filename=args.log, level=logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    return run_headless(args.config, args.stats_interval, args.trace)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
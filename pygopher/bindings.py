@@ -0,0 +1,276 @@
+"""Tabela de bindings pré-compilada do Gopher360.
+
+A tabela é montada uma única vez a partir do ``configparser`` (ao carregar ou
+salvar a configuração) e consultada pelo loop do controle com um único acesso
+por borda de botão/gatilho, sem tocar em widgets do Tkinter. As ações com tempo
+(toque/segurar, acordes, turbo e repetição de tecla) ficam em um TimedSpec e são
+executadas pelo motor com a roda de timers (ver pygopher.timers).
+"""
+from collections import namedtuple
+
+from pygopher.devices import MAX_BUTTONS
+
+# Tipos de ação que um botão/gatilho pode disparar
+ACTION_MOUSE = 'mouse'           # Clique do mouse (value = 'left' / 'right' / 'middle')
+ACTION_KEY = 'key'               # Tecla do teclado (value = nome da tecla do pyautogui)
+ACTION_HIDE_WINDOW = 'hide_window'
+ACTION_TOGGLE_DISABLE = 'disable_gopher'
+ACTION_SPEED_CHANGE = 'speed_change'
+
+# Ação pré-construída: o tipo e o argumento já resolvido (nome da tecla, botão do mouse...)
+Action = namedtuple('Action', ['kind', 'value'])
+
+# Mapeamento de códigos de tecla virtuais do Windows para nomes de teclas do pyautogui.
+# Este mapa não precisa incluir 'leftclick', 'rightclick' etc. pois eles são tratados pelos botões do mouse.
+KEY_MAP = {
+    0x08: 'backspace', 0x09: 'tab',
+    0x0C: 'clear', 0x0D: 'enter',
+    0x10: 'shift', 0x11: 'ctrl', 0x12: 'alt',
+    0x13: 'pause', 0x14: 'capslock', 0x1B: 'esc',
+    0x20: 'space',
+    0x21: 'pgup', 0x22: 'pgdn',
+    0x23: 'end', 0x24: 'home',
+    0x25: 'left', 0x26: 'up', 0x27: 'right', 0x28: 'down',
+    0x2D: 'insert', 0x2E: 'delete',
+    0x30: '0', 0x31: '1', 0x32: '2', 0x33: '3', 0x34: '4',
+    0x35: '5', 0x36: '6', 0x37: '7', 0x38: '8', 0x39: '9',
+    0x41: 'a', 0x42: 'b', 0x43: 'c', 0x44: 'd', 0x45: 'e',
+    0x46: 'f', 0x47: 'g', 0x48: 'h', 0x49: 'i', 0x4A: 'j',
+    0x4B: 'k', 0x4C: 'l', 0x4D: 'm', 0x4E: 'n', 0x4F: 'o',
+    0x50: 'p', 0x51: 'q', 0x52: 'r', 0x53: 's', 0x54: 't',
+    0x55: 'u', 0x56: 'v', 0x57: 'w', 0x58: 'x', 0x59: 'y', 0x5A: 'z',
+    0x5B: 'winleft', 0x5C: 'winright',
+    0x60: 'num0', 0x61: 'num1', 0x62: 'num2', 0x63: 'num3',
+    0x64: 'num4', 0x65: 'num5', 0x66: 'num6', 0x67: 'num7',
+    0x68: 'num8', 0x69: 'num9',
+    0x6A: 'multiply', 0x6B: 'add', 0x6C: 'separator', 0x6D: 'subtract',
+    0x6E: 'decimal', 0x6F: 'divide',
+    0x70: 'f1', 0x71: 'f2', 0x72: 'f3', 0x73: 'f4', 0x74: 'f5',
+    0x75: 'f6', 0x76: 'f7', 0x77: 'f8', 0x78: 'f9', 0x79: 'f10',
+    0x7A: 'f11', 0x7B: 'f12',
+    0x90: 'numlock', 0x91: 'scrolllock',
+    0xA0: 'shiftleft', 0xA1: 'shiftright',
+    0xA2: 'ctrlleft', 0xA3: 'ctrlright',
+    0xA4: 'altleft', 0xA5: 'altright',
+    0xA6: 'browser_back', 0xA7: 'browser_forward', 0xA8: 'browser_refresh',
+    0xA9: 'browser_stop', 0xAA: 'browser_search', 0xAB: 'browser_favorites',
+    0xAC: 'browser_home', 0xAD: 'volumemute', 0xAE: 'volumedown',
+    0xAF: 'volumeup', 0xB0: 'nexttrack', 0xB1: 'prevtrack',
+    0xB2: 'stop', 0xB3: 'playpause', 0xB4: 'launchmail',
+    0xB5: 'launchmediaselect', 0xB6: 'launchapp1', 0xB7: 'launchapp2',
+    0xBA: ';', 0xBB: '=', 0xBC: ',', 0xBD: '-', 0xBE: '.', 0xBF: '/',
+    0xC0: '`', 0xDB: '[', 0xDC: '\\', 0xDD: ']', 0xDE: "'"
+}
+
+# Opções que mapeiam um índice de botão do Pygame para um clique do mouse
+MOUSE_OPTIONS = (
+    ('mouse_left', 'left'),
+    ('mouse_right', 'right'),
+    ('mouse_middle', 'middle'),
+)
+
+# Opções que mapeiam um índice de botão do Pygame para uma função do Gopher
+GOPHER_OPTIONS = (
+    ('hide_window', ACTION_HIDE_WINDOW),
+    ('disable_gopher', ACTION_TOGGLE_DISABLE),
+    ('speed_change', ACTION_SPEED_CHANGE),
+)
+
+# Opções de mapeamento de teclas (códigos de tecla virtuais do Windows)
+KEY_OPTIONS = (
+    'dpad_up', 'dpad_down', 'dpad_left', 'dpad_right',
+    'start', 'back', 'left_thumb', 'right_thumb',
+    'left_shoulder', 'right_shoulder',
+    'a_button', 'b_button', 'x_button', 'y_button',
+    'left_trigger', 'right_trigger',
+)
+
+# Chaves do gopher_config.ini das ações com tempo e valores padrão (listas vazias = desligado)
+DEFAULT_TIMED_BINDINGS = {
+    'tap_hold': '',             # botão: tecla do toque / tecla segurada, ex: "0x3: 0x1B / 0xA0"
+    'hold_ms': '250',           # Tempo pressionado a partir do qual o botão conta como segurado
+    'chords': '',               # botão + botão: tecla, ex: "0x4 + 0x5: 0x20"
+    'chord_window_ms': '40',    # Espera pelos outros botões do acorde antes da ação própria do botão
+    'turbo': '',                # Botões com disparo automático enquanto pressionados, ex: "0x0, 0x1"
+    'turbo_hz': '12',           # Cliques/teclas por segundo no turbo
+    'key_repeat_delay_ms': '0', # Espera até repetir uma tecla segurada (0 = sem repetição)
+    'key_repeat_hz': '30',      # Repetições por segundo de uma tecla segurada
+}
+
+
+def parse_hex(hex_str):
+    """Converte uma string hexadecimal em inteiro. Levanta ValueError se for inválida."""
+    return int(hex_str.strip(), 16)
+
+
+def key_from_hex(hex_str):
+    """Converte um código de tecla virtual do Windows (hex) para o nome da tecla do pyautogui.
+
+    Retorna None para '0x0' (valor nulo) ou códigos sem mapeamento e levanta
+    ValueError para valores hex inválidos.
+    """
+    if not hex_str or hex_str.strip().lower() == '0x0':
+        return None
+    return KEY_MAP.get(parse_hex(hex_str), None)
+
+
+class TimedSpec:
+    """Ações com tempo já resolvidas: toque/segurar, acordes, turbo e repetição de tecla."""
+
+    __slots__ = ('tap_hold', 'chords', 'chord_buttons', 'turbo', 'hold_delay', 'chord_window',
+                 'turbo_interval', 'repeat_delay', 'repeat_interval')
+
+    def __init__(self, tap_hold=None, chords=(), turbo=0, hold_delay=0.25, chord_window=0.04,
+                 turbo_hz=12.0, repeat_delay=0.0, repeat_hz=30.0):
+        self.tap_hold = tap_hold or {} # {índice do botão: (Action do toque ou None, Action segurada ou None)}
+        self.chords = tuple(chords)    # ((máscara dos botões, Action), ...)
+        self.chord_buttons = 0         # Máscara de todos os botões que fazem parte de algum acorde
+        for mask, _ in self.chords:
+            self.chord_buttons |= mask
+        self.turbo = turbo             # Máscara dos botões com turbo
+        self.hold_delay = hold_delay   # Todos os tempos em segundos
+        self.chord_window = chord_window
+        self.turbo_interval = 0.5 / turbo_hz # Meio período: o turbo alterna pressionar e soltar
+        self.repeat_delay = repeat_delay     # 0 = sem repetição de tecla
+        self.repeat_interval = 1.0 / repeat_hz
+
+
+class BindingTable:
+    """Tabela imutável de ações já resolvidas, indexada por botão e por gatilho."""
+
+    __slots__ = ('buttons', 'triggers', 'timed', 'errors')
+
+    def __init__(self, buttons, triggers, errors=(), timed=None):
+        self.buttons = buttons    # {índice do botão: (Action, ...)}
+        self.triggers = triggers  # {'left' / 'right': Action ou None}
+        self.timed = timed if timed is not None else TimedSpec()
+        self.errors = tuple(errors)  # Mensagens de valores inválidos encontrados na compilação
+
+
+def compile_bindings(section):
+    """Compila uma seção do configparser (ex: config['DEFAULT']) em uma BindingTable."""
+    buttons = {}
+    errors = []
+
+    def add(button_idx, action):
+        buttons.setdefault(button_idx, []).append(action)
+
+    def read_index(option):
+        value = section.get(option, '0x0')
+        try:
+            return parse_hex(value)
+        except ValueError:
+            errors.append(f"Valor Hex Inválido em '{option}': '{value}'")
+            return None
+
+    # Cliques do mouse e funções do Gopher são exclusivos: vale o primeiro que casar,
+    # na mesma ordem do antigo encadeamento de if/elif.
+    primary_taken = set()
+    for option, button in MOUSE_OPTIONS:
+        idx = read_index(option)
+        if idx is not None and idx not in primary_taken:
+            primary_taken.add(idx)
+            add(idx, Action(ACTION_MOUSE, button))
+    for option, kind in GOPHER_OPTIONS:
+        idx = read_index(option)
+        if idx is not None and idx not in primary_taken:
+            primary_taken.add(idx)
+            add(idx, Action(kind, None))
+
+    # Mapeamentos de teclas: o botão de mesmo índice que o código pressiona a tecla
+    for option in KEY_OPTIONS:
+        value = section.get(option, '0x0')
+        try:
+            key_name = key_from_hex(value)
+        except ValueError:
+            errors.append(f"Valor Hex Inválido em '{option}': '{value}'")
+            continue
+        if key_name is not None:
+            add(parse_hex(value), Action(ACTION_KEY, key_name))
+
+    # Gatilhos: o valor configurado é diretamente a tecla a ser pressionada
+    triggers = {}
+    for side in ('left', 'right'):
+        try:
+            key_name = key_from_hex(section.get(f'{side}_trigger', '0x0'))
+        except ValueError:
+            key_name = None  # Já registrado acima
+        triggers[side] = Action(ACTION_KEY, key_name) if key_name is not None else None
+
+    timed = compile_timed(section, errors)
+
+    return BindingTable(
+        {idx: tuple(actions) for idx, actions in buttons.items()},
+        triggers,
+        errors,
+        timed,
+    )
+
+
+def compile_timed(section, errors):
+    """Compila as chaves de DEFAULT_TIMED_BINDINGS em um TimedSpec; erros são acrescentados a `errors`."""
+
+    def read_number(option, minimum):
+        text = section.get(option, DEFAULT_TIMED_BINDINGS[option])
+        try:
+            value = float(text)
+            if value >= minimum:
+                return value
+        except ValueError:
+            pass
+        errors.append(f"Valor inválido em '{option}': '{text}'")
+        return float(DEFAULT_TIMED_BINDINGS[option])
+
+    def read_button(text):
+        idx = parse_hex(text)
+        if not 0 <= idx < MAX_BUTTONS:
+            raise ValueError(text)
+        return idx
+
+    def read_key(text):
+        key_name = key_from_hex(text)
+        return Action(ACTION_KEY, key_name) if key_name is not None else None
+
+    def entries(option):
+        return [item.strip() for item in section.get(option, '').split(',') if item.strip()]
+
+    # "botão: toque / segurado"; qualquer um dos lados pode ser 0x0 (nada)
+    tap_hold = {}
+    for item in entries('tap_hold'):
+        try:
+            button, keys = item.split(':', 1)
+            tap, hold = keys.split('/', 1)
+            tap_hold[read_button(button)] = (read_key(tap), read_key(hold))
+        except ValueError:
+            errors.append(f"Valor inválido em 'tap_hold': '{item}'")
+
+    # "botão + botão [+ ...]: tecla"
+    chords = []
+    for item in entries('chords'):
+        try:
+            buttons, key = item.split(':', 1)
+            mask = 0
+            for button in buttons.split('+'):
+                mask |= 1 << read_button(button)
+            action = read_key(key)
+            if action is None or bin(mask).count('1') < 2:
+                raise ValueError(item)
+            chords.append((mask, action))
+        except ValueError:
+            errors.append(f"Valor inválido em 'chords': '{item}'")
+
+    turbo = 0
+    for item in entries('turbo'):
+        try:
+            turbo |= 1 << read_button(item)
+        except ValueError:
+            errors.append(f"Valor inválido em 'turbo': '{item}'")
+
+    return TimedSpec(
+        tap_hold, chords, turbo,
+        hold_delay=read_number('hold_ms', 1.0) / 1000,
+        chord_window=read_number('chord_window_ms', 1.0) / 1000,
+        turbo_hz=read_number('turbo_hz', 0.1),
+        repeat_delay=read_number('key_repeat_delay_ms', 0.0) / 1000,
+        repeat_hz=read_number('key_repeat_hz', 0.1),
+    )
@@ -0,0 +1,83 @@
+"""Leitura do gopher_config.ini e valores padrão, sem depender da interface gráfica."""
+import configparser
+
+from pygopher.bindings import DEFAULT_TIMED_BINDINGS
+from pygopher.curves import DEFAULT_CURVE
+from pygopher.filters import DEFAULT_FILTERS
+from pygopher.scroll import DEFAULT_SCROLL
+from pygopher.sources import DEFAULT_SOURCE_SETTINGS
+from pygopher.profiles import DEFAULT_PROFILE_SETTINGS, compile_profile_set
+from pygopher.remote import DEFAULT_PROCESS_SETTINGS
+from pygopher.reload import DEFAULT_RELOAD_SETTINGS
+from pygopher.engine import INPUT_MODES, INPUT_MODE_POLLING
+
+# Mapeamentos padrão dos botões do controle para ações
+# IMPORTANTE: mouse_left/right/middle e outros usam os índices de botões do Pygame (0, 1, 2, etc.)
+# Outros mapeamentos (dpad_up, start, etc.) usam códigos de tecla virtuais do Windows (hex)
+DEFAULT_MAPPINGS = {
+    # Cliques do mouse (usando índices de botões do Pygame)
+    'mouse_left': '0x0',    # Botão 'A' (índice 0)
+    'mouse_right': '0x1',   # Botão 'B' (índice 1)
+    'mouse_middle': '0x2',  # Botão 'X' (índice 2)
+
+    # Funções do Gopher360
+    'hide_window': '0x7A', # F11
+    'disable_gopher': '0x24', # Home
+    'speed_change': '0x21', # Page Up
+
+    # Mapeamentos de teclas (usando códigos de tecla virtuais do Windows)
+    'dpad_up': '0x26',      # Seta para cima
+    'dpad_down': '0x28',    # Seta para baixo
+    'dpad_left': '0x25',    # Seta para esquerda
+    'dpad_right': '0x27',   # Seta para direita
+    'start': '0x0D',        # Enter
+    'back': '0x08',         # Backspace
+    'left_thumb': '0x71',   # F2
+    'right_thumb': '0x72',  # F3
+    'left_shoulder': '0xA0', # Shift esquerdo
+    'right_shoulder': '0xA1', # Shift direito
+    'a_button': '0x0',      # Ação separada para 'A' se não for clique do mouse
+    'b_button': '0x0',      # Ação separada para 'B' se não for clique do mouse
+    'x_button': '0x0',      # Ação separada para 'X' se não for clique do mouse
+    'y_button': '0x0',      # Ação separada para 'Y' se não for clique do mouse
+    'left_trigger': '0x20', # Espaço
+    'right_trigger': '0x08' # Backspace (exemplo, você pode mudar)
+}
+
+def default_config():
+    """Cria um ConfigParser só com os valores padrão."""
+    config = configparser.ConfigParser()
+    for key, value in DEFAULT_MAPPINGS.items():
+        config['DEFAULT'][key] = value
+    config['DEFAULT']['sensitivity_multiplier'] = str(1.0)
+    config['DEFAULT']['input_mode'] = INPUT_MODE_POLLING
+    for key, value in dict(DEFAULT_CURVE, **DEFAULT_FILTERS, **DEFAULT_SCROLL, **DEFAULT_PROFILE_SETTINGS,
+                                   **DEFAULT_SOURCE_SETTINGS, **DEFAULT_TIMED_BINDINGS,
+                                   **DEFAULT_PROCESS_SETTINGS, **DEFAULT_RELOAD_SETTINGS).items():
+        config['DEFAULT'][key] = value
+    return config
+
+
+def read_config(path):
+    """Lê o arquivo .ini. Levanta ValueError se ele não existir ou não puder ser lido."""
+    config = configparser.ConfigParser()
+    if not config.read(path):
+        raise ValueError(f"Não foi possível ler o arquivo de configuração '{path}'")
+    return config
+
+
+def apply_config(engine, config, profile_set=None):
+    """Aplica perfis (bindings, curva, filtros e rolagem), sensibilidade e motor de entrada ao motor.
+
+    profile_set é o resultado já compilado de `config` (ex: de pygopher.profiles.load_profile_set
+    ou do vigia de recarga); sem ele, a configuração é compilada aqui.
+    Retorna o ProfileSet, cujo errors traz os erros de validação de todos os perfis.
+    """
+    if profile_set is None:
+        profile_set = compile_profile_set(config)
+    engine.set_profiles(profile_set)
+    section = config['DEFAULT']
+    engine.set_sensitivity(config.getfloat('DEFAULT', 'sensitivity_multiplier', fallback=1.0))
+    input_mode = section.get('input_mode', INPUT_MODE_POLLING)
+    engine.input_mode = input_mode if input_mode in INPUT_MODES else INPUT_MODE_POLLING
+    return profile_set
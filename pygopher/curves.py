@@ -0,0 +1,202 @@
+"""Curvas de resposta do analógico, compiladas em tabelas de consulta.
+
+Uma curva combina a geometria da zona morta (radial ou por eixo), uma zona morta
+externa, uma anti-zona-morta e o formato (linear, exponencial ou pontos definidos
+pelo usuário). Ao compilar, a curva é avaliada sobre toda a faixa de 16 bits dos
+eixos e guardada em um ``array``; no loop do controle, o custo por frame é um
+índice na tabela, sem raiz quadrada nem divisão.
+
+A saída fica nas mesmas unidades da fórmula antiga: com zona morta radial, curva
+linear e sem zona externa nem anti-zona-morta, o deslocamento é idêntico ao de
+``(length - DEAD_ZONE) / length``.
+"""
+from array import array
+
+AXIS_MAX = 32767
+
+SHAPE_RADIAL = 'radial' # Zona morta sobre o comprimento do vetor (x, y)
+SHAPE_AXIAL = 'axial'   # Zona morta aplicada a cada eixo separadamente
+SHAPES = (SHAPE_RADIAL, SHAPE_AXIAL)
+
+CURVE_LINEAR = 'linear'
+CURVE_EXPONENTIAL = 'exponential'
+CURVE_CUSTOM = 'custom' # Interpolação linear entre pontos "entrada:saída" (0 a 1)
+CURVES = (CURVE_LINEAR, CURVE_EXPONENTIAL, CURVE_CUSTOM)
+
+# Tabela radial: indexada pelo quadrado do comprimento deslocado RADIAL_SHIFT bits
+# (2 * 32767² >> 15 = 65532 entradas; ~4 unidades de resolução perto da zona morta padrão)
+RADIAL_SHIFT = 15
+RADIAL_SIZE = ((2 * AXIS_MAX * AXIS_MAX) >> RADIAL_SHIFT) + 1
+AXIAL_OFFSET = AXIS_MAX + 1 # Tabela por eixo: índice = valor + AXIAL_OFFSET
+AXIAL_SIZE = 2 * AXIS_MAX + 2
+
+_tables = {} # Parâmetros da curva -> tabela já compilada, só das curvas em uso (ver retain_tables)
+
+# Chaves do gopher_config.ini e valores padrão (reproduzem o movimento original)
+DEFAULT_CURVE = {
+    'stick_dead_zone': '4000',          # Zona morta interna, em unidades do eixo (0-32767)
+    'stick_outer_dead_zone': '0',       # Faixa final do curso tratada como deflexão máxima
+    'stick_anti_dead_zone': '0.0',      # Saída mínima logo após a zona morta (0 a 1)
+    'stick_dead_zone_shape': SHAPE_RADIAL,
+    'stick_curve': CURVE_LINEAR,
+    'stick_curve_exponent': '2.0',      # Usado por stick_curve = exponential
+    'stick_curve_points': '0:0, 0.5:0.25, 1:1', # Usado por stick_curve = custom
+}
+
+
+class ResponseCurve:
+    """Curva compilada: a tabela e os parâmetros que a geraram."""
+
+    __slots__ = ('shape', 'curve', 'dead_zone', 'outer_dead_zone', 'anti_dead_zone', 'radial',
+                 'key', 'table', 'errors')
+
+    def __init__(self, shape=SHAPE_RADIAL, curve=CURVE_LINEAR, dead_zone=4000, outer_dead_zone=0,
+                 anti_dead_zone=0.0, exponent=2.0, points=((0.0, 0.0), (1.0, 1.0)), errors=()):
+        self.shape = shape
+        self.curve = curve
+        self.dead_zone = dead_zone
+        self.outer_dead_zone = outer_dead_zone
+        self.anti_dead_zone = anti_dead_zone
+        self.radial = shape == SHAPE_RADIAL
+        self.errors = tuple(errors)
+        self.key = key = (shape, curve, dead_zone, outer_dead_zone, anti_dead_zone, exponent, tuple(points))
+        table = _tables.get(key)
+        if table is None:
+            evaluate = _magnitude_function(curve, dead_zone, outer_dead_zone, anti_dead_zone, exponent, points)
+            table = _build_radial(evaluate) if self.radial else _build_axial(evaluate)
+            _tables[key] = table
+        self.table = table # Somente leitura depois de pronta: pode ser compartilhada entre curvas iguais
+
+    def deltas(self, ix, iy):
+        """Deslocamento (dx, dy), em unidades do eixo, para os eixos quantizados ix, iy."""
+        table = self.table
+        if self.radial:
+            scale = table[(ix * ix + iy * iy) >> RADIAL_SHIFT]
+            return ix * scale, iy * scale
+        return table[ix + AXIAL_OFFSET], table[iy + AXIAL_OFFSET]
+
+    def active(self, ix, iy):
+        """Indica se o analógico está fora da zona morta."""
+        table = self.table
+        if self.radial:
+            return table[(ix * ix + iy * iy) >> RADIAL_SHIFT] != 0.0
+        return table[ix + AXIAL_OFFSET] != 0.0 or table[iy + AXIAL_OFFSET] != 0.0
+
+
+def _magnitude_function(curve, dead_zone, outer_dead_zone, anti_dead_zone, exponent, points):
+    """Monta a função comprimento (unidades do eixo) -> comprimento de saída."""
+    span = max(1, AXIS_MAX - dead_zone - outer_dead_zone) # Faixa útil entre as zonas mortas
+
+    if curve == CURVE_EXPONENTIAL:
+        def shape(t):
+            return t ** exponent
+    elif curve == CURVE_CUSTOM:
+        def shape(t):
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                if t <= x1:
+                    return y0 if x1 == x0 else y0 + (y1 - y0) * (t - x0) / (x1 - x0)
+            return points[-1][1]
+    else:
+        def shape(t):
+            return t
+
+    def evaluate(length):
+        if length <= dead_zone:
+            return 0.0
+        t = (length - dead_zone) / span
+        if outer_dead_zone and t > 1.0:
+            t = 1.0 # Na zona externa a saída é a máxima; sem ela, as diagonais (> 32767) seguem a curva
+        return (anti_dead_zone + (1.0 - anti_dead_zone) * shape(t)) * span
+
+    return evaluate
+
+
+def _build_radial(evaluate):
+    """Tabela de escala (saída / comprimento) indexada por comprimento² >> RADIAL_SHIFT."""
+    table = array('d', bytes(8 * RADIAL_SIZE))
+    half_bucket = 1 << (RADIAL_SHIFT - 1)
+    for index in range(1, RADIAL_SIZE):
+        length = ((index << RADIAL_SHIFT) + half_bucket) ** 0.5 # Centro do bucket
+        table[index] = evaluate(length) / length
+    return table
+
+
+def _build_axial(evaluate):
+    """Tabela de saída com sinal indexada por valor do eixo + AXIAL_OFFSET."""
+    table = array('d', bytes(8 * AXIAL_SIZE))
+    for value in range(1, AXIS_MAX + 1):
+        out = evaluate(value)
+        table[AXIAL_OFFSET + value] = out
+        table[AXIAL_OFFSET - value] = -out
+    return table
+
+
+def retain_tables(keys):
+    """Descarta as tabelas compiladas cujos parâmetros não estão em `keys` (curvas que nenhum perfil usa mais).
+
+    As curvas já criadas continuam com a própria tabela: só a próxima compilação delas fica mais cara.
+    """
+    for key in [key for key in list(_tables) if key not in keys]: # list(): o vigia pode compilar ao mesmo tempo
+        _tables.pop(key, None)
+
+
+def table_size(shape):
+    """Quantidade de entradas da tabela de uma curva com a geometria `shape`."""
+    return RADIAL_SIZE if shape == SHAPE_RADIAL else AXIAL_SIZE
+
+
+def add_tables(items):
+    """Registra tabelas compiladas antes (ex: lidas do cache em disco); as já compiladas são mantidas."""
+    for key, table in items:
+        _tables.setdefault(key, table)
+
+
+def parse_points(text):
+    """Lê pontos "entrada:saída, ..." (0 a 1) ordenados pela entrada. Levanta ValueError."""
+    points = []
+    for item in text.split(','):
+        x, sep, y = item.partition(':')
+        if not sep:
+            raise ValueError(f"Ponto inválido: '{item.strip()}'")
+        points.append((float(x), float(y)))
+    points.sort()
+    if len(points) < 2 or points[0][0] > 0.0 or points[-1][0] < 1.0:
+        raise ValueError("A curva precisa de pelo menos dois pontos cobrindo a entrada de 0 a 1")
+    return tuple(points)
+
+
+def compile_curve(section):
+    """Compila as chaves stick_* de uma seção do configparser em uma ResponseCurve.
+
+    Valores inválidos são trocados pelo padrão e descritos em ResponseCurve.errors.
+    """
+    errors = []
+
+    def read(option, convert, valid=lambda value: True):
+        text = section.get(option, DEFAULT_CURVE[option])
+        try:
+            value = convert(text)
+            if valid(value):
+                return value
+        except ValueError:
+            pass
+        errors.append(f"Valor inválido em '{option}': '{text}'")
+        return convert(DEFAULT_CURVE[option])
+
+    def choice(options):
+        def convert(text):
+            text = text.strip().lower()
+            if text not in options:
+                raise ValueError(text)
+            return text
+        return convert
+
+    dead_zone = read('stick_dead_zone', int, lambda v: 0 <= v < AXIS_MAX)
+    outer = read('stick_outer_dead_zone', int, lambda v: 0 <= v < AXIS_MAX - dead_zone)
+    anti = read('stick_anti_dead_zone', float, lambda v: 0.0 <= v < 1.0)
+    shape = read('stick_dead_zone_shape', choice(SHAPES))
+    curve = read('stick_curve', choice(CURVES))
+    exponent = read('stick_curve_exponent', float, lambda v: v > 0.0)
+    points = read('stick_curve_points', parse_points)
+    return ResponseCurve(shape, curve, dead_zone, outer, anti, exponent, points, errors)
+
@@ -0,0 +1,250 @@
+"""Gerenciamento de vários controles com conexão e desconexão a quente.
+
+Os controles são abertos e fechados um a um a partir dos eventos JOYDEVICEADDED e
+JOYDEVICEREMOVED do Pygame, sem reiniciar o subsistema de joystick: os controles que
+já estão conectados continuam sendo lidos normalmente. Cada controle tem o próprio
+estado (botões, gatilhos, resto sub-pixel do cursor) em um ControllerState e é lido
+por uma InputSource (ver pygopher.sources).
+"""
+import threading
+import time
+from array import array
+
+from pygopher.motion import VirtualCursor
+from pygopher.sources import (
+    SOURCE_PYGAME, SOURCE_XINPUT, PygameSource, XInputSource, connected_xinput_ports, load_xinput,
+)
+
+AXIS_COUNT = 6 # Mesmo valor de engine.AXIS_COUNT (eixos lidos por controle)
+MAX_BUTTONS = 32 # Botões lidos por controle (mesma largura da máscara gravada nas sessões)
+
+# Estado de botões e gatilhos em uma única máscara: bit i = botão i, e os gatilhos acima dos botões
+TRIGGER_LEFT_BIT = 1 << MAX_BUTTONS
+TRIGGER_RIGHT_BIT = 1 << (MAX_BUTTONS + 1)
+BUTTONS_MASK = TRIGGER_LEFT_BIT - 1
+
+
+class ControllerState:
+    """Estado de um controle: dispositivo, perfil e o que o motor precisa lembrar entre frames."""
+
+    __slots__ = ('instance_id', 'joystick', 'source', 'name', 'guid', 'profile_keys', 'button_count', 'cursor',
+                 'polled', 'packet', 'idle', 'last_tick', 'state_mask', 'press_tables', 'press_triggers', 'axes', 'held_mask',
+                 'timers', 'deferred_mask', 'chorded_mask', 'chord_actions', 'turbo_released',
+                 'filter_spec', 'filters', 'filtered')
+
+    def __init__(self, cursor, joystick=None, instance_id=None, name='', guid='', source=None):
+        self.instance_id = instance_id
+        self.joystick = joystick
+        self.name = name
+        self.guid = guid
+        # Chaves procuradas em GopherEngine.profiles: GUID primeiro, depois o nome (sem maiúsculas)
+        self.profile_keys = tuple(key for key in (guid.casefold(), name.casefold()) if key)
+        self.button_count = min(joystick.get_numbuttons(), MAX_BUTTONS) if joystick is not None else 0
+        if source is None and joystick is not None:
+            source = PygameSource(joystick, self.button_count)
+        self.source = source # InputSource lida pelo motor por polling
+        self.polled = None # Último (pacote, máscara) lido da fonte, ou None se o controle não respondeu
+        self.cursor = cursor # VirtualCursor próprio: cada controle acumula a sua fração de pixel
+        self.filter_spec = None # FilterSpec que gerou self.filters (recriado quando o spec muda)
+        self.filters = None # FilterPipeline próprio, com o estado dos filtros deste controle
+        # Último valor lido de cada eixo (bruto, sem filtros): a fonte escreve sempre neste mesmo buffer
+        self.axes = array('d', bytes(8 * AXIS_COUNT))
+        self.filtered = array('d', bytes(8 * AXIS_COUNT)) # Eixos filtrados do último frame/tick
+        self.timers = {} # Índice do botão -> Timer pendente (toque/segurar, acorde, turbo ou repetição)
+        self.reset()
+
+    def reset(self):
+        """Esquece o estado anterior de botões, gatilhos e eixos."""
+        # Botões (bits 0..MAX_BUTTONS-1) e gatilhos (TRIGGER_*_BIT) cujo pressionamento foi tratado
+        self.state_mask = 0
+        # Tabela/ação usada no pressionamento: a soltura usa a mesma, mesmo que o perfil tenha mudado
+        self.press_tables = {}
+        self.press_triggers = {'left': None, 'right': None}
+        # Ações com tempo (ver GopherEngine.handle_button_press)
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers = {}
+        self.deferred_mask = 0 # Botões esperando a janela do acorde antes da ação própria
+        self.chorded_mask = 0 # Botões consumidos por um acorde: a soltura não dispara a ação própria
+        self.chord_actions = {} # Máscara do acorde -> Action pressionada por ele
+        self.turbo_released = 0 # Botões com turbo cujas ações estão soltas na fase atual
+        axes = self.axes
+        for i in range(AXIS_COUNT):
+            axes[i] = 0.0 # No lugar: a fonte pode não reescrever o buffer enquanto o pacote não mudar
+        self.packet = None # Pacote da fonte já processado (None = processa o próximo frame de qualquer forma)
+        self.idle = False # O último frame processado não tinha nenhuma entrada ativa
+        self.last_tick = None # Instante (s) do último tick com um analógico ativo (ver GopherEngine.tick_dt)
+        if self.source is not None:
+            self.source.invalidate()
+        self.held_mask = 0 # Botões fisicamente pressionados (para a gravação de sessão)
+        if self.filters is not None:
+            self.filters.reset()
+        self.cursor.invalidate() # O cursor pode ter sido movido enquanto o controle estava parado
+
+
+class DeviceManager:
+    """Abre e fecha controles de forma incremental a partir dos eventos de hotplug do Pygame.
+
+    devices é uma tupla trocada por inteiro a cada mudança, então o loop do controle e a
+    interface podem percorrê-la sem trava enquanto outro thread conecta ou desconecta.
+
+    Com input_source = xinput, os controles são as portas do XInput e os eventos de hotplug
+    do Pygame só servem de aviso para reler as portas. pygame pode ser None quando todos os
+    controles vêm de add_source (ex: fontes roteirizadas, sem dispositivo).
+    """
+
+    def __init__(self, pygame, cursor_backend, input_source=SOURCE_PYGAME):
+        self.pygame = pygame
+        self.cursor_backend = cursor_backend
+        self.devices = ()
+        self.by_instance = {}
+        self.device_events = (pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED) if pygame is not None else ()
+        self.source_error = None # Motivo de ter voltado ao Pygame quando o XInput foi pedido
+        self._xinput = None
+        if input_source == SOURCE_XINPUT:
+            try:
+                self._xinput = load_xinput()
+            except OSError as e:
+                self.source_error = str(e)
+                input_source = SOURCE_PYGAME
+        self.input_source = input_source
+        self._next_source_id = -1 # instance_id dos controles sem joystick do Pygame (negativos, sem colisão)
+        self.stats = {'added': 0, 'removed': 0, 'last_open_us': 0.0, 'max_open_us': 0.0,
+                      'last_reconnect_s': None}
+        self._removed_at = {} # GUID -> perf_counter da última desconexão (para a latência de reconexão)
+        self._lock = threading.Lock() # scan() pode vir da interface enquanto o loop trata eventos
+
+    def scan(self):
+        """Abre os controles conectados que ainda não estão abertos. Retorna os novos."""
+        if self.input_source == SOURCE_XINPUT:
+            return self._scan_xinput()
+        added = []
+        if self.pygame is None:
+            return added
+        for index in range(self.pygame.joystick.get_count()):
+            state = self.open(index)
+            if state is not None:
+                added.append(state)
+        return added
+
+    def restrict_events(self, types=()):
+        """Só os eventos de hotplug (e os `types` dados) entram na fila do Pygame.
+
+        Os demais (eixos, botões, janela) não são consumidos por ninguém: enfileirados, eles
+        encheriam a fila e o SDL passaria a descartar os próprios eventos de hotplug.
+        """
+        event = self.pygame.event
+        event.set_blocked(None)
+        event.set_allowed(list(self.device_events) + list(types))
+
+    def poll(self):
+        """Trata os eventos de hotplug pendentes (usado quando o loop do controle está parado)."""
+        self.restrict_events()
+        changes = []
+        for event in self.pygame.event.get(self.device_events):
+            change = self.handle_event(event)
+            if change is not None:
+                changes.append(change)
+        return changes
+
+    def handle_event(self, event):
+        """Trata um evento JOYDEVICEADDED/JOYDEVICEREMOVED.
+
+        Retorna (True, estado) para um controle aberto, (False, estado) para um removido
+        ou None se o evento não mudou nada.
+        """
+        if self.input_source == SOURCE_XINPUT:
+            # O evento só avisa que algo mudou: as portas do XInput são relidas
+            if event.type == self.pygame.JOYDEVICEADDED:
+                added = self._scan_xinput()
+                return (True, added[0]) if added else None
+            for state in self.devices:
+                if isinstance(state.source, XInputSource) and not state.source.connected():
+                    return (False, self.close(state.instance_id))
+            return None
+        if event.type == self.pygame.JOYDEVICEADDED:
+            state = self.open(event.device_index)
+            return (True, state) if state is not None else None
+        if event.type == self.pygame.JOYDEVICEREMOVED:
+            state = self.close(event.instance_id)
+            return (False, state) if state is not None else None
+        return None
+
+    def open(self, device_index):
+        """Abre o controle de índice dado, se ainda não estiver aberto."""
+        start = time.perf_counter()
+        with self._lock:
+            try:
+                joystick = self.pygame.joystick.Joystick(device_index)
+                instance_id = joystick.get_instance_id()
+                if instance_id in self.by_instance:
+                    return None
+                joystick.init()
+                guid = joystick.get_guid() if hasattr(joystick, 'get_guid') else ''
+                state = ControllerState(VirtualCursor(self.cursor_backend), joystick, instance_id,
+                                        joystick.get_name(), guid)
+            except self.pygame.error:
+                return None # Desconectado entre o evento e a abertura
+            self.by_instance[instance_id] = state
+            self.devices = self.devices + (state,)
+        self._opened(state, start)
+        return state
+
+    def add_source(self, source):
+        """Adiciona um controle lido por uma InputSource sem joystick do Pygame (XInput, roteirizada)."""
+        start = time.perf_counter()
+        with self._lock:
+            instance_id = self._next_source_id
+            self._next_source_id -= 1
+            state = ControllerState(VirtualCursor(self.cursor_backend), None, instance_id, source.name, source.guid,
+                                    source)
+            self.by_instance[instance_id] = state
+            self.devices = self.devices + (state,)
+        self._opened(state, start)
+        return state
+
+    def _scan_xinput(self):
+        """Abre as portas do XInput conectadas que ainda não estão abertas."""
+        opened = {state.source.user_index for state in self.devices if isinstance(state.source, XInputSource)}
+        return [self.add_source(XInputSource(port, self._xinput))
+                for port in connected_xinput_ports(self._xinput) if port not in opened]
+
+    def _opened(self, state, start):
+        """Atualiza as estatísticas de conexão de um controle recém-aberto."""
+        elapsed = time.perf_counter() - start
+        stats = self.stats
+        stats['added'] += 1
+        stats['last_open_us'] = elapsed * 1e6
+        stats['max_open_us'] = max(stats['max_open_us'], stats['last_open_us'])
+        removed_at = self._removed_at.pop(state.guid, None) if state.guid else None
+        if removed_at is not None:
+            stats['last_reconnect_s'] = time.perf_counter() - removed_at
+
+    def close(self, instance_id):
+        """Fecha o controle com o instance_id dado e retorna o seu estado (ou None)."""
+        with self._lock:
+            state = self.by_instance.pop(instance_id, None)
+            if state is None:
+                return None
+            self.devices = tuple(d for d in self.devices if d is not state)
+        if state.guid:
+            self._removed_at[state.guid] = time.perf_counter()
+        self.stats['removed'] += 1
+        try:
+            state.source.close()
+        except (self.pygame.error,) if self.pygame is not None else ():
+            pass # O dispositivo já não existe
+        return state
+
+    def close_all(self):
+        for state in self.devices:
+            self.close(state.instance_id)
+
+
+def format_hotplug(stats):
+    """Resumo de uma linha das estatísticas de conexão (DeviceManager.stats)."""
+    text = (f"hotplug: {stats['added']} conectados, {stats['removed']} removidos, "
+            f"abertura {stats['last_open_us']:.0f} µs (máx {stats['max_open_us']:.0f} µs)")
+    if stats['last_reconnect_s'] is not None:
+        text += f", última reconexão em {stats['last_reconnect_s']:.2f} s"
+    return text
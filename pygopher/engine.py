@@ -0,0 +1,808 @@
+"""Motor de entrada do Gopher360, independente da interface gráfica.
+
+O motor lê o controle, move o cursor e despacha os bindings. Ele não conhece o
+Tkinter: mudanças de estado que interessam à interface (desabilitar, velocidade,
+ocultar janela) são avisadas por um EngineListener. O pygame só é importado quando
+o motor roda de verdade, então o processamento de frames (process_frame) pode ser
+usado sem dispositivo, por exemplo no replay de sessões gravadas.
+
+Vários controles são lidos pelo mesmo loop: o DeviceManager trata a conexão a quente
+e cada controle traz o próprio estado (ControllerState). Os handlers agem sobre
+self.device, o controle do frame sendo processado.
+"""
+import threading
+import time
+
+from pygopher.scheduler import FrameScheduler
+from pygopher.timers import TimerWheel
+from pygopher.trace import (
+    SPAN_PUMP, SPAN_READ, SPAN_FILTER, SPAN_MOTION, SPAN_CURSOR, SPAN_SCROLL, SPAN_BUTTONS, SPAN_TIMERS, SPAN_INJECT,
+)
+from pygopher.metrics import FrameMetrics
+from pygopher.motion import REFERENCE_FPS, NOMINAL_TICK_SECONDS, MAX_TICK_SECONDS
+from pygopher.devices import ControllerState, MAX_BUTTONS, TRIGGER_LEFT_BIT, TRIGGER_RIGHT_BIT, BUTTONS_MASK
+from pygopher.curves import ResponseCurve, RADIAL_SHIFT, AXIAL_OFFSET, retain_tables
+from pygopher.filters import FilterSpec
+from pygopher.scroll import ScrollSpec, ScrollState
+from pygopher.sources import SOURCE_PYGAME
+from pygopher.profiles import DEFAULT_PROFILE, ActiveProfile, Profile, ProfileSet
+from pygopher.bindings import (
+    BindingTable,
+    ACTION_MOUSE, ACTION_KEY, ACTION_HIDE_WINDOW, ACTION_TOGGLE_DISABLE, ACTION_SPEED_CHANGE,
+)
+
+# --- Configurações do Motor ---
+DEAD_ZONE = 4000  # Limiar padrão para movimento do analógico (evita drift); ver pygopher.curves
+FPS = 150 # Frames por segundo para o loop do controle
+SLEEP_AMOUNT = 1.0 / FPS # Tempo de espera entre cada iteração do loop
+TRIGGER_THRESHOLD = 0.5 # Limiar para considerar o gatilho "pressionado"
+_TRIGGER_AXIS_THRESHOLD = TRIGGER_THRESHOLD * 2 - 1 # O mesmo limiar no valor bruto do eixo (-1..1)
+AXIS_COUNT = 6 # Analógicos esquerdo (0, 1) e direito (2, 3) e gatilhos (4, 5)
+
+# Motores de entrada disponíveis
+INPUT_MODE_POLLING = 'polling' # Lê o controle a cada frame, em FPS fixo
+INPUT_MODE_EVENTS = 'events'   # Bloqueia na fila de eventos do Pygame; ~0% de CPU com o controle parado
+INPUT_MODES = (INPUT_MODE_POLLING, INPUT_MODE_EVENTS)
+EVENT_IDLE_TIMEOUT_MS = 250 # Intervalo máximo de espera do motor por eventos (para checar a parada)
+IDLE_FPS = 20 # Taxa do motor por polling depois de um tempo sem entrada (economia de bateria)
+IDLE_AFTER_SECONDS = 5.0 # Segundos sem entrada até cair para IDLE_FPS
+
+# Configurações de velocidade do mouse
+BASE_SPEED = 0.000002 # Reduzida drasticamente para testar uma sensibilidade muito baixa
+SPEED_LOW_MULTIPLIER = 0.5 # Multiplicador para velocidade 'Baixa'
+SPEED_MED_MULTIPLIER = 1.0 # Multiplicador para velocidade 'Média'
+SPEED_HIGH_MULTIPLIER = 2.0 # Multiplicador para velocidade 'Alta'
+SPEED_SCALE = 1000 # BASE_SPEED é dado em milésimos de pixel por unidade do eixo
+
+
+class EngineListener:
+    """Recebe avisos do motor. As implementações padrão não fazem nada.
+
+    Os métodos são chamados a partir do thread do controle e não devem bloquear: a
+    interface gráfica apenas publica em um UpdateChannel (ver pygopher.uichannel).
+    """
+
+    def on_disabled_changed(self, disabled):
+        pass
+
+    def on_speed_changed(self, multiplier):
+        pass
+
+    def on_hide_window(self):
+        pass
+
+    def on_devices_changed(self, devices):
+        pass
+
+    def on_profile_changed(self, name):
+        pass
+
+
+class GopherEngine:
+    """Converte o estado do controle em movimento do cursor e eventos de mouse/teclado."""
+
+    def __init__(self, output, cursor, listener=None):
+        self.output = output # OutputSink: injeção em lote, entregue uma vez por frame
+        self.cursor = cursor # VirtualCursor: posição sub-pixel do cursor
+        self.listener = listener or EngineListener()
+
+        self.running = False
+        self.disabled = False
+        self.input_mode = INPUT_MODE_POLLING # Motor de entrada (ver INPUT_MODE_*)
+
+        self.base_speed = BASE_SPEED
+        self.sensitivity_multiplier = 1.0 # Multiplicador de sensibilidade ajustável pelo usuário
+        self.current_speed = self.base_speed * self.sensitivity_multiplier
+        # Pixels por segundo por unidade de saída da curva (cada tick anda o tempo decorrido, ver tick_dt)
+        self.motion_gain = self.current_speed * SPEED_SCALE * REFERENCE_FPS
+        self.scroll_state = ScrollState() # Frações de entalhe ainda não emitidas (compartilhado pelos controles)
+        # Perfil ativo, perfis por controle e acorde (ver pygopher.profiles.ActiveProfile) em uma única
+        # referência, publicada por inteiro em set_profiles e activate_profile
+        profile = Profile(DEFAULT_PROFILE, BindingTable({}, {'left': None, 'right': None}),
+                          ResponseCurve(dead_zone=DEAD_ZONE), FilterSpec(), ScrollSpec())
+        self.active = ActiveProfile(ProfileSet((profile,)), profile)
+        self.frame_profile = self.active # self.active lido uma vez no início do frame: o frame inteiro usa só ele
+        self._publish_lock = threading.Lock() # Só entre quem publica (interface, vigia, troca automática, acorde)
+        # Toque/segurar, janelas de acorde, turbo e repetição; avançada a cada frame/tick do motor
+        self.timers = TimerWheel()
+        self.last_switch_us = 0.0 # Duração da última troca de perfil
+
+        self.metrics = FrameMetrics() # Histogramas de latência por estágio do loop
+        self.clock = time.perf_counter_ns # Relógio (ns) do poll_frame; o replay usa o da gravação
+        self.tracer = None # FrameTracer opcional com os spans de cada estágio (ver pygopher.trace)
+        self.telemetry = None # TelemetryRing opcional com uma amostra por frame (ver pygopher.telemetry)
+        self.scheduler = None # FrameScheduler do motor por polling (estatísticas por segundo)
+        self.stats = None # Despertares e tempo de CPU da última execução do motor
+        self.recorder = None # SessionRecorder opcional que grava cada frame lido
+        self.devices = None # DeviceManager da execução atual
+
+        # Controle cujo frame está sendo processado; sem DeviceManager (replay) é um estado avulso
+        self.device = ControllerState(cursor)
+
+    def set_sensitivity(self, multiplier):
+        """Define o multiplicador de sensibilidade e recalcula a velocidade atual."""
+        self.sensitivity_multiplier = multiplier
+        self.current_speed = self.base_speed * multiplier
+        self.motion_gain = self.current_speed * SPEED_SCALE * REFERENCE_FPS
+
+    def reset_state(self):
+        """Esquece o estado anterior de botões e gatilhos (início de uma execução)."""
+        self.device.reset()
+        if self.devices is not None:
+            for device in self.devices.devices:
+                device.reset()
+
+    @property
+    def profile(self):
+        """Perfil ativo (Profile)."""
+        return self.active.profile
+
+    @property
+    def profile_set(self):
+        """ProfileSet instalado."""
+        return self.active.profile_set
+
+    def set_profiles(self, profile_set, name=None):
+        """Instala um ProfileSet compilado e ativa `name` (ou mantém o perfil atual, se ainda existir)."""
+        with self._publish_lock:
+            if name not in profile_set.profiles:
+                current = self.active.profile.name
+                name = current if current in profile_set.profiles else DEFAULT_PROFILE
+            self._publish(profile_set, name)
+        retain_tables(profile_set.tables()) # Curvas de perfis editados ou removidos não ficam em memória
+        self.listener.on_profile_changed(name)
+
+    def activate_profile(self, name):
+        """Torna `name` o perfil ativo: só troca referências para objetos já compilados.
+
+        Pode ser chamado de outro thread (ex: troca automática pelo aplicativo em primeiro plano):
+        o perfil é publicado com uma única atribuição, e o loop só o lê no início de cada frame
+        (frame_profile), então um frame nunca mistura a curva de um perfil com os bindings de
+        outro. Teclas já pressionadas são soltas pela tabela com que foram pressionadas (ver
+        ControllerState.press_tables). Levanta KeyError se o perfil não existe.
+        """
+        with self._publish_lock:
+            self._publish(self.active.profile_set, name)
+        self.listener.on_profile_changed(name)
+
+    def _publish(self, profile_set, name):
+        """Publica o perfil `name` de `profile_set` (com _publish_lock): uma única atribuição de self.active."""
+        start = time.perf_counter()
+        self.active = ActiveProfile(profile_set, profile_set.profiles[name])
+        self.last_switch_us = (time.perf_counter() - start) * 1e6
+
+    def cycle_profile(self):
+        """Ativa o próximo perfil, na ordem do arquivo (acorde profile_chord)."""
+        active = self.active
+        self.activate_profile(active.profile_set.next_name(active.profile.name))
+
+    def bindings_for(self, device):
+        """Tabela de bindings de um controle: o perfil dele, se houver, ou a tabela padrão do frame."""
+        frame = self.frame_profile
+        profiles = frame.controller_bindings
+        if profiles:
+            for key in device.profile_keys:
+                table = profiles.get(key)
+                if table is not None:
+                    return table
+        return frame.bindings
+
+    def filter_axes(self, axes, t, device=None):
+        """Aplica aos eixos do analógico esquerdo (no lugar) os filtros do controle; t em segundos."""
+        if device is None:
+            device = self.device
+        frame = self.frame_profile
+        spec = frame.filters
+        profiles = frame.controller_filters
+        if profiles:
+            for key in device.profile_keys:
+                found = profiles.get(key)
+                if found is not None:
+                    spec = found
+                    break
+        if device.filter_spec is not spec:
+            # Configuração nova (ou primeiro frame): estado zerado, criado fora do caminho comum
+            device.filter_spec = spec
+            device.filters = spec.create()
+        filters = device.filters
+        if filters is not None:
+            filters.apply(axes, t)
+
+    def release_device(self, device):
+        """Solta tudo o que um controle mantinha pressionado (ex: ao ser desconectado)."""
+        self.device = device
+        self.apply_state(0)
+        device.reset()
+
+    def handle_device_event(self, event):
+        """Repassa um evento de hotplug ao DeviceManager, soltando as teclas de um controle removido."""
+        change = self.devices.handle_event(event)
+        if change is not None:
+            added, device = change
+            if not added:
+                self.release_device(device)
+            self.listener.on_devices_changed(self.devices.devices)
+
+    # --- Execução com um controle real ---
+
+    def run(self, devices):
+        """Loop principal que lê os controles e simula mouse/teclado. Bloqueia até running ficar False.
+
+        devices é um DeviceManager; controles conectados ou removidos durante a execução
+        são tratados pelo próprio loop. O motor por eventos depende da fila do Pygame: com
+        outras fontes de entrada (XInput, roteirizada), o motor por polling é usado.
+        """
+        mode = self.prepare(devices)
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+
+        try:
+            if mode == INPUT_MODE_EVENTS:
+                self._event_loop(devices.pygame, devices)
+            else:
+                self._polling_loop(devices)
+        finally:
+            self.stats['cpu_time'] = time.thread_time() - cpu_start
+            self.stats['wall_time'] = time.perf_counter() - wall_start
+
+    def prepare(self, devices):
+        """Prepara uma execução sobre `devices`: estatísticas e estado zerados. Retorna o motor efetivo."""
+        mode = self.input_mode
+        if devices.pygame is None or devices.input_source != SOURCE_PYGAME:
+            mode = INPUT_MODE_POLLING
+        self.stats = {'mode': mode, 'wakeups': 0, 'skipped': 0, 'cpu_time': 0.0, 'wall_time': 0.0}
+        self.devices = devices
+        self.reset_state()
+        return mode
+
+    def _polling_loop(self, devices):
+        """Motor por polling: lê a fonte de entrada de cada controle a cada frame.
+
+        Roda em FPS enquanto há entrada e cai para IDLE_FPS após IDLE_AFTER_SECONDS sem entrada.
+        """
+        scheduler = FrameScheduler(FPS, IDLE_FPS, IDLE_AFTER_SECONDS)
+        self.scheduler = scheduler
+        if devices.pygame is not None:
+            devices.restrict_events() # Os eixos são lidos do estado do joystick: só o hotplug passa pela fila
+        while self.running:
+            self.poll_frame(devices, scheduler)
+            # Controla a taxa de atualização do loop (prazos absolutos, sem acumular atrasos)
+            scheduler.wait()
+
+    def poll_frame(self, devices, scheduler):
+        """Uma iteração do motor por polling, sem a espera pelo próximo frame.
+
+        Um controle em repouso cujo número de pacote não mudou não é processado.
+        """
+        stats = self.stats
+        clock = self.clock
+        tracer = self.tracer
+        stats['wakeups'] += 1
+        t_start = clock()
+        if tracer is not None:
+            tracer.begin()
+        # Processa eventos internos do Pygame; só os de hotplug são consumidos aqui
+        device_events = devices.device_events
+        if device_events:
+            for event in devices.pygame.event.get(device_events):
+                self.handle_device_event(event)
+        t_pump = clock()
+        if tracer is not None:
+            tracer.mark(SPAN_PUMP)
+
+        if self.disabled:
+            self.output.flush() # Teclas soltas por um controle removido enquanto desabilitado
+            return
+        self.frame_profile = self.active
+
+        # --- Leitura de todos os controles: eixos no buffer do controle, (pacote, máscara) ---
+        current = devices.devices
+        for device in current:
+            polled = device.source.poll(device.axes)
+            device.polled = polled
+            if polled is not None:
+                device.held_mask = polled[1]
+        t_read = clock()
+
+        recorder = self.recorder
+        if recorder is not None and current:
+            # O formato de sessão guarda um único controle: o primeiro conectado
+            recorder.record(t_read, current[0].axes, current[0].held_mask)
+        if tracer is not None:
+            tracer.mark(SPAN_READ)
+
+        moved = False
+        t_filter = t_read / 1e9
+        for device in current:
+            polled = device.polled
+            if polled is None:
+                continue # Controle sem resposta (ex: porta do XInput desconectada)
+            if polled[0] == device.packet and device.idle:
+                stats['skipped'] += 1 # Nada novo e nada em andamento: nada a fazer
+                continue
+            device.packet = polled[0]
+            # Os filtros trabalham na cópia: device.axes (e a sessão) guardam a entrada bruta
+            filtered = device.filtered
+            filtered[:] = device.axes
+            self.filter_axes(filtered, t_filter, device)
+            if tracer is not None:
+                tracer.mark(SPAN_FILTER, device.instance_id)
+            device_moved, active = self.process_frame(filtered, polled[1], device, t_filter)
+            device.idle = not active
+            moved = moved or device_moved
+            if active:
+                scheduler.mark_input()
+        if self.timers.pending:
+            self.timers.advance(t_filter)
+            if tracer is not None:
+                tracer.mark(SPAN_TIMERS)
+        t_compute = clock()
+
+        # Entrega de uma vez todas as ações de mouse/teclado geradas neste frame
+        flushed = self.output.flush()
+        t_end = clock()
+        self.metrics.record_frame(t_start, t_pump, t_read, t_compute, t_end, moved or flushed)
+        telemetry = self.telemetry
+        if telemetry is not None and current:
+            first = current[0] # Como na gravação de sessão, o visualizador mostra o primeiro controle
+            telemetry.record(t_start, first.axes, first.filtered, t_end - t_start, first.state_mask)
+        if tracer is not None:
+            tracer.mark(SPAN_INJECT)
+            tracer.end()
+
+    def _event_loop(self, pygame, devices):
+        """Motor orientado a eventos: bloqueia na fila de eventos do Pygame.
+
+        Só roda o tick de movimento em taxa fixa enquanto um analógico está fora da zona morta;
+        com os controles parados, o thread fica dormindo em pygame.event.wait.
+        """
+        stats = self.stats
+        metrics = self.metrics
+        clock = time.perf_counter_ns
+        by_instance = devices.by_instance
+        next_tick = None # Prazo do próximo tick de movimento (None = analógicos parados)
+
+        devices.restrict_events((pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYHATMOTION))
+        try:
+            while self.running:
+                if next_tick is None:
+                    timeout_ms = EVENT_IDLE_TIMEOUT_MS # Acorda de vez em quando só para checar self.running
+                else:
+                    timeout_ms = max(0, int((next_tick - time.perf_counter()) * 1000))
+                if self.timers.pending:
+                    # Timers pendentes são avançados com a mesma resolução do motor por polling
+                    timeout_ms = min(timeout_ms, int(SLEEP_AMOUNT * 1000))
+
+                event = pygame.event.wait(timeout_ms)
+                stats['wakeups'] += 1
+                t_start = clock()
+                tracer = self.tracer
+                if tracer is not None:
+                    tracer.begin()
+                self.frame_profile = self.active
+                events = [event] if event.type != pygame.NOEVENT else []
+                events.extend(pygame.event.get()) # Esvazia o que chegou junto
+                t_pump = clock()
+                if tracer is not None:
+                    tracer.mark(SPAN_PUMP)
+
+                moved = False
+                for event in events:
+                    if event.type == pygame.JOYDEVICEADDED or event.type == pygame.JOYDEVICEREMOVED:
+                        self.handle_device_event(event)
+                        continue
+                    device = by_instance.get(getattr(event, 'instance_id', None))
+                    if device is None:
+                        continue
+                    self.device = device
+                    if event.type == pygame.JOYAXISMOTION:
+                        if event.axis < AXIS_COUNT:
+                            device.axes[event.axis] = event.value
+                        if self.disabled:
+                            continue
+                        if event.axis == 4 or event.axis == 5:
+                            bit = TRIGGER_LEFT_BIT if event.axis == 4 else TRIGGER_RIGHT_BIT
+                            if event.value > _TRIGGER_AXIS_THRESHOLD:
+                                self.apply_state(device.state_mask | bit)
+                            else:
+                                self.apply_state(device.state_mask & ~bit)
+                    elif event.type == pygame.JOYBUTTONDOWN:
+                        if event.button >= MAX_BUTTONS:
+                            continue
+                        bit = 1 << event.button
+                        device.held_mask |= bit
+                        if not self.disabled:
+                            self.apply_state(device.state_mask | bit)
+                    elif event.type == pygame.JOYBUTTONUP:
+                        if event.button >= MAX_BUTTONS:
+                            continue
+                        bit = 1 << event.button
+                        device.held_mask &= ~bit
+                        # Só solta o que teve o pressionamento tratado (bit presente em state_mask)
+                        self.apply_state(device.state_mask & ~bit)
+                    # JOYHATMOTION apenas acorda o loop: o motor por polling também não lê o hat
+                if tracer is not None:
+                    tracer.mark(SPAN_BUTTONS)
+
+                recorder = self.recorder
+                if recorder is not None and events and devices.devices:
+                    first = devices.devices[0] # O formato de sessão guarda um único controle
+                    recorder.record(t_pump, first.axes, first.held_mask)
+
+                # Com filtros, a saída filtrada pode continuar ativa um pouco depois da entrada parar
+                active_devices = () if self.disabled else [
+                    d for d in devices.devices
+                    if self.sticks_active(d.axes) or (d.filters is not None and self.sticks_active(d.filtered))]
+                if not active_devices:
+                    if next_tick is not None:
+                        next_tick = None
+                        for device in devices.devices:
+                            device.last_tick = None # O próximo tick recomeça do intervalo nominal
+                else:
+                    now = time.perf_counter()
+                    if next_tick is None:
+                        next_tick = now # Primeiro tick imediato ao sair da zona morta
+                    if now >= next_tick:
+                        for device in devices.devices:
+                            if device not in active_devices:
+                                device.last_tick = None
+                                continue
+                            self.device = device
+                            filtered = device.filtered
+                            filtered[:] = device.axes
+                            self.filter_axes(filtered, now, device)
+                            if tracer is not None:
+                                tracer.mark(SPAN_FILTER, device.instance_id)
+                            dt = self.tick_dt(device, now)
+                            if self.apply_motion(filtered[0], filtered[1], dt):
+                                moved = True
+                            elif tracer is not None:
+                                tracer.mark(SPAN_MOTION, device.instance_id)
+                            self.apply_scroll(filtered[2], filtered[3], dt)
+                            if tracer is not None:
+                                tracer.mark(SPAN_SCROLL, device.instance_id)
+                        next_tick += SLEEP_AMOUNT
+                        if next_tick < now:
+                            next_tick = now + SLEEP_AMOUNT # Não tenta recuperar ticks perdidos
+                if self.timers.pending and not self.disabled:
+                    self.timers.advance()
+                    if tracer is not None:
+                        tracer.mark(SPAN_TIMERS)
+                t_compute = clock()
+
+                flushed = self.output.flush()
+                t_end = clock()
+                # Os eventos chegam já lidos: a leitura faz parte do estágio de pump
+                metrics.record_frame(t_start, t_pump, t_pump, t_compute, t_end, moved or flushed)
+                telemetry = self.telemetry
+                if telemetry is not None and devices.devices:
+                    first = devices.devices[0]
+                    telemetry.record(t_start, first.axes, first.filtered, t_end - t_start, first.state_mask)
+                if tracer is not None:
+                    tracer.mark(SPAN_INJECT)
+                    tracer.end()
+        finally:
+            devices.restrict_events() # Parado, só o hotplug é consumido (DeviceManager.poll)
+
+    # --- Processamento de um frame (sem dependência de dispositivo) ---
+
+    def process_frame(self, axes, mask, device=None, now=None):
+        """Processa um frame lido do controle: movimento, rolagem, botões e gatilhos.
+
+        axes são os AXIS_COUNT eixos no intervalo -1..1 e mask a máscara de bits dos botões
+        pressionados (bit i = botão i). As bordas saem de um XOR com o estado anterior, então um
+        frame sem mudanças custa uma comparação, qualquer que seja o número de botões.
+        device é o ControllerState do controle lido (None = o controle atual, self.device).
+        now é o instante da leitura em segundos: movimento e rolagem andam o tempo decorrido
+        desde o frame anterior do controle (None = um frame nominal, a REFERENCE_FPS).
+        Os eventos gerados ficam pendentes no sink até o próximo flush().
+        Retorna (moved, active): se o cursor se moveu e se houve qualquer entrada.
+        """
+        if device is not None:
+            self.device = device
+        else:
+            self.frame_profile = self.active # Frame avulso (sem poll_frame): começa aqui
+        tracer = self.tracer # Com o perfil desligado, um único `if` por estágio
+        dt = NOMINAL_TICK_SECONDS if now is None else self.tick_dt(self.device, now)
+
+        # --- Movimento do Mouse (Analógico Esquerdo) ---
+        moved = self.apply_motion(axes[0], axes[1], dt)
+        active = moved
+        if tracer is not None and not moved:
+            tracer.mark(SPAN_MOTION, self.device.instance_id) # Com movimento, apply_motion fecha os spans
+
+        # --- Rolagem do Mouse (Analógico Direito) ---
+        if self.apply_scroll(axes[2], axes[3], dt):
+            active = True
+        elif not moved:
+            self.device.last_tick = None # Analógicos parados: o próximo movimento começa de um tick nominal
+        if tracer is not None:
+            tracer.mark(SPAN_SCROLL, self.device.instance_id)
+
+        # --- Botões e Gatilhos: uma máscara, bordas por XOR ---
+        # Gatilhos vão de -1 (solto) a 1 (pressionado): (v + 1) / 2 > TRIGGER_THRESHOLD
+        state = mask & BUTTONS_MASK
+        if axes[4] > _TRIGGER_AXIS_THRESHOLD:
+            state |= TRIGGER_LEFT_BIT
+        if axes[5] > _TRIGGER_AXIS_THRESHOLD:
+            state |= TRIGGER_RIGHT_BIT
+        if state != self.device.state_mask:
+            self.apply_state(state)
+        if tracer is not None:
+            tracer.mark(SPAN_BUTTONS, self.device.instance_id)
+
+        return moved, active or state != 0
+
+    def sticks_active(self, axes):
+        """Indica se algum analógico está fora da sua zona morta (axes no intervalo -1..1)."""
+        profile = self.frame_profile
+        if profile.curve.active(int(axes[0] * 32767), int(axes[1] * 32767)):
+            return True
+        scroll = profile.scroll
+        return scroll.curve.active(int(axes[2] * 32767) if scroll.horizontal else 0, int(axes[3] * 32767))
+
+    def tick_dt(self, device, now):
+        """Segundos desde o tick anterior de `device` (limitados a MAX_TICK_SECONDS), e marca este tick.
+
+        Sem tick anterior (primeiro frame fora da zona morta), retorna o intervalo nominal.
+        """
+        last = device.last_tick
+        device.last_tick = now
+        if last is None:
+            return NOMINAL_TICK_SECONDS
+        dt = now - last
+        if dt > MAX_TICK_SECONDS:
+            return MAX_TICK_SECONDS
+        return dt if dt > 0.0 else 0.0
+
+    def apply_motion(self, raw_x, raw_y, dt=NOMINAL_TICK_SECONDS):
+        """Move o cursor por `dt` segundos a partir dos eixos do analógico esquerdo (valores -1..1).
+
+        Retorna True se o analógico estava fora da zona morta.
+        """
+        axis_x = int(raw_x * 32767) # Eixo X do analógico esquerdo (horizontal), quantizado
+        axis_y = int(raw_y * 32767) # Eixo Y do analógico esquerdo (vertical)
+
+        # Uma consulta à tabela da curva de resposta (mesmo cálculo de ResponseCurve.deltas, embutido)
+        curve = self.frame_profile.curve
+        table = curve.table
+        if curve.radial:
+            scale = table[(axis_x * axis_x + axis_y * axis_y) >> RADIAL_SHIFT]
+            if not scale:
+                return False # Dentro da zona morta
+            scale *= self.motion_gain * dt
+            dx = axis_x * scale
+            dy = axis_y * scale
+        else:
+            dx = table[axis_x + AXIAL_OFFSET]
+            dy = table[axis_y + AXIAL_OFFSET]
+            if not dx and not dy:
+                return False
+            gain = self.motion_gain * dt
+            dx *= gain
+            dy *= gain
+
+        # O cursor virtual acumula o sub-pixel e só chama o sistema quando o pixel muda
+        tracer = self.tracer
+        if tracer is None:
+            self.device.cursor.move(dx, dy)
+        else:
+            device = self.device
+            tracer.mark(SPAN_MOTION, device.instance_id)
+            device.cursor.move(dx, dy)
+            tracer.mark(SPAN_CURSOR, device.instance_id)
+        return True
+
+    def apply_scroll(self, raw_x, raw_y, dt=NOMINAL_TICK_SECONDS):
+        """Rola a tela por `dt` segundos a partir dos eixos X/Y do analógico direito (valores -1..1).
+
+        A quantidade é acumulada e emitida em lotes limitados por taxa (ver pygopher.scroll).
+        Retorna True se o analógico estava fora da zona morta.
+        """
+        return self.scroll_state.update(self.frame_profile.scroll, raw_x, raw_y, self.output, dt)
+
+    def apply_state(self, state):
+        """Leva o controle atual à máscara `state` (botões + TRIGGER_*_BIT), tratando só os bits que mudaram."""
+        device = self.device
+        previous = device.state_mask
+        changed = previous ^ state
+        if not changed:
+            return
+        device.state_mask = state
+        chord = self.frame_profile.chord_mask
+        if chord and state & chord == chord and previous & chord != chord:
+            self.cycle_profile() # Acorde completo: as ações dos botões continuam valendo
+        while changed:
+            bit = changed & -changed # Bit menos significativo que mudou
+            changed ^= bit
+            if bit & BUTTONS_MASK:
+                if state & bit:
+                    self.handle_button_press(bit.bit_length() - 1)
+                else:
+                    self.handle_button_release(bit.bit_length() - 1)
+            else:
+                self.handle_trigger('left' if bit == TRIGGER_LEFT_BIT else 'right', bool(state & bit))
+
+    def handle_button_press(self, button_idx):
+        """Lida com o evento de botão pressionado."""
+        device = self.device
+        table = self.bindings_for(device)
+        device.press_tables[button_idx] = table
+        timed = table.timed
+        bit = 1 << button_idx
+        if timed.chord_buttons & bit:
+            if self._press_chord(device, timed, bit):
+                return
+            # Espera os outros botões do acorde antes de executar a ação própria do botão
+            device.deferred_mask |= bit
+            device.timers[button_idx] = self.timers.schedule(
+                timed.chord_window, self._chord_window_expired, device, button_idx)
+            return
+        self._press_button(device, button_idx, table)
+
+    def handle_button_release(self, button_idx):
+        """Lida com o evento de botão liberado."""
+        device = self.device
+        table = device.press_tables.pop(button_idx, None) or self.bindings_for(device)
+        bit = 1 << button_idx
+        timer = device.timers.pop(button_idx, None)
+        if timer is not None:
+            timer.cancel()
+        if device.chorded_mask & bit:
+            # O primeiro botão do acorde a ser solto solta a tecla do acorde
+            device.chorded_mask &= ~bit
+            for mask in [mask for mask in device.chord_actions if mask & bit]:
+                self.output.key_up(device.chord_actions.pop(mask).value)
+            return
+        if device.deferred_mask & bit:
+            # Solto dentro da janela sem completar o acorde: a ação própria vira um toque
+            device.deferred_mask &= ~bit
+            self._press_button(device, button_idx, table)
+            timer = device.timers.pop(button_idx, None)
+            if timer is not None:
+                timer.cancel()
+        self._release_button(device, button_idx, table, timer)
+
+    def _press_button(self, device, button_idx, table):
+        """Pressionamento efetivo de um botão: toque/segurar, turbo, repetição ou as ações comuns."""
+        timed = table.timed
+        pair = timed.tap_hold.get(button_idx)
+        if pair is not None:
+            # Toque ou segurar: decidido pela soltura antes de hold_delay ou pelo timer
+            device.timers[button_idx] = self.timers.schedule(
+                timed.hold_delay, self._hold_expired, device, button_idx, pair[1])
+            return
+        actions = table.buttons.get(button_idx, ())
+        self._press_actions(actions)
+        if timed.turbo >> button_idx & 1:
+            clicks = tuple(action for action in actions if action.kind in (ACTION_MOUSE, ACTION_KEY))
+            if clicks:
+                device.turbo_released &= ~(1 << button_idx)
+                device.timers[button_idx] = self.timers.schedule(
+                    timed.turbo_interval, self._turbo_toggle, device, button_idx, clicks,
+                    interval=timed.turbo_interval)
+        elif timed.repeat_delay:
+            keys = tuple(action.value for action in actions if action.kind == ACTION_KEY)
+            if keys:
+                device.timers[button_idx] = self.timers.schedule(
+                    timed.repeat_delay, self._repeat_keys, keys, interval=timed.repeat_interval)
+
+    def _release_button(self, device, button_idx, table, timer):
+        """Soltura efetiva de um botão; timer é o timer que estava pendente (None = nenhum)."""
+        pair = table.timed.tap_hold.get(button_idx)
+        if pair is not None:
+            tap, hold = pair
+            if timer is not None:
+                if tap is not None: # Solto antes de hold_delay: toque
+                    self.output.key_down(tap.value)
+                    self.output.key_up(tap.value)
+            elif hold is not None:
+                self.output.key_up(hold.value)
+            return
+        bit = 1 << button_idx
+        if device.turbo_released & bit:
+            device.turbo_released &= ~bit # O turbo já tinha soltado as ações
+            return
+        self._release_actions(table.buttons.get(button_idx, ()))
+
+    def _press_chord(self, device, timed, bit):
+        """Pressiona o acorde completado por `bit`, se houver; os outros botões dele precisam estar na janela."""
+        waiting = device.deferred_mask | bit
+        for mask, action in timed.chords:
+            if mask & bit and waiting & mask == mask:
+                others = mask & ~bit
+                while others:
+                    other = others & -others
+                    others ^= other
+                    timer = device.timers.pop(other.bit_length() - 1, None)
+                    if timer is not None:
+                        timer.cancel()
+                device.deferred_mask &= ~mask
+                device.chorded_mask |= mask
+                device.chord_actions[mask] = action
+                self.output.key_down(action.value)
+                return True
+        return False
+
+    # Callbacks da roda de timers (chamados por self.timers.advance, no thread do controle)
+
+    def _chord_window_expired(self, device, button_idx):
+        device.timers.pop(button_idx, None)
+        device.deferred_mask &= ~(1 << button_idx)
+        self.device = device
+        self._press_button(device, button_idx, device.press_tables[button_idx])
+
+    def _hold_expired(self, device, button_idx, action):
+        device.timers.pop(button_idx, None)
+        if action is not None:
+            self.output.key_down(action.value)
+
+    def _turbo_toggle(self, device, button_idx, actions):
+        bit = 1 << button_idx
+        device.turbo_released ^= bit
+        if device.turbo_released & bit:
+            self._release_actions(actions)
+        else:
+            self._press_actions(actions)
+
+    def _repeat_keys(self, keys):
+        for key in keys:
+            self.output.key_down(key) # Como o autorepeat do teclado: key_down repetido, sem key_up
+
+    def _press_actions(self, actions):
+        for action in actions:
+            kind = action.kind
+            if kind == ACTION_MOUSE:
+                self.output.mouse_down(action.value)
+            elif kind == ACTION_KEY:
+                self.output.key_down(action.value)
+            # Mapeamento para funções do Gopher
+            elif kind == ACTION_HIDE_WINDOW:
+                self.listener.on_hide_window()
+            elif kind == ACTION_TOGGLE_DISABLE:
+                self.disabled = not self.disabled
+                self.listener.on_disabled_changed(self.disabled)
+            elif kind == ACTION_SPEED_CHANGE:
+                if self.sensitivity_multiplier <= SPEED_LOW_MULTIPLIER:
+                    self.set_sensitivity(SPEED_MED_MULTIPLIER)
+                elif self.sensitivity_multiplier <= SPEED_MED_MULTIPLIER:
+                    self.set_sensitivity(SPEED_HIGH_MULTIPLIER)
+                else:
+                    self.set_sensitivity(SPEED_LOW_MULTIPLIER)
+                self.listener.on_speed_changed(self.sensitivity_multiplier)
+
+    def _release_actions(self, actions):
+        for action in actions:
+            if action.kind == ACTION_MOUSE:
+                self.output.mouse_up(action.value)
+            elif action.kind == ACTION_KEY:
+                self.output.key_up(action.value)
+
+    def handle_trigger(self, trigger_side, pressed):
+        """Lida com o evento de gatilho (esquerdo/direito) pressionado/liberado."""
+        press_triggers = self.device.press_triggers
+        if pressed:
+            action = press_triggers[trigger_side] = self.bindings_for(self.device).triggers[trigger_side]
+        else:
+            action = press_triggers[trigger_side]
+            press_triggers[trigger_side] = None
+        if action is not None: # Gatilho sem tecla válida mapeada
+            if pressed:
+                self.output.key_down(action.value)
+            else:
+                self.output.key_up(action.value)
+
+
+def buttons_to_mask(buttons):
+    """Empacota uma sequência de estados de botões em uma máscara de bits."""
+    mask = 0
+    for button_idx, state in enumerate(buttons):
+        if state:
+            mask |= 1 << button_idx
+    return mask
+
+
+def mask_to_buttons(mask, count):
+    """Desempacota uma máscara de bits em uma lista de estados de botões."""
+    return [(mask >> button_idx) & 1 for button_idx in range(count)]
+
@@ -0,0 +1,207 @@
+"""Filtros de suavização do analógico esquerdo, entre a leitura dos eixos e o movimento.
+
+Cada estágio trabalha no lugar sobre a lista de eixos do frame (eixos 0 e 1) e guarda
+o seu estado em um ``array`` alocado na criação, então aplicar o pipeline não cria
+listas nem dicionários por frame. Um FilterSpec é a configuração compilada (sem
+estado); cada controle recebe o próprio FilterPipeline criado a partir dela.
+
+Estágios disponíveis:
+    ema       média móvel exponencial com constante de tempo fixa
+    one_euro  filtro One Euro (Casiez et al.): suaviza parado, acompanha rápido em movimento
+    jitter    zona de histerese: ignora variações menores que o limiar
+"""
+import math
+from array import array
+
+STAGE_EMA = 'ema'
+STAGE_ONE_EURO = 'one_euro'
+STAGE_JITTER = 'jitter'
+STAGES = (STAGE_EMA, STAGE_ONE_EURO, STAGE_JITTER)
+
+# Chaves do gopher_config.ini e valores padrão (sem filtros: comportamento original)
+DEFAULT_FILTERS = {
+    'stick_filters': '',                  # Estágios em ordem, ex: "jitter, one_euro"
+    'filter_ema_time_ms': '20',           # Constante de tempo da média exponencial
+    'filter_one_euro_min_cutoff': '1.0',  # Corte mínimo (Hz): menor = mais suave parado
+    'filter_one_euro_beta': '0.5',        # Quanto o corte sobe com a velocidade: maior = menos atraso
+    'filter_one_euro_d_cutoff': '1.0',    # Corte (Hz) da estimativa de velocidade
+    'filter_jitter_threshold': '0.01',    # Variação mínima (fração do curso) para a saída mudar
+}
+
+MAX_JITTER_THRESHOLD = 0.1 # Abaixo da zona morta padrão (4000 / 32767 ≈ 0.12)
+
+_TWO_PI = 2 * math.pi
+
+
+class EMAStage:
+    """Média móvel exponencial; alpha calculado a partir do intervalo real entre frames."""
+
+    __slots__ = ('time_constant', 'state')
+
+    def __init__(self, time_ms):
+        self.time_constant = time_ms / 1000
+        self.state = array('d', [0.0, 0.0, 0.0, 0.0]) # x, y, t anterior, inicializado
+
+    def reset(self):
+        self.state[3] = 0.0
+
+    def apply(self, axes, t):
+        state = self.state
+        if not state[3]:
+            state[0], state[1], state[2], state[3] = axes[0], axes[1], t, 1.0
+            return
+        dt = t - state[2]
+        state[2] = t
+        alpha = 1.0 - math.exp(-dt / self.time_constant) if dt > 0 else 0.0
+        state[0] += alpha * (axes[0] - state[0])
+        state[1] += alpha * (axes[1] - state[1])
+        axes[0] = state[0]
+        axes[1] = state[1]
+
+
+class OneEuroStage:
+    """Filtro One Euro: passa-baixa cujo corte acompanha a velocidade do analógico."""
+
+    __slots__ = ('min_cutoff', 'beta', 'd_cutoff', 'state')
+
+    def __init__(self, min_cutoff, beta, d_cutoff):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        # x, y, dx, dy filtrados, t anterior, inicializado
+        self.state = array('d', [0.0] * 6)
+
+    def reset(self):
+        self.state[5] = 0.0
+
+    def apply(self, axes, t):
+        state = self.state
+        if not state[5]:
+            state[0], state[1], state[2], state[3], state[4], state[5] = axes[0], axes[1], 0.0, 0.0, t, 1.0
+            return
+        dt = t - state[4]
+        if dt <= 0:
+            axes[0] = state[0]
+            axes[1] = state[1]
+            return
+        state[4] = t
+        # alpha = 1 / (1 + tau / dt), com tau = 1 / (2π · corte)
+        alpha_d = 1.0 / (1.0 + 1.0 / (_TWO_PI * self.d_cutoff * dt))
+        for i in (0, 1):
+            value = axes[i]
+            previous = state[i]
+            velocity = state[2 + i] + alpha_d * ((value - previous) / dt - state[2 + i])
+            state[2 + i] = velocity
+            cutoff = self.min_cutoff + self.beta * abs(velocity)
+            alpha = 1.0 / (1.0 + 1.0 / (_TWO_PI * cutoff * dt))
+            state[i] = previous + alpha * (value - previous)
+            axes[i] = state[i]
+
+
+class JitterStage:
+    """Histerese radial: a saída só se move quando a entrada se afasta mais que o limiar."""
+
+    __slots__ = ('threshold', 'state')
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.state = array('d', [0.0, 0.0, 0.0]) # x, y mantidos, inicializado
+
+    def reset(self):
+        self.state[2] = 0.0
+
+    def apply(self, axes, t):
+        state = self.state
+        if not state[2]:
+            state[0], state[1], state[2] = axes[0], axes[1], 1.0
+            return
+        dx = axes[0] - state[0]
+        dy = axes[1] - state[1]
+        distance = math.hypot(dx, dy)
+        if distance > self.threshold:
+            # Acompanha a entrada mantendo-se a `threshold` de distância (sem degraus)
+            scale = (distance - self.threshold) / distance
+            state[0] += dx * scale
+            state[1] += dy * scale
+        axes[0] = state[0]
+        axes[1] = state[1]
+
+
+class FilterPipeline:
+    """Sequência de estágios com estado, de um controle."""
+
+    __slots__ = ('stages',)
+
+    def __init__(self, stages):
+        self.stages = tuple(stages)
+
+    def apply(self, axes, t):
+        """Filtra axes[0] e axes[1] no lugar; t é o instante da leitura em segundos."""
+        for stage in self.stages:
+            stage.apply(axes, t)
+
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+
+class FilterSpec:
+    """Configuração compilada do pipeline (sem estado): cria um FilterPipeline por controle."""
+
+    __slots__ = ('stages', 'params', 'errors')
+
+    def __init__(self, stages=(), params=None, errors=()):
+        self.stages = tuple(stages)
+        self.params = params or {}
+        self.errors = tuple(errors)
+
+    def create(self):
+        """Novo pipeline com estado zerado, ou None se não há estágios."""
+        if not self.stages:
+            return None
+        params = self.params
+        built = []
+        for name in self.stages:
+            if name == STAGE_EMA:
+                built.append(EMAStage(params['filter_ema_time_ms']))
+            elif name == STAGE_ONE_EURO:
+                built.append(OneEuroStage(params['filter_one_euro_min_cutoff'], params['filter_one_euro_beta'],
+                                          params['filter_one_euro_d_cutoff']))
+            elif name == STAGE_JITTER:
+                built.append(JitterStage(params['filter_jitter_threshold']))
+        return FilterPipeline(built)
+
+
+def compile_filters(section):
+    """Compila as chaves stick_filters/filter_* de uma seção do configparser em um FilterSpec.
+
+    Valores inválidos são trocados pelo padrão e descritos em FilterSpec.errors.
+    """
+    errors = []
+    stages = []
+    text = section.get('stick_filters', DEFAULT_FILTERS['stick_filters'])
+    for name in (item.strip().lower() for item in text.split(',')):
+        if not name:
+            continue
+        if name in STAGES:
+            stages.append(name)
+        else:
+            errors.append(f"Filtro desconhecido em 'stick_filters': '{name}'")
+
+    params = {}
+    for option, default in DEFAULT_FILTERS.items():
+        if option == 'stick_filters':
+            continue
+        value = section.get(option, default)
+        try:
+            params[option] = float(value)
+            if params[option] < 0 or (option != 'filter_one_euro_beta' and params[option] == 0):
+                raise ValueError(value)
+            # O valor mantido fica a `threshold` do centro: precisa estar dentro da zona morta
+            if option == 'filter_jitter_threshold' and params[option] >= MAX_JITTER_THRESHOLD:
+                raise ValueError(value)
+        except ValueError:
+            errors.append(f"Valor inválido em '{option}': '{value}'")
+            params[option] = float(default)
+    return FilterSpec(stages, params, errors)
+
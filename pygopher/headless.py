@@ -0,0 +1,184 @@
+"""Modo sem interface gráfica: roda só o motor de entrada, sem importar o Tkinter.
+
+O estado vai para o log (arquivo ou stderr) e as estatísticas do loop são
+registradas periodicamente. Com um arquivo de trace, o perfil de frames fica ligado e
+é gravado ao receber SIGUSR1 (SIGBREAK/Ctrl+Break no Windows) e ao encerrar. Com
+config_hot_reload = true, alterações no .ini valem sem reiniciar (ver pygopher.reload).
+"""
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+from pygopher.config import read_config, default_config, apply_config
+from pygopher.devices import DeviceManager, format_hotplug
+from pygopher.engine import GopherEngine, EngineListener, INPUT_MODE_POLLING
+from pygopher.metrics import STAGE_FRAME, STAGE_INPUT_TO_INJECT
+from pygopher.motion import VirtualCursor, Win32CursorBackend
+from pygopher.output import create_default_sink
+from pygopher.profiles import AutoSwitcher, create_foreground_detector, load_profile_set
+from pygopher.reload import ConfigWatcher
+from pygopher.startup import StartupReport
+from pygopher.sources import SOURCE_PYGAME
+from pygopher.trace import FrameTracer
+
+log = logging.getLogger('pygopher')
+
+
+class LoggingListener(EngineListener):
+    """Envia os avisos do motor para o log."""
+
+    def __init__(self):
+        self.hidden = False
+
+    def on_disabled_changed(self, disabled):
+        log.info("Gopher %s.", 'desabilitado' if disabled else 'habilitado')
+
+    def on_speed_changed(self, multiplier):
+        # Sem interface não há "salvar": a nova velocidade vale até o processo terminar
+        log.info("Sensibilidade alterada para %.2fx.", multiplier)
+
+    def on_devices_changed(self, devices):
+        log.info("Controles conectados: %s.", format_devices(devices))
+
+    def on_profile_changed(self, name):
+        log.info("Perfil ativo: %s.", name)
+
+    def on_hide_window(self):
+        """Alterna a visibilidade da janela do console (Windows)."""
+        if sys.platform != 'win32':
+            return
+        from ctypes import windll
+        console_window = windll.kernel32.GetConsoleWindow()
+        if console_window:
+            self.hidden = not self.hidden
+            windll.user32.ShowWindow(console_window, 0 if self.hidden else 1) # SW_HIDE / SW_SHOWNORMAL
+
+
+def format_stats(engine):
+    """Resumo de uma linha das estatísticas do loop e das latências."""
+    parts = []
+    if engine.input_mode == INPUT_MODE_POLLING and engine.scheduler:
+        stats = engine.scheduler.stats
+        parts.append(f"{stats['rate']:.0f} Hz{' (ocioso)' if stats['idle'] else ''}, "
+                     f"prazos perdidos {stats['missed']}, frames sem dados novos {engine.stats['skipped']}")
+    for label, stage in (('frame', STAGE_FRAME), ('entrada→injeção', STAGE_INPUT_TO_INJECT)):
+        p50, p99, max_value = engine.metrics.summary(stage)
+        if max_value:
+            parts.append(f"{label} p50 {p50 / 1000:.0f} µs p99 {p99 / 1000:.0f} µs máx {max_value / 1000:.0f} µs")
+    if engine.devices is not None and engine.devices.stats['added']:
+        parts.append(format_hotplug(engine.devices.stats))
+    return ' | '.join(parts) or "sem amostras"
+
+
+def format_devices(devices):
+    """Lista os controles conectados, ex: 'Xbox 360 Controller (#0), ...'."""
+    return ', '.join(f"{device.name} (#{device.instance_id})" for device in devices) or "nenhum"
+
+
+def dump_trace(tracer, path):
+    """Grava o perfil de frames em `path`, registrando o resultado no log."""
+    try:
+        count = tracer.dump(path)
+    except OSError as e:
+        log.error("Falha ao gravar o perfil de frames em %s: %s", path, e)
+        return
+    log.info("Perfil de frames gravado em %s (%d spans).", path, count)
+
+
+def run_headless(config_path, stats_interval=10.0, trace_path=None):
+    """Carrega a configuração, abre os controles conectados e roda o motor até SIGINT/SIGTERM.
+
+    trace_path liga o perfil de frames (ver pygopher.trace) e é o arquivo para onde ele é gravado.
+    """
+    startup = StartupReport()
+    profile_set = None
+    watch = True # Recarga a quente só de um .ini que existe
+    try:
+        config = read_config(config_path)
+        profile_set = load_profile_set(config_path, config) # Tabelas das curvas do cache em disco
+    except ValueError as e:
+        log.warning("%s; usando os mapeamentos padrão.", e)
+        config = default_config()
+        watch = False
+
+    engine = GopherEngine(create_default_sink(), VirtualCursor(Win32CursorBackend()), listener=LoggingListener())
+    profile_set = apply_config(engine, config, profile_set)
+    for error in profile_set.errors:
+        log.error(error)
+    startup.mark("perfis")
+    if len(profile_set.order) > 1:
+        log.info("Perfis: %s.", ', '.join(profile_set.order))
+    detector = create_foreground_detector()
+    switcher = None
+    if detector is not None and profile_set.app_map:
+        switcher = AutoSwitcher(engine, detector)
+        switcher.start()
+
+    watcher = None
+    if watch and config.getboolean('DEFAULT', 'config_hot_reload', fallback=True):
+        def reload_config(new_config, new_profile_set):
+            # No thread do vigia: a configuração já está compilada, aqui só há trocas de referência
+            apply_config(engine, new_config, new_profile_set)
+            log.info("Configuração recarregada de %s (perfis: %s).", config_path, ', '.join(new_profile_set.order))
+
+        watcher = ConfigWatcher(config_path, reload_config,
+                                lambda message: log.error("%s; a configuração em uso continua valendo.", message),
+                                defaults=dict(default_config()['DEFAULT']))
+        watcher.start()
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        log.info("Sinal %s recebido, encerrando.", signum)
+        stop.set()
+        engine.running = False
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    if trace_path:
+        engine.tracer = FrameTracer()
+        dump_signal = getattr(signal, 'SIGUSR1', None) or getattr(signal, 'SIGBREAK', None)
+        if dump_signal is not None:
+            signal.signal(dump_signal, lambda signum, frame: dump_trace(engine.tracer, trace_path))
+            log.info("Perfil de frames ligado; envie o sinal %s para gravar em %s.", dump_signal.name, trace_path)
+
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    import pygame
+    # Só o necessário: vídeo (exigido pela fila de eventos) e joystick; sem áudio, fontes etc.
+    pygame.display.init()
+    pygame.joystick.init()
+    startup.mark("pygame")
+
+    devices = DeviceManager(pygame, engine.cursor.backend, config['DEFAULT'].get('input_source', SOURCE_PYGAME))
+    if devices.source_error:
+        log.warning("XInput indisponível (%s); usando o Pygame.", devices.source_error)
+    try:
+        devices.scan()
+        startup.mark("controle")
+        log.info("Partida: %s", startup.format())
+        # Controles conectados depois (ou reconectados) são abertos pelo próprio loop do motor
+        log.info("Controles conectados: %s (motor %s).", format_devices(devices.devices), engine.input_mode)
+
+        engine.running = True
+        thread = threading.Thread(target=engine.run, args=(devices,), daemon=True)
+        thread.start()
+        while thread.is_alive() and not stop.is_set():
+            stop.wait(stats_interval)
+            log.info("Loop: %s", format_stats(engine))
+        engine.running = False
+        thread.join(timeout=1)
+        log.info("Motor parado: %s", format_stats(engine))
+        if engine.tracer is not None:
+            dump_trace(engine.tracer, trace_path)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        if switcher is not None:
+            switcher.stop()
+        devices.close_all()
+        pygame.quit()
+    return 0
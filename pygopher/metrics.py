@@ -0,0 +1,147 @@
+"""Instrumentação de latência do loop do controle.
+
+Histogramas no estilo HDR (log-linear): cada potência de dois é dividida em
+SUB_BUCKETS faixas, o que mantém o erro relativo abaixo de ~3% com uma quantidade
+fixa de buckets. Os contadores ficam em um ``array`` pré-alocado, então registrar
+uma amostra é O(1) e não aloca nada.
+"""
+from array import array
+
+SUB_BITS = 5
+SUB_BUCKETS = 1 << SUB_BITS   # Faixas por potência de dois
+MAX_BITS = 40                 # ~18 minutos em nanossegundos; valores acima são saturados
+BUCKET_COUNT = (MAX_BITS - SUB_BITS + 1) * SUB_BUCKETS
+MAX_TRACKABLE = (1 << MAX_BITS) - 1
+_LINEAR_LIMIT = 2 * SUB_BUCKETS # Abaixo disso, um bucket por valor
+_SHIFT_BASE = SUB_BITS + 1
+
+# Estágios medidos em cada frame
+STAGE_PUMP = 'pump'                  # pygame.event.pump() / espera por eventos
+STAGE_READ = 'read'                  # Leitura dos eixos e botões
+STAGE_COMPUTE = 'compute'            # Movimento, rolagem e despacho dos botões
+STAGE_INJECT = 'inject'              # Entrega do lote de saída
+STAGE_FRAME = 'frame'                # Frame inteiro (sem contar o sono)
+STAGE_INPUT_TO_INJECT = 'input_to_inject' # Da leitura de uma mudança até o evento injetado
+STAGES = (STAGE_PUMP, STAGE_READ, STAGE_COMPUTE, STAGE_INJECT, STAGE_FRAME, STAGE_INPUT_TO_INJECT)
+
+
+def bucket_index(value):
+    """Índice do bucket de um valor (inteiro >= 0)."""
+    if value < _LINEAR_LIMIT:
+        return value
+    if value > MAX_TRACKABLE:
+        value = MAX_TRACKABLE
+    shift = value.bit_length() - _SHIFT_BASE
+    return (shift << SUB_BITS) + (value >> shift)
+
+
+def bucket_lower_bound(index):
+    """Menor valor que cai no bucket de índice dado."""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+
+
+class LatencyHistogram:
+    """Histograma log-linear de tamanho fixo para latências em nanossegundos."""
+
+    __slots__ = ('counts', 'max_value')
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKET_COUNT))
+        self.max_value = 0
+
+    def record(self, value):
+        """Registra uma amostra (ns)."""
+        # Mesmo cálculo de bucket_index, embutido para evitar uma chamada de função por amostra
+        if value >= _LINEAR_LIMIT:
+            if value > self.max_value:
+                self.max_value = value
+            if value > MAX_TRACKABLE:
+                value = MAX_TRACKABLE # Satura no último bucket; max_value guarda o valor real
+            shift = value.bit_length() - _SHIFT_BASE
+            self.counts[(shift << SUB_BITS) + (value >> shift)] += 1
+        elif value > 0:
+            if value > self.max_value:
+                self.max_value = value
+            self.counts[value] += 1
+        else:
+            self.counts[0] += 1
+
+    @property
+    def total(self):
+        """Quantidade de amostras registradas (calculada sob demanda, fora do caminho quente)."""
+        return sum(self.counts)
+
+    def percentile(self, pct):
+        """Valor aproximado (limite inferior do bucket) do percentil pct (0-100)."""
+        total = self.total
+        if not total:
+            return 0
+        target = max(1, int(total * pct / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(bucket_lower_bound(index), self.max_value)
+        return self.max_value
+
+    def reset(self):
+        """Zera o histograma sem realocar."""
+        counts = self.counts
+        for index in range(BUCKET_COUNT):
+            counts[index] = 0
+        self.max_value = 0
+
+
+class FrameMetrics:
+    """Conjunto de histogramas por estágio do loop do controle."""
+
+    def __init__(self):
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        # Acesso direto aos histogramas usados em todo frame (evita buscas no dicionário)
+        self._pump = self.histograms[STAGE_PUMP]
+        self._read = self.histograms[STAGE_READ]
+        self._compute = self.histograms[STAGE_COMPUTE]
+        self._inject = self.histograms[STAGE_INJECT]
+        self._frame = self.histograms[STAGE_FRAME]
+        self._input_to_inject = self.histograms[STAGE_INPUT_TO_INJECT]
+
+    def record_frame(self, t_start, t_pump, t_read, t_compute, t_inject, had_output):
+        """Registra os timestamps (perf_counter_ns) de um frame.
+
+        t_start é o início do frame; os demais marcam o fim de cada estágio.
+        had_output indica que o frame gerou eventos/movimento a partir da entrada lida.
+        """
+        self._pump.record(t_pump - t_start)
+        self._read.record(t_read - t_pump)
+        self._compute.record(t_compute - t_read)
+        self._inject.record(t_inject - t_compute)
+        self._frame.record(t_inject - t_start)
+        if had_output:
+            self._input_to_inject.record(t_inject - t_read)
+
+    def summary(self, stage):
+        """Retorna (p50, p99, max) em nanossegundos para um estágio."""
+        histogram = self.histograms[stage]
+        return histogram.percentile(50), histogram.percentile(99), histogram.max_value
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def export(self, path):
+        """Grava o resumo e os buckets não vazios de cada estágio em um arquivo CSV."""
+        with open(path, 'w') as f:
+            f.write("stage,samples,p50_ns,p99_ns,max_ns\n")
+            for stage in STAGES:
+                p50, p99, max_value = self.summary(stage)
+                f.write(f"{stage},{self.histograms[stage].total},{p50},{p99},{max_value}\n")
+            f.write("\nstage,bucket_lower_ns,count\n")
+            for stage in STAGES:
+                for index, count in enumerate(self.histograms[stage].counts):
+                    if count:
+                        f.write(f"{stage},{bucket_lower_bound(index)},{count}\n")
+
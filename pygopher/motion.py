@@ -0,0 +1,121 @@
+"""Modelo de cursor virtual para o movimento do mouse.
+
+O cursor virtual guarda localmente o resto fracionário (sub-pixel) do movimento e
+envia ao sistema só deslocamentos relativos inteiros, quando o resto completa um pixel.
+A posição real é lida apenas no primeiro movimento e a cada RESYNC_MOVES movimentos,
+para corrigir a estimativa local (ex: cursor parado na borda da tela ou movido por um
+mouse físico). Com o analógico parado não há nenhuma chamada ao sistema.
+
+O deslocamento de cada tick é velocidade (pixels por segundo) × tempo decorrido desde o
+tick anterior do controle, limitado a MAX_TICK_SECONDS: a distância percorrida não muda
+com a taxa do loop, com frames atrasados nem com o jitter do sono.
+"""
+import math
+from ctypes import Structure, c_long, byref
+
+# Movimento independente da taxa do loop: os ganhos são por segundo e cada tick anda o tempo medido desde o anterior
+REFERENCE_FPS = 150 # Taxa em que a sensibilidade foi calibrada: ganho por segundo = ganho por frame antigo × REFERENCE_FPS
+NOMINAL_TICK_SECONDS = 1.0 / REFERENCE_FPS # Tick sem tick anterior (ex: primeiro frame fora da zona morta)
+MAX_TICK_SECONDS = 0.1 # Intervalo máximo considerado entre dois ticks (ex: volta da suspensão); cobre 20 FPS com jitter
+RESYNC_MOVES = 150 # Movimentos entre duas leituras da posição real (~1 s de movimento a 150 FPS)
+
+MOUSEEVENTF_MOVE = 0x0001
+
+
+# Estrutura para obter a posição do cursor do mouse (Windows API)
+class POINT(Structure):
+    _fields_ = [("x", c_long), ("y", c_long)]
+
+
+class Win32CursorBackend:
+    """Lê o cursor real via GetCursorPos e o desloca via mouse_event (movimento relativo)."""
+
+    def __init__(self):
+        from ctypes import windll
+        self._user32 = windll.user32
+        self._point = POINT()
+
+    def get_position(self):
+        """Retorna a posição atual do cursor do mouse."""
+        self._user32.GetCursorPos(byref(self._point))
+        return self._point.x, self._point.y
+
+    def set_position(self, x, y):
+        """Define a posição do cursor do mouse."""
+        self._user32.SetCursorPos(x, y)
+
+    def move_by(self, dx, dy):
+        """Desloca o cursor dx, dy pixels a partir da posição atual."""
+        self._user32.mouse_event(MOUSEEVENTF_MOVE, dx, dy, 0, 0)
+
+
+class FakeCursorBackend:
+    """Cursor em memória para testes; conta as chamadas de leitura e escrita."""
+
+    def __init__(self, x=0, y=0):
+        self.x, self.y = x, y
+        self.reads = 0
+        self.writes = 0
+        self.trajectory = [] # Posições definidas, em ordem
+
+    def get_position(self):
+        self.reads += 1
+        return self.x, self.y
+
+    def set_position(self, x, y):
+        self.writes += 1
+        self.x, self.y = x, y
+        self.trajectory.append((x, y))
+
+    def move_by(self, dx, dy):
+        self.writes += 1
+        self.x += dx
+        self.y += dy
+        self.trajectory.append((self.x, self.y))
+
+    def nudge(self, x, y):
+        """Simula um movimento externo (mouse físico) do cursor."""
+        self.x, self.y = x, y
+
+
+class VirtualCursor:
+    """Cursor que acumula o sub-pixel localmente e emite só deslocamentos inteiros."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.x, self.y = 0.0, 0.0 # Posição estimada (sub-pixel): último pixel conhecido + resto
+        self._pixel = None # Pixel estimado do cursor real (None = não sincronizado)
+        self._frac_x, self._frac_y = 0.0, 0.0 # Resto ainda não emitido, sempre em [0, 1)
+        self._moves = 0 # Movimentos desde a última leitura da posição real
+        self.resyncs = 0
+
+    def move(self, dx, dy):
+        """Aplica um deslocamento relativo em pixels (pode ser fracionário)."""
+        if not dx and not dy:
+            return
+        pixel = self._pixel
+        if pixel is None or self._moves >= RESYNC_MOVES:
+            real = self.backend.get_position()
+            if pixel is not None and real != pixel:
+                self.resyncs += 1 # O cursor foi movido por fora ou parou na borda da tela
+            pixel = real
+            self._moves = 0
+        self._moves += 1
+
+        fx = self._frac_x + dx
+        fy = self._frac_y + dy
+        # floor (e não int) para que o resto acumule igual nos sentidos negativos
+        step_x = math.floor(fx)
+        step_y = math.floor(fy)
+        self._frac_x = fx - step_x
+        self._frac_y = fy - step_y
+        if step_x or step_y:
+            self.backend.move_by(step_x, step_y)
+            pixel = (pixel[0] + step_x, pixel[1] + step_y)
+        self._pixel = pixel
+        self.x = pixel[0] + self._frac_x
+        self.y = pixel[1] + self._frac_y
+
+    def invalidate(self):
+        """Força uma leitura da posição real no próximo movimento."""
+        self._pixel = None
@@ -0,0 +1,228 @@
+"""Camada de saída (injeção de mouse/teclado) em lote.
+
+Os handlers do loop do controle apenas enfileiram ações no sink durante o frame; no
+fim do frame ``flush()`` entrega todas de uma vez. No Windows isso vira uma única
+chamada a ``SendInput``; em outras plataformas há um sink via pyautogui (sem a pausa
+padrão entre chamadas) e um sink de gravação para testes.
+"""
+import ctypes
+import sys
+import time
+
+from pygopher.bindings import KEY_MAP
+from pygopher.scroll import WHEEL_DELTA
+
+# Tipos de evento de saída
+EV_MOUSE_DOWN = 'mouse_down'
+EV_MOUSE_UP = 'mouse_up'
+EV_KEY_DOWN = 'key_down'
+EV_KEY_UP = 'key_up'
+EV_SCROLL = 'scroll' # Argumento em unidades de roda do Windows (WHEEL_DELTA = 120 por entalhe)
+EV_HSCROLL = 'hscroll'
+
+# Nome da tecla do pyautogui -> código de tecla virtual do Windows
+NAME_TO_VK = {name: code for code, name in KEY_MAP.items()}
+
+
+class OutputSink:
+    """Base dos sinks: acumula os eventos do frame e os entrega em lote em flush()."""
+
+    def __init__(self):
+        self._pending = []
+        # Métricas de latência do flush (em nanossegundos)
+        self.flush_count = 0
+        self.last_flush_ns = 0
+        self.max_flush_ns = 0
+
+    def mouse_down(self, button):
+        self._pending.append((EV_MOUSE_DOWN, button))
+
+    def mouse_up(self, button):
+        self._pending.append((EV_MOUSE_UP, button))
+
+    def key_down(self, key_name):
+        self._pending.append((EV_KEY_DOWN, key_name))
+
+    def key_up(self, key_name):
+        self._pending.append((EV_KEY_UP, key_name))
+
+    def scroll(self, amount):
+        self._pending.append((EV_SCROLL, amount))
+
+    def hscroll(self, amount):
+        self._pending.append((EV_HSCROLL, amount))
+
+    def flush(self):
+        """Entrega os eventos pendentes do frame e retorna quantos foram entregues."""
+        if not self._pending:
+            return 0
+        events = self._pending
+        self._pending = []
+        start = time.perf_counter_ns()
+        self._send(events)
+        elapsed = time.perf_counter_ns() - start
+        self.flush_count += 1
+        self.last_flush_ns = elapsed
+        if elapsed > self.max_flush_ns:
+            self.max_flush_ns = elapsed
+        return len(events)
+
+    def _send(self, events):
+        """Injeta uma lista de eventos (tipo, argumento). Implementado pelas subclasses."""
+        raise NotImplementedError
+
+
+class RecordingSink(OutputSink):
+    """Sink que apenas grava os lotes entregues (testes e execução sem Windows)."""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def _send(self, events):
+        self.batches.append(events)
+
+    @property
+    def events(self):
+        """Todos os eventos entregues, em ordem."""
+        return [event for batch in self.batches for event in batch]
+
+
+class PyAutoGUISink(OutputSink):
+    """Sink portátil baseado no pyautogui, sem a pausa padrão após cada chamada.
+
+    Fora do Windows, pyautogui.scroll conta entalhes inteiros: as unidades de roda recebidas
+    são acumuladas por direção e convertidas em entalhes, e a fração fica para o próximo evento.
+    """
+
+    def __init__(self, pyautogui=None):
+        super().__init__()
+        if pyautogui is None:
+            import pyautogui # Importado só quando este sink é usado
+        pyautogui.PAUSE = 0
+        self._pyautogui = pyautogui
+        # No Windows o pyautogui repassa o valor direto ao MOUSEEVENTF_WHEEL (já em unidades de roda)
+        self.units_per_click = 1 if sys.platform == 'win32' else WHEEL_DELTA
+        self._wheel = [0, 0] # Unidades ainda não convertidas em entalhes (vertical, horizontal)
+
+    def _clicks(self, axis, units):
+        total = self._wheel[axis] + units
+        clicks = int(total / self.units_per_click) # Arredonda para zero nos dois sentidos
+        self._wheel[axis] = total - clicks * self.units_per_click
+        return clicks
+
+    def _send(self, events):
+        pg = self._pyautogui
+        for kind, arg in events:
+            if kind == EV_MOUSE_DOWN:
+                pg.mouseDown(button=arg)
+            elif kind == EV_MOUSE_UP:
+                pg.mouseUp(button=arg)
+            elif kind == EV_KEY_DOWN:
+                pg.keyDown(arg)
+            elif kind == EV_KEY_UP:
+                pg.keyUp(arg)
+            elif kind == EV_SCROLL:
+                clicks = self._clicks(0, arg)
+                if clicks:
+                    pg.scroll(clicks)
+            elif kind == EV_HSCROLL:
+                clicks = self._clicks(1, arg)
+                if clicks:
+                    pg.hscroll(clicks)
+
+
+# --- Estruturas do SendInput (Windows API) ---
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_RIGHTDOWN = 0x0008
+MOUSEEVENTF_RIGHTUP = 0x0010
+MOUSEEVENTF_MIDDLEDOWN = 0x0020
+MOUSEEVENTF_MIDDLEUP = 0x0040
+MOUSEEVENTF_WHEEL = 0x0800
+MOUSEEVENTF_HWHEEL = 0x1000
+
+MOUSE_FLAGS = {
+    (EV_MOUSE_DOWN, 'left'): MOUSEEVENTF_LEFTDOWN, (EV_MOUSE_UP, 'left'): MOUSEEVENTF_LEFTUP,
+    (EV_MOUSE_DOWN, 'right'): MOUSEEVENTF_RIGHTDOWN, (EV_MOUSE_UP, 'right'): MOUSEEVENTF_RIGHTUP,
+    (EV_MOUSE_DOWN, 'middle'): MOUSEEVENTF_MIDDLEDOWN, (EV_MOUSE_UP, 'middle'): MOUSEEVENTF_MIDDLEUP,
+}
+
+# Teclas que precisam da flag de tecla estendida (setas, bloco de navegação, Windows...)
+EXTENDED_VKS = frozenset((
+    0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x27, 0x28, 0x2D, 0x2E,
+    0x5B, 0x5C, 0x6F, 0x90, 0xA3, 0xA5,
+))
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong), ("dwExtraInfo", ULONG_PTR)]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", ctypes.c_ushort), ("wScan", ctypes.c_ushort), ("dwFlags", ctypes.c_ulong),
+                ("time", ctypes.c_ulong), ("dwExtraInfo", ULONG_PTR)]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", ctypes.c_ulong), ("wParamL", ctypes.c_ushort), ("wParamH", ctypes.c_ushort)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+class SendInputSink(OutputSink):
+    """Sink nativo do Windows: cada flush é uma única chamada a SendInput."""
+
+    def __init__(self):
+        super().__init__()
+        self._send_input = ctypes.windll.user32.SendInput
+
+    def _send(self, events):
+        inputs = (INPUT * len(events))()
+        count = 0
+        for kind, arg in events:
+            item = inputs[count]
+            if kind == EV_KEY_DOWN or kind == EV_KEY_UP:
+                vk = NAME_TO_VK.get(arg)
+                if vk is None:
+                    continue
+                item.type = INPUT_KEYBOARD
+                item.union.ki.wVk = vk
+                flags = KEYEVENTF_KEYUP if kind == EV_KEY_UP else 0
+                if vk in EXTENDED_VKS:
+                    flags |= KEYEVENTF_EXTENDEDKEY
+                item.union.ki.dwFlags = flags
+            elif kind == EV_SCROLL or kind == EV_HSCROLL:
+                item.type = INPUT_MOUSE
+                # Mesmo valor que o pyautogui passa ao MOUSEEVENTF_WHEEL (unidades de WHEEL_DELTA/120)
+                item.union.mi.mouseData = ctypes.c_ulong(arg).value
+                item.union.mi.dwFlags = MOUSEEVENTF_WHEEL if kind == EV_SCROLL else MOUSEEVENTF_HWHEEL
+            else:
+                flags = MOUSE_FLAGS.get((kind, arg))
+                if flags is None:
+                    continue
+                item.type = INPUT_MOUSE
+                item.union.mi.dwFlags = flags
+            count += 1
+        if count:
+            self._send_input(count, inputs, ctypes.sizeof(INPUT))
+
+
+def create_default_sink():
+    """Escolhe o melhor sink disponível para a plataforma atual."""
+    if sys.platform == 'win32':
+        return SendInputSink()
+    return PyAutoGUISink()
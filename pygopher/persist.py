@@ -0,0 +1,148 @@
+"""Gravação do gopher_config.ini em segundo plano, agrupada e atômica.
+
+As alterações ficam em uma cópia do ConfigParser em memória e são marcadas como
+pendentes; um thread próprio grava o arquivo DEBOUNCE_SECONDS depois da última
+alteração, então várias mudanças seguidas (ex: apertar o botão de velocidade
+repetidamente) viram uma única escrita. A escrita vai para um arquivo temporário
+no mesmo diretório e só então substitui o original (os.replace), de modo que uma
+queda no meio nunca deixa um .ini pela metade. Nenhum I/O de disco acontece no
+thread de quem chama.
+"""
+import configparser
+import io
+import os
+import threading
+import time
+from collections import deque
+
+DEBOUNCE_SECONDS = 0.5 # Espera após a última alteração antes de gravar
+RATE_WINDOW_SECONDS = 60.0 # Janela usada no cálculo de gravações por segundo
+
+
+def _copy(config):
+    """Cópia em memória de um ConfigParser: mudanças posteriores no original não vazam para a escrita."""
+    buffer = io.StringIO()
+    config.write(buffer)
+    snapshot = configparser.ConfigParser()
+    snapshot.read_string(buffer.getvalue())
+    return snapshot
+
+
+class ConfigWriter:
+    """Serviço de persistência com debounce e escrita atômica."""
+
+    def __init__(self, path, debounce=DEBOUNCE_SECONDS):
+        self.path = path
+        self.debounce = debounce
+        self._config = configparser.ConfigParser()
+        self._dirty = False
+        self._dirty_at = 0.0 # time.monotonic() da última alteração
+        self._closing = False
+        self._cond = threading.Condition()
+
+        # Estatísticas (lidas pela interface)
+        self.updates = 0 # Alterações recebidas
+        self.writes = 0 # Escritas feitas no disco
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.last_error = None # Mensagem da última falha de escrita (None = última escrita ok)
+        self.last_text = None # Conteúdo da última escrita: as próprias gravações não são recargas (pygopher.reload)
+        self._write_times = deque() # monotonic() de cada escrita dentro da janela
+
+        self._thread = threading.Thread(target=self._run, name='config-writer', daemon=True)
+        self._thread.start()
+
+    def load(self, config):
+        """Adota uma cópia de `config` como o conteúdo atual do arquivo, sem agendar gravação.
+
+        Chamado depois de ler o .ini, para que um set() posterior grave o arquivo inteiro.
+        """
+        snapshot = _copy(config)
+        with self._cond:
+            self._config = snapshot
+
+    def replace(self, config):
+        """Agenda a gravação de uma cópia completa de `config` (ConfigParser)."""
+        snapshot = _copy(config)
+        with self._cond:
+            self._config = snapshot
+            self._mark_dirty()
+
+    def set(self, key, value, section='DEFAULT'):
+        """Altera uma chave e agenda a gravação."""
+        with self._cond:
+            if section != 'DEFAULT' and not self._config.has_section(section):
+                self._config.add_section(section)
+            self._config[section][key] = str(value)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        self.updates += 1
+        self._dirty = True
+        self._dirty_at = time.monotonic()
+        self._cond.notify()
+
+    @property
+    def pending(self):
+        return self._dirty
+
+    @property
+    def writes_per_second(self):
+        """Escritas por segundo na última janela de RATE_WINDOW_SECONDS."""
+        cutoff = time.monotonic() - RATE_WINDOW_SECONDS
+        times = self._write_times
+        while times and times[0] < cutoff:
+            times.popleft()
+        return len(times) / RATE_WINDOW_SECONDS
+
+    def close(self, timeout=2.0):
+        """Grava o que estiver pendente e encerra o thread."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closing:
+                    self._cond.wait()
+                # Debounce: espera até DEBOUNCE_SECONDS sem novas alterações
+                while self._dirty and not self._closing:
+                    remaining = self._dirty_at + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._dirty:
+                    return # Encerrando sem nada pendente
+                buffer = io.StringIO()
+                self._config.write(buffer)
+                self._dirty = False
+                closing = self._closing
+            self._write(buffer.getvalue())
+            if closing:
+                with self._cond:
+                    if not self._dirty:
+                        return
+
+    def _write(self, text):
+        """Escreve o texto no arquivo de forma atômica (temporário + os.replace)."""
+        start = time.perf_counter()
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            self.last_text = text # Antes da troca: quem vigia o arquivo nunca vê o conteúdo novo antes disto
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # O arquivo original continua intacto; a próxima alteração grava o conteúdo completo de novo
+            self.last_error = str(e)
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.last_error = None
+        self.writes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._write_times.append(time.monotonic())
@@ -0,0 +1,346 @@
+"""Perfis nomeados, pré-compilados, com cache em disco e troca instantânea.
+
+Além da seção DEFAULT (o perfil "default"), o gopher_config.ini pode ter seções
+[profile:<nome>]; as chaves ausentes vêm da DEFAULT. Todos os perfis são lidos,
+validados e compilados (bindings, curva, filtros e rolagem) de uma vez ao carregar a
+configuração, então trocar de perfil é só trocar referências no motor, sem reler
+nada. O que custa caro na compilação são as tabelas das curvas; elas ficam em um
+cache ao lado do .ini (um cabeçalho JSON e os números crus, sem nada executável),
+indexadas pelos parâmetros de cada curva.
+
+A troca pode vir de um acorde de botões do controle (profile_chord) ou, com um
+detector de aplicativo em primeiro plano, das chaves apps = programa.exe, ...
+"""
+import json
+import os
+import sys
+import threading
+import time
+from array import array
+
+from pygopher.bindings import compile_bindings, parse_hex
+from pygopher.curves import add_tables, compile_curve, table_size
+from pygopher.devices import BUTTONS_MASK
+from pygopher.filters import compile_filters
+from pygopher.scroll import compile_scroll
+
+DEFAULT_PROFILE = 'default' # Nome do perfil da seção DEFAULT
+PROFILE_SECTION_PREFIX = 'profile:'
+CONTROLLER_SECTION_PREFIX = 'controller:' # Perfis por controle (ver pygopher.devices)
+CACHE_SUFFIX = '.cache'
+CACHE_VERSION = 5 # Aumentar quando o formato do cache ou o cálculo das tabelas mudar
+
+# Chaves do gopher_config.ini e valores padrão
+DEFAULT_PROFILE_SETTINGS = {
+    'profile_chord': '', # Botões (índices hex) que, pressionados juntos, passam ao próximo perfil, ex: "0x6, 0x7"
+}
+
+FOREGROUND_POLL_SECONDS = 0.5 # Intervalo de verificação do aplicativo em primeiro plano
+
+
+class Profile:
+    """Perfil compilado, pronto para ser ativado no motor."""
+
+    __slots__ = ('name', 'bindings', 'curve', 'filters', 'scroll', 'apps', 'errors')
+
+    def __init__(self, name, bindings, curve, filters, scroll, apps=(), errors=()):
+        self.name = name
+        self.bindings = bindings
+        self.curve = curve
+        self.filters = filters
+        self.scroll = scroll
+        self.apps = tuple(apps) # Nomes de executável (casefold) que ativam o perfil automaticamente
+        self.errors = tuple(errors)
+
+
+class ProfileSet:
+    """Todos os perfis de um .ini, mais os perfis por controle e o acorde de troca."""
+
+    __slots__ = ('profiles', 'order', 'app_map', 'chord', 'controller_bindings', 'controller_filters',
+                 'errors')
+
+    def __init__(self, profiles, chord=frozenset(), controller_bindings=None, controller_filters=None,
+                 errors=()):
+        self.profiles = {profile.name: profile for profile in profiles}
+        self.order = tuple(profile.name for profile in profiles) # Ordem de troca pelo acorde
+        self.app_map = {app: profile.name for profile in profiles for app in profile.apps}
+        self.chord = frozenset(chord)
+        self.controller_bindings = controller_bindings or {}
+        self.controller_filters = controller_filters or {}
+        self.errors = tuple(errors)
+
+    def next_name(self, name):
+        """Nome do perfil seguinte a `name`, em ordem circular."""
+        order = self.order
+        if name not in order:
+            return order[0]
+        return order[(order.index(name) + 1) % len(order)]
+
+    def tables(self):
+        """Tabelas de curva usadas pelos perfis: {parâmetros: tabela} (o que o cache em disco guarda)."""
+        return {profile.curve.key: profile.curve.table for profile in self.profiles.values()}
+
+
+class ActiveProfile:
+    """Perfil ativo, com o ProfileSet de onde veio: o que o motor publica com uma única atribuição.
+
+    Não é alterado depois de criado: uma troca de perfil ou uma recarga cria outro. O loop o
+    lê uma vez por frame (GopherEngine.frame_profile), então um frame nunca mistura os bindings,
+    a curva, os filtros ou o acorde de versões diferentes.
+    """
+
+    __slots__ = ('profile_set', 'profile', 'bindings', 'curve', 'filters', 'scroll',
+                 'controller_bindings', 'controller_filters', 'chord_mask')
+
+    def __init__(self, profile_set, profile):
+        self.profile_set = profile_set
+        self.profile = profile
+        # Campos lidos a cada frame, sem um nível a mais de indireção
+        self.bindings = profile.bindings
+        self.curve = profile.curve
+        self.filters = profile.filters
+        self.scroll = profile.scroll
+        self.controller_bindings = profile_set.controller_bindings
+        self.controller_filters = profile_set.controller_filters
+        self.chord_mask = sum(1 << idx for idx in profile_set.chord) & BUTTONS_MASK # Botões que trocam de perfil
+
+
+def _section_keys(config, prefix):
+    """Gera (nome casefold, seção) para cada seção cujo nome começa com prefix."""
+    for section_name in config.sections():
+        if section_name.lower().startswith(prefix):
+            key = section_name[len(prefix):].strip().casefold()
+            if key:
+                yield key, config[section_name]
+
+
+def compile_profile(name, section):
+    """Compila uma seção do configparser em um Profile."""
+    bindings = compile_bindings(section)
+    curve = compile_curve(section)
+    filters = compile_filters(section)
+    scroll = compile_scroll(section)
+    apps = [] if name == DEFAULT_PROFILE else [
+        app.strip().casefold() for app in section.get('apps', '').split(',') if app.strip()]
+    errors = bindings.errors + curve.errors + filters.errors + scroll.errors
+    if name != DEFAULT_PROFILE:
+        errors = tuple(f"[{PROFILE_SECTION_PREFIX}{name}] {error}" for error in errors)
+    return Profile(name, bindings, curve, filters, scroll, apps, errors)
+
+
+def parse_chord(text):
+    """Lê a lista de botões do acorde (índices hex). Levanta ValueError."""
+    buttons = {parse_hex(item.strip()) for item in text.split(',') if item.strip()}
+    if len(buttons) == 1:
+        raise ValueError("O acorde precisa de pelo menos dois botões")
+    return frozenset(buttons)
+
+
+def compile_profile_set(config):
+    """Compila a DEFAULT, as seções [profile:...] e [controller:...] de um ConfigParser."""
+    profiles = [compile_profile(DEFAULT_PROFILE, config['DEFAULT'])]
+    for name, section in _section_keys(config, PROFILE_SECTION_PREFIX):
+        if name != DEFAULT_PROFILE:
+            profiles.append(compile_profile(name, section))
+    errors = [error for profile in profiles for error in profile.errors]
+
+    controller_bindings = {}
+    controller_filters = {}
+    for key, section in _section_keys(config, CONTROLLER_SECTION_PREFIX):
+        controller_bindings[key] = compile_bindings(section)
+        controller_filters[key] = compile_filters(section)
+        errors.extend(f"[{CONTROLLER_SECTION_PREFIX}{key}] {error}"
+                      for error in controller_bindings[key].errors + controller_filters[key].errors)
+
+    text = config['DEFAULT'].get('profile_chord', '')
+    try:
+        chord = parse_chord(text)
+    except ValueError:
+        errors.append(f"Valor inválido em 'profile_chord': '{text}'")
+        chord = frozenset()
+    return ProfileSet(profiles, chord, controller_bindings, controller_filters, errors)
+
+
+# --- Cache em disco ---
+# Formato: uma linha JSON {"version", "byteorder", "tables": [[parâmetros, entradas], ...]}
+# seguida das tabelas, na mesma ordem, como doubles crus.
+
+def _table_key(params):
+    """Parâmetros lidos do JSON -> chave do cache de tabelas de pygopher.curves."""
+    shape, curve, dead_zone, outer, anti, exponent, points = params
+    return (shape, curve, dead_zone, outer, anti, exponent, tuple((x, y) for x, y in points))
+
+
+def load_cached_tables(path):
+    """Registra as tabelas de curva do cache do .ini em `path`. Retorna as chaves lidas (vazio se não há cache válido)."""
+    items = []
+    try:
+        with open(path + CACHE_SUFFIX, 'rb') as f:
+            header = json.loads(f.readline())
+            if header['version'] != CACHE_VERSION or header['byteorder'] != sys.byteorder:
+                return set()
+            for params, size in header['tables']:
+                key = _table_key(params)
+                if size != table_size(key[0]):
+                    raise ValueError(f"Tabela com {size} entradas")
+                table = array('d')
+                table.fromfile(f, size)
+                items.append((key, table))
+    except (OSError, EOFError, ValueError, KeyError, TypeError):
+        return set() # Ausente, incompleto ou de outro formato: as curvas são compiladas de novo
+    add_tables(items)
+    return {key for key, _ in items}
+
+
+def write_table_cache(path, profile_set):
+    """Grava o cache com as tabelas usadas por `profile_set`, de forma atômica. Falhas são ignoradas."""
+    cache_path = path + CACHE_SUFFIX
+    # Um arquivo temporário por escritor: duas gravações simultâneas (ex: load_config duas vezes
+    # seguidas) não escrevem no mesmo arquivo, e a última substituição vence com um cache inteiro
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tables = list(profile_set.tables().items())
+    header = {'version': CACHE_VERSION, 'byteorder': sys.byteorder,
+              'tables': [[list(key), len(table)] for key, table in tables]}
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(json.dumps(header).encode() + b'\n')
+            for _, table in tables:
+                table.tofile(f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_profile_set(path, config):
+    """ProfileSet do .ini em `path`, já lido em `config`, com as tabelas de curva vindas do cache.
+
+    Se alguma curva precisou ser compilada ou o cache tem curvas que os perfis não usam mais, ele
+    é regravado em um thread separado (sem I/O no thread de quem chama).
+    """
+    cached = load_cached_tables(path)
+    profile_set = compile_profile_set(config)
+    if profile_set.tables().keys() != cached:
+        threading.Thread(target=write_table_cache, args=(path, profile_set), daemon=True).start()
+    return profile_set
+
+
+# --- Troca automática pelo aplicativo em primeiro plano ---
+
+class FakeForegroundDetector:
+    """Detector para testes: o aplicativo em primeiro plano é o que estiver em `app`."""
+
+    def __init__(self, app=None):
+        self.app = app
+
+    def current_app(self):
+        return self.app
+
+
+class Win32ForegroundDetector:
+    """Nome do executável da janela em primeiro plano (Windows)."""
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._last_window = None
+        self._last_app = None
+
+    def current_app(self):
+        window = self._user32.GetForegroundWindow()
+        if not window:
+            return None
+        if window == self._last_window:
+            return self._last_app # Mesma janela: evita abrir o processo de novo
+        ctypes, wintypes = self._ctypes, self._wintypes
+        pid = wintypes.DWORD()
+        self._user32.GetWindowThreadProcessId(window, ctypes.byref(pid))
+        process = self._kernel32.OpenProcess(self.PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not process:
+            return None
+        try:
+            buffer = ctypes.create_unicode_buffer(260)
+            size = wintypes.DWORD(len(buffer))
+            if not self._kernel32.QueryFullProcessImageNameW(process, 0, buffer, ctypes.byref(size)):
+                return None
+        finally:
+            self._kernel32.CloseHandle(process)
+        self._last_window = window
+        self._last_app = os.path.basename(buffer.value).casefold()
+        return self._last_app
+
+
+def create_foreground_detector():
+    """Detector da plataforma atual, ou None se não houver."""
+    if sys.platform == 'win32':
+        return Win32ForegroundDetector()
+    return None
+
+
+class AutoSwitcher:
+    """Ativa o perfil associado ao aplicativo em primeiro plano e volta ao anterior ao sair dele."""
+
+    def __init__(self, engine, detector, interval=FOREGROUND_POLL_SECONDS):
+        self.engine = engine
+        self.detector = detector
+        self.interval = interval
+        self.last_app = None
+        self.manual_profile = None # Perfil ativo antes da troca automática (None = nenhuma troca ativa)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Verifica o aplicativo em primeiro plano uma vez. Retorna o perfil ativado, ou None."""
+        app = self.detector.current_app()
+        if app == self.last_app:
+            return None
+        self.last_app = app
+        engine = self.engine
+        profile_set = engine.profile_set
+        if profile_set is None:
+            return None
+        name = profile_set.app_map.get(app)
+        if name is not None:
+            if self.manual_profile is None:
+                self.manual_profile = engine.profile.name
+            if name != engine.profile.name:
+                engine.activate_profile(name)
+                return name
+        elif self.manual_profile is not None:
+            name, self.manual_profile = self.manual_profile, None
+            if name in profile_set.profiles and name != engine.profile.name:
+                engine.activate_profile(name)
+                return name
+        return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='profile-switcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Para o thread; espera a verificação em andamento, que ainda poderia trocar o perfil."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except OSError:
+                pass # Falha passageira ao consultar a janela/processo; tenta de novo no próximo intervalo
+
+
+def measure_switch(engine, iterations=10000):
+    """Tempo médio (µs) de uma troca de perfil no motor, alternando entre os dois primeiros perfis."""
+    order = engine.profile_set.order
+    names = (order[0], order[1 % len(order)])
+    start = time.perf_counter()
+    for i in range(iterations):
+        engine.activate_profile(names[i & 1])
+    return (time.perf_counter() - start) / iterations * 1e6
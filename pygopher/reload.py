@@ -0,0 +1,132 @@
+"""Recarga a quente do gopher_config.ini editado fora da interface.
+
+Um thread próprio compara a cada WATCH_INTERVAL o mtime e o tamanho do .ini (um
+os.stat, sem abrir o arquivo). Quando eles mudam e ficam estáveis por mais um
+intervalo (um editor pode gravar em partes), o arquivo é lido, validado e compilado
+nesse mesmo thread; o loop do controle nunca espera por isso. Uma versão válida é
+entregue já compilada (ProfileSet) para ser instalada com pygopher.config.apply_config,
+que só troca referências no motor. Uma versão inválida é recusada com a mensagem do
+erro e a configuração em uso continua valendo.
+
+As gravações do próprio programa (pygopher.persist.ConfigWriter) são reconhecidas pelo
+conteúdo e não viram recargas.
+"""
+import configparser
+import os
+import threading
+
+from pygopher.profiles import compile_profile_set
+
+# Chaves do gopher_config.ini e valores padrão
+DEFAULT_RELOAD_SETTINGS = {
+    'config_hot_reload': 'true', # Recarrega o .ini quando ele é alterado fora do programa (vale ao abrir)
+}
+
+WATCH_INTERVAL = 0.5 # Segundos entre duas verificações do mtime/tamanho do .ini
+MAX_REPORTED_ERRORS = 3 # Erros de validação listados na mensagem de recusa
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def parse_config(text, path, defaults=None):
+    """Lê e valida o conteúdo de um .ini. Retorna (ConfigParser, ProfileSet); levanta ValueError.
+
+    defaults são os valores das chaves ausentes do arquivo (ex: os padrões da interface).
+    """
+    if not text.strip():
+        raise ValueError(f"'{path}' está vazio")
+    config = configparser.ConfigParser()
+    for key, value in (defaults or {}).items():
+        config['DEFAULT'][key] = value
+    try:
+        config.read_string(text, source=path)
+    except configparser.Error as e:
+        raise ValueError(f"'{path}' não pôde ser lido: {e}") from e
+    value = config['DEFAULT'].get('sensitivity_multiplier', '1.0')
+    try:
+        float(value)
+    except ValueError:
+        raise ValueError(f"Valor inválido em 'sensitivity_multiplier': '{value}'") from None
+    profile_set = compile_profile_set(config)
+    if profile_set.errors:
+        errors = profile_set.errors
+        more = f" (e mais {len(errors) - MAX_REPORTED_ERRORS})" if len(errors) > MAX_REPORTED_ERRORS else ""
+        raise ValueError(f"'{path}' tem {len(errors)} erro(s): {'; '.join(errors[:MAX_REPORTED_ERRORS])}{more}")
+    return config, profile_set
+
+
+class ConfigWatcher:
+    """Vigia o .ini e compila as versões novas fora do thread do controle.
+
+    on_reload(config, profile_set) e on_error(message) são chamados a partir do thread do
+    vigia: a interface só publica em um UpdateChannel; sem interface, apply_config pode ser
+    chamado ali mesmo (só troca referências, como a troca automática de perfil).
+    """
+
+    def __init__(self, path, on_reload, on_error, writer=None, defaults=None, interval=WATCH_INTERVAL):
+        self.path = path
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self.writer = writer # ConfigWriter do programa, cujas gravações não são recargas
+        self.defaults = defaults
+        self.interval = interval
+        try:
+            self.key = _stat_key(path) # Versão em uso (mtime_ns, tamanho)
+        except OSError:
+            self.key = None
+        self.pending = None # Versão nova vista na última verificação, esperando ficar estável
+        self.reloads = 0
+        self.rejected = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Uma verificação: recarrega se o .ini mudou e está estável desde a verificação anterior."""
+        try:
+            key = _stat_key(self.path)
+        except OSError:
+            return # Removido ou no meio de uma troca: a versão em uso continua
+        if key == self.key:
+            self.pending = None
+            return
+        if key != self.pending:
+            self.pending = key # Espera mais um intervalo sem mudanças
+            return
+        writer = self.writer
+        if writer is not None and writer.pending:
+            return # Uma gravação do programa vai substituir o arquivo: decide depois dela
+        self.key = key
+        self.pending = None
+        try:
+            with open(self.path) as f:
+                text = f.read()
+        except OSError as e:
+            self.rejected += 1
+            self.on_error(f"'{self.path}' não pôde ser lido: {e}")
+            return
+        if writer is not None and text == writer.last_text:
+            return # Gravação do próprio programa
+        try:
+            config, profile_set = parse_config(text, self.path, self.defaults)
+        except ValueError as e:
+            self.rejected += 1
+            self.on_error(str(e))
+            return
+        self.reloads += 1
+        self.on_reload(config, profile_set)
@@ -0,0 +1,348 @@
+"""Motor de entrada em um processo separado, controlado pela interface gráfica.
+
+No mesmo processo, o thread do controle disputa o GIL com o mainloop do Tkinter: rolar
+a aba de Configurações, abrir um diálogo ou redesenhar widgets atrasa o despertar do
+loop e aparece como jitter no ritmo dos frames. Com engine_process = true, o motor roda
+em um processo próprio (multiprocessing, sempre no modo spawn) e a interface só
+conversa com ele:
+
+    comandos   (interface -> motor)  pipe: sensibilidade, perfil, configuração
+                                     compilada, perfil de frames, exportações, parar
+    avisos     (motor -> interface)  pipe: as mesmas mensagens do EngineListener,
+                                     fundidas por um UpdateChannel no processo do motor
+    estado     (motor -> interface)  bloco de multiprocessing.shared_memory com um
+                                     seqlock: analógico, botões, taxa e latências
+    telemetria (motor -> interface)  outro bloco compartilhado: o TelemetryRing do
+                                     visualizador, preenchido a cada frame quando ligado
+
+O processo do motor nunca espera pela interface: o loop só publica no UpdateChannel, e
+o thread principal do processo envia as mensagens e o instantâneo do estado a cada
+PUBLISH_INTERVAL. python -m benchmarks.jitter mede o ganho no ritmo dos frames.
+"""
+import os
+import signal
+import struct
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import get_context, shared_memory
+
+from pygopher.devices import DeviceManager
+from pygopher.engine import GopherEngine, EngineListener, INPUT_MODE_POLLING
+from pygopher.metrics import STAGE_FRAME, STAGE_INPUT_TO_INJECT
+from pygopher.motion import VirtualCursor, Win32CursorBackend
+from pygopher.output import create_default_sink
+from pygopher.profiles import AutoSwitcher, create_foreground_detector
+from pygopher.sources import SOURCE_PYGAME
+from pygopher.telemetry import TelemetryRing
+from pygopher.trace import FrameTracer
+from pygopher.uichannel import UpdateChannel
+
+# Chaves do gopher_config.ini e valores padrão
+DEFAULT_PROCESS_SETTINGS = {
+    'engine_process': 'false', # true = o motor roda em um processo separado da interface (vale ao iniciar o Gopher)
+}
+
+PUBLISH_INTERVAL = 1 / 60 # Segundos entre dois instantâneos do estado (e envios dos avisos)
+STOP_TIMEOUT = 2.0 # Segundos de espera pelo fim do processo antes de terminá-lo à força
+READ_RETRIES = 100 # Leituras tentadas enquanto o escritor está no meio de uma publicação
+
+# Campos do instantâneo, na ordem do bloco compartilhado (latências em ns)
+SNAPSHOT_FIELDS = (
+    'running', 'disabled', 'idle', 'devices', 'buttons', 'stick_x', 'stick_y',
+    'rate', 'missed', 'overshoot_avg_us', 'overshoot_max_us',
+    'frame_p50', 'frame_p99', 'frame_max', 'input_p50', 'input_p99', 'input_max',
+    'wakeups', 'skipped', 'flush_last_ns', 'flush_max_ns', 'flush_count', 'sensitivity',
+)
+EngineSnapshot = namedtuple('EngineSnapshot', SNAPSHOT_FIELDS)
+
+_SEQUENCE = struct.Struct('<Q') # Contador do seqlock: ímpar enquanto o escritor publica
+_PAYLOAD = struct.Struct('<???IQ2dd I2d 6d 2Q 3Q d')
+STATE_SIZE = _SEQUENCE.size + _PAYLOAD.size
+
+
+class SharedState:
+    """Instantâneo do estado do motor em memória compartilhada, com um único escritor (seqlock).
+
+    O escritor torna o contador ímpar, grava os campos e o torna par de novo; o leitor
+    repete a leitura se o contador era ímpar ou mudou durante a cópia. Nenhum lado
+    espera o outro nem usa trava entre processos. Cada contador é gravado por um único
+    memcpy alinhado de 8 bytes, e no x86 (o alvo, Windows) as escritas não são
+    reordenadas entre si.
+    """
+
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner # Quem criou o bloco também o remove (unlink) ao fechar
+        self.buffer = memory.buf
+        self.sequence = 0 # Último valor do contador publicado (só no escritor)
+
+    @classmethod
+    def create(cls):
+        return cls(shared_memory.SharedMemory(create=True, size=STATE_SIZE), owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        # O processo do motor (spawn) usa o mesmo resource_tracker da interface, que remove o bloco no unlink
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def publish(self, values):
+        """Grava um instantâneo (valores na ordem de SNAPSHOT_FIELDS). Só um processo pode escrever."""
+        buffer = self.buffer
+        sequence = self.sequence + 1
+        _SEQUENCE.pack_into(buffer, 0, sequence)
+        _PAYLOAD.pack_into(buffer, _SEQUENCE.size, *values)
+        self.sequence = sequence + 1
+        _SEQUENCE.pack_into(buffer, 0, self.sequence)
+
+    def read(self, retries=READ_RETRIES):
+        """Último instantâneo consistente (EngineSnapshot), ou None se nada foi publicado ainda."""
+        buffer = self.buffer
+        for _ in range(retries):
+            sequence = _SEQUENCE.unpack_from(buffer, 0)[0]
+            if not sequence:
+                return None
+            if sequence & 1:
+                continue # Publicação em andamento
+            values = _PAYLOAD.unpack_from(buffer, _SEQUENCE.size)
+            if _SEQUENCE.unpack_from(buffer, 0)[0] == sequence:
+                return EngineSnapshot(*values)
+        return None
+
+    def close(self):
+        self.buffer = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def snapshot(engine):
+    """Valores do instantâneo do motor, na ordem de SNAPSHOT_FIELDS (lidos sem trava, de outro thread)."""
+    devices = engine.devices.devices if engine.devices is not None else ()
+    buttons = 0
+    stick_x = stick_y = 0.0
+    for device in devices:
+        buttons |= device.state_mask
+    if devices:
+        filtered = devices[0].filtered # Analógico esquerdo do primeiro controle, já filtrado
+        stick_x, stick_y = filtered[0], filtered[1]
+    scheduler = engine.scheduler
+    loop = scheduler.stats if scheduler is not None and engine.input_mode == INPUT_MODE_POLLING else None
+    stats = engine.stats or {}
+    output = engine.output
+    metrics = engine.metrics
+    return (
+        engine.running, engine.disabled, bool(loop and loop['idle']), len(devices), buttons, stick_x, stick_y,
+        loop['rate'] if loop else 0.0, loop['missed'] if loop else 0,
+        loop['overshoot_avg_us'] if loop else 0.0, loop['overshoot_max_us'] if loop else 0.0,
+        *metrics.summary(STAGE_FRAME), *metrics.summary(STAGE_INPUT_TO_INJECT),
+        stats.get('wakeups', 0), stats.get('skipped', 0),
+        output.last_flush_ns, output.max_flush_ns, output.flush_count, engine.sensitivity_multiplier,
+    )
+
+
+class ProcessListener(EngineListener):
+    """Avisos do motor no processo separado: publicados em um UpdateChannel e enviados pelo thread principal."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def on_disabled_changed(self, disabled):
+        self.channel.post('disabled', disabled)
+
+    def on_speed_changed(self, multiplier):
+        self.channel.post('speed', multiplier)
+
+    def on_hide_window(self):
+        self.channel.post_event('hide_window')
+
+    def on_devices_changed(self, devices):
+        self.channel.post('devices', [device.name for device in devices])
+
+    def on_profile_changed(self, name):
+        self.channel.post('profile', name)
+
+
+def _handle_command(engine, channel, kind, value, telemetry=None):
+    """Aplica um comando da interface no processo do motor (telemetry é o TelemetryRing compartilhado)."""
+    if kind == 'stop':
+        engine.running = False
+    elif kind == 'sensitivity':
+        engine.set_sensitivity(value)
+    elif kind == 'profile':
+        if value in engine.profile_set.profiles:
+            engine.activate_profile(value)
+    elif kind == 'config':
+        profile_set, sensitivity = value # Já compilado pela interface: aqui só troca referências
+        engine.set_profiles(profile_set)
+        engine.set_sensitivity(sensitivity)
+    elif kind == 'trace':
+        if value:
+            engine.tracer = FrameTracer()
+        else:
+            engine.tracer = None
+    elif kind == 'telemetry':
+        engine.telemetry = telemetry if value else None
+    elif kind == 'export':
+        what, path = value
+        count, error = None, None
+        try:
+            if what == 'trace':
+                count = engine.tracer.dump(path) if engine.tracer is not None else 0
+            else:
+                engine.metrics.export(path)
+        except OSError as e:
+            error = str(e)
+        channel.post_event('exported', (what, path, count, error))
+
+
+def engine_process_main(profile_set, settings, commands, events, state_name, telemetry_name):
+    """Ponto de entrada do processo do motor (spawn): roda até o comando 'stop' ou até a interface sumir.
+
+    settings traz input_mode, input_source, sensitivity, profile, trace e telemetry, tirados da
+    interface no momento de iniciar; profile_set é a configuração já compilada por ela.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C no console é tratado pela interface
+    state = SharedState.attach(state_name)
+    telemetry = TelemetryRing.attach(telemetry_name)
+    channel = UpdateChannel()
+    engine = GopherEngine(create_default_sink(), VirtualCursor(Win32CursorBackend()),
+                          listener=ProcessListener(channel))
+    engine.set_profiles(profile_set, settings.get('profile'))
+    engine.set_sensitivity(settings.get('sensitivity', 1.0))
+    engine.input_mode = settings.get('input_mode', INPUT_MODE_POLLING)
+    if settings.get('trace'):
+        engine.tracer = FrameTracer()
+    if settings.get('telemetry'):
+        engine.telemetry = telemetry
+    switcher = None
+    devices = None
+    pygame = None
+    try:
+        detector = create_foreground_detector()
+        if detector is not None and profile_set.app_map:
+            switcher = AutoSwitcher(engine, detector)
+            switcher.start()
+
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+        import pygame
+        pygame.display.init()
+        pygame.joystick.init()
+        devices = DeviceManager(pygame, engine.cursor.backend, settings.get('input_source', SOURCE_PYGAME))
+        devices.scan()
+        channel.post('devices', [device.name for device in devices.devices])
+
+        engine.running = True
+        thread = threading.Thread(target=engine.run, args=(devices,), daemon=True)
+        thread.start()
+        while thread.is_alive():
+            if commands.poll(PUBLISH_INTERVAL):
+                try:
+                    kind, value = commands.recv()
+                except EOFError:
+                    engine.running = False # A interface fechou sem mandar parar
+                    break
+                _handle_command(engine, channel, kind, value, telemetry)
+            state.publish(snapshot(engine))
+            for message in channel.drain():
+                events.send(message)
+        thread.join(timeout=1)
+        state.publish(snapshot(engine))
+        for message in channel.drain():
+            events.send(message)
+        events.send(('stopped', engine.stats))
+    except Exception as e:
+        events.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        if switcher is not None:
+            switcher.stop()
+        if devices is not None:
+            devices.close_all()
+        if pygame is not None:
+            pygame.quit()
+        events.close()
+        state.close()
+        engine.telemetry = None
+        telemetry.close()
+
+
+class EngineProcess:
+    """Lado da interface: inicia, comanda e para o processo do motor e lê o estado publicado por ele."""
+
+    def __init__(self):
+        self.process = None
+        self.state = None # SharedState criado pela interface
+        self.telemetry = None # TelemetryRing compartilhado, lido pelo visualizador da interface
+        self.commands = None # Ponta de escrita do pipe de comandos
+        self.events = None # Ponta de leitura do pipe de avisos
+
+    def start(self, profile_set, settings):
+        """Inicia o processo do motor com a configuração compilada e os ajustes atuais da interface."""
+        context = get_context('spawn') # Igual no Windows e nos demais; fork com o Tk aberto não é seguro
+        self.state = SharedState.create()
+        self.telemetry = TelemetryRing.create()
+        command_reader, self.commands = context.Pipe(duplex=False)
+        self.events, event_writer = context.Pipe(duplex=False)
+        self.process = context.Process(target=engine_process_main, name='pygopher-engine', daemon=True,
+                                       args=(profile_set, settings, command_reader, event_writer, self.state.name,
+                                             self.telemetry.name))
+        self.process.start()
+        # As pontas do processo filho ficam só com ele: assim um EOF indica que o outro lado terminou
+        command_reader.close()
+        event_writer.close()
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def send(self, kind, value=None):
+        """Envia um comando ao processo do motor. Retorna False se ele já terminou."""
+        if self.commands is None:
+            return False
+        try:
+            self.commands.send((kind, value))
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def messages(self):
+        """Avisos recebidos do processo do motor desde a última chamada (sem bloquear): lista de (tipo, valor)."""
+        messages = []
+        events = self.events
+        try:
+            while events is not None and events.poll():
+                messages.append(events.recv())
+        except (EOFError, OSError):
+            pass
+        return messages
+
+    def read_state(self):
+        """Último EngineSnapshot publicado, ou None."""
+        return self.state.read() if self.state is not None else None
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Para o processo do motor e libera os recursos. Retorna os avisos que ainda não tinham sido lidos."""
+        if self.process is None:
+            return []
+        self.send('stop')
+        messages = []
+        deadline = time.monotonic() + timeout
+        # Lê enquanto espera: um pipe de avisos cheio impediria o processo de terminar
+        while self.process.is_alive() and time.monotonic() < deadline:
+            messages.extend(self.messages())
+            self.process.join(PUBLISH_INTERVAL)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        messages.extend(self.messages())
+        self.commands.close()
+        self.events.close()
+        self.state.close()
+        self.telemetry.close()
+        self.process = self.commands = self.events = self.state = self.telemetry = None
+        return messages
+
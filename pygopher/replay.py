@@ -0,0 +1,102 @@
+"""Replay determinístico de sessões gravadas, sem pygame, Tkinter ou APIs do Windows.
+
+Os frames gravados alimentam uma ScriptedSource lida pelo mesmo GopherEngine.poll_frame
+do motor por polling, com um sink de gravação e um cursor falso. O relógio do motor, da
+roda de timers (toque/segurar, turbo...) e da rolagem é o da gravação, então o
+movimento por tick e os timers caem nos mesmos frames em qualquer replay. O resultado
+(eventos injetados e trajetória do cursor) tem uma forma textual estável para comparar versões.
+
+Uso: python -m pygopher --replay sessao.pgs [--config gopher_config.ini] [--realtime] [--output saida.txt]
+"""
+import time
+
+from pygopher.config import read_config, default_config, apply_config
+from pygopher.devices import DeviceManager
+from pygopher.engine import GopherEngine, FPS, IDLE_FPS, IDLE_AFTER_SECONDS
+from pygopher.motion import FakeCursorBackend, VirtualCursor
+from pygopher.output import RecordingSink
+from pygopher.scheduler import FrameScheduler
+from pygopher.scroll import ScrollState
+from pygopher.session import read_session
+from pygopher.sources import ScriptedSource
+from pygopher.timers import TimerWheel
+
+START_POSITION = (960, 540) # Posição inicial do cursor falso
+
+
+class ReplayResult:
+    """Saída de um replay: eventos injetados e trajetória do cursor, indexados por frame."""
+
+    def __init__(self):
+        self.frames = 0
+        self.events = []     # (frame, t_ns, tipo, argumento)
+        self.trajectory = [] # (frame, t_ns, x, y), só quando o pixel muda
+        self.elapsed = 0.0   # Tempo real gasto no replay (s)
+        self.duration = 0.0  # Duração da sessão gravada (s)
+
+    def lines(self):
+        """Representação textual estável, uma linha por evento, ordenada por frame."""
+        merged = [(frame, 0, f"{frame} {t_ns} {kind} {arg}") for frame, t_ns, kind, arg in self.events]
+        merged += [(frame, 1, f"{frame} {t_ns} move {x} {y}") for frame, t_ns, x, y in self.trajectory]
+        merged.sort(key=lambda item: (item[0], item[1]))
+        return [line for _, _, line in merged]
+
+
+def replay(frames, config=None, realtime=False):
+    """Reproduz uma lista de frames (t_ns, eixos, máscara) e retorna um ReplayResult."""
+    sink = RecordingSink()
+    backend = FakeCursorBackend(*START_POSITION)
+    engine = GopherEngine(sink, VirtualCursor(backend))
+    now = [0] # Relógio da sessão (ns)
+    engine.clock = lambda: now[0]
+    engine.timers = TimerWheel(clock=lambda: now[0] / 1e9)
+    engine.scroll_state = ScrollState(clock=lambda: now[0] / 1e9)
+    if config is not None:
+        apply_config(engine, config)
+    devices = DeviceManager(None, backend)
+    devices.add_source(ScriptedSource((axes, mask) for _, axes, mask in frames))
+    engine.prepare(devices)
+    scheduler = FrameScheduler(FPS, IDLE_FPS, IDLE_AFTER_SECONDS, clock=engine.clock)
+
+    result = ReplayResult()
+    start = time.perf_counter()
+    last_move = None
+
+    for frame, (t_ns, _, _) in enumerate(frames):
+        if realtime:
+            delay = t_ns / 1e9 - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+        now[0] = t_ns
+        batches_before = len(sink.batches)
+        engine.poll_frame(devices, scheduler)
+        for batch in sink.batches[batches_before:]:
+            for kind, arg in batch:
+                result.events.append((frame, t_ns, kind, arg))
+        position = (backend.x, backend.y)
+        if position != last_move and backend.trajectory:
+            result.trajectory.append((frame, t_ns, position[0], position[1]))
+            last_move = position
+
+    result.frames = len(frames)
+    result.elapsed = time.perf_counter() - start
+    result.duration = frames[-1][0] / 1e9 if frames else 0.0
+    return result
+
+
+def run_replay(session_path, config_path, realtime=False, output=None):
+    """Reproduz um arquivo de sessão e imprime um resumo; com output, grava as linhas do resultado nele."""
+    try:
+        config = read_config(config_path)
+    except ValueError as e:
+        print(f"{e}; usando os mapeamentos padrão.")
+        config = default_config()
+    result = replay(read_session(session_path), config, realtime=realtime)
+    if output:
+        with open(output, 'w') as f:
+            f.write('\n'.join(result.lines()) + '\n')
+    speedup = result.duration / result.elapsed if result.elapsed else float('inf')
+    print(f"{result.frames} frames, {len(result.events)} eventos, {len(result.trajectory)} movimentos - "
+          f"sessão de {result.duration:.2f}s reproduzida em {result.elapsed:.3f}s ({speedup:.0f}x)")
+    return 0
@@ -0,0 +1,86 @@
+"""Agendador de frames do loop do controle.
+
+Usa prazos absolutos em ``perf_counter_ns`` (monotônico e de alta resolução), de modo
+que atrasos e o excesso de sono de um frame não se acumulam nos seguintes. A taxa é
+adaptativa: taxa cheia enquanto há entrada, caindo para uma taxa ociosa após alguns
+segundos sem entrada, e voltando à taxa cheia na primeira entrada.
+"""
+import time
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class FrameScheduler:
+    """Mantém o ritmo do loop com prazos absolutos e contabiliza atrasos."""
+
+    def __init__(self, active_hz, idle_hz, idle_after, clock=time.perf_counter_ns, sleep=time.sleep):
+        self.active_period_ns = int(NS_PER_SECOND / active_hz)
+        self.idle_period_ns = int(NS_PER_SECOND / idle_hz)
+        self.idle_after_ns = int(idle_after * NS_PER_SECOND)
+        self._clock = clock
+        self._sleep = sleep
+
+        now = clock()
+        self._deadline = now
+        self._last_input = now
+        self.idle = False
+
+        # Contadores da janela de 1 segundo em andamento
+        self._window_start = now
+        self._frames = 0
+        self._missed = 0
+        self._overshoot_total = 0
+        self._overshoot_max = 0
+
+        # Estatísticas da última janela completa (lidas por outros threads; substituídas por inteiro)
+        self.stats = {'rate': 0.0, 'missed': 0, 'overshoot_avg_us': 0.0, 'overshoot_max_us': 0.0, 'idle': False}
+
+    def mark_input(self):
+        """Registra que houve entrada neste frame; volta imediatamente à taxa cheia."""
+        self._last_input = self._clock()
+        if self.idle:
+            self.idle = False
+            self._deadline = self._last_input # Não espera o resto do período ocioso
+
+    def wait(self):
+        """Dorme até o próximo prazo absoluto."""
+        now = self._clock()
+        if not self.idle and now - self._last_input > self.idle_after_ns:
+            self.idle = True
+        period = self.idle_period_ns if self.idle else self.active_period_ns
+
+        self._deadline += period
+        if self._deadline <= now:
+            # Frame estourou o prazo: conta os prazos perdidos e ressincroniza sem tentar recuperar
+            self._missed += (now - self._deadline) // period + 1
+            self._deadline = now
+            woke = now
+        else:
+            self._sleep((self._deadline - now) / NS_PER_SECOND)
+            woke = self._clock()
+            overshoot = woke - self._deadline
+            if overshoot > 0:
+                self._overshoot_total += overshoot
+                if overshoot > self._overshoot_max:
+                    self._overshoot_max = overshoot
+
+        self._frames += 1
+        window = woke - self._window_start
+        if window >= NS_PER_SECOND:
+            self._publish(woke, window)
+
+    def _publish(self, now, window):
+        """Fecha a janela atual e publica as estatísticas por segundo."""
+        frames = self._frames
+        self.stats = {
+            'rate': frames * NS_PER_SECOND / window,
+            'missed': self._missed,
+            'overshoot_avg_us': self._overshoot_total / frames / 1000 if frames else 0.0,
+            'overshoot_max_us': self._overshoot_max / 1000,
+            'idle': self.idle,
+        }
+        self._window_start = now
+        self._frames = 0
+        self._missed = 0
+        self._overshoot_total = 0
+        self._overshoot_max = 0
@@ -0,0 +1,161 @@
+"""Rolagem suave pelo analógico direito, com acúmulo de frações de entalhe.
+
+O eixo passa por uma curva de resposta própria (por eixo, ver pygopher.curves) e o
+resultado é somado a um acumulador em unidades de roda do Windows (WHEEL_DELTA = 120
+por entalhe). Os eventos só são emitidos com a parte inteira acumulada e no máximo
+scroll_max_rate_hz vezes por segundo em cada direção; a fração fica para o evento seguinte, então
+movimentos lentos continuam rolando em vez de serem arredondados para zero. O eixo X
+do mesmo analógico gera rolagem horizontal. Como o cursor, a rolagem é por segundo:
+cada tick soma o ganho × o tempo decorrido (ver pygopher.motion.MAX_TICK_SECONDS).
+"""
+import time
+
+from pygopher.curves import (
+    AXIS_MAX, AXIAL_OFFSET, SHAPE_AXIAL, CURVES, CURVE_LINEAR, CURVE_CUSTOM, DEFAULT_CURVE, ResponseCurve,
+    parse_points,
+)
+from pygopher.motion import REFERENCE_FPS, NOMINAL_TICK_SECONDS
+
+WHEEL_DELTA = 120 # Unidades de roda por entalhe
+LEGACY_SCROLL_FACTOR = 0.005 # Unidades de roda por unidade do eixo, por frame, da rolagem original
+
+# Chaves do gopher_config.ini e valores padrão
+DEFAULT_SCROLL = {
+    'scroll_dead_zone': '5000',        # Zona morta do analógico direito, em unidades do eixo
+    'scroll_speed': '1.0',             # Multiplicador sobre a velocidade original (1.0 = igual à deflexão máxima antiga)
+    'scroll_curve': CURVE_LINEAR,      # linear / exponential / custom (mesmos valores de stick_curve)
+    'scroll_curve_exponent': '2.0',
+    'scroll_horizontal': 'true',       # Eixo X do analógico direito rola na horizontal
+    'scroll_max_rate_hz': '60',        # Eventos de rolagem por segundo, no máximo (por direção)
+    'scroll_high_resolution': 'true',  # false = só entalhes inteiros (programas que ignoram frações)
+}
+
+
+class ScrollSpec:
+    """Configuração compilada da rolagem (sem estado)."""
+
+    __slots__ = ('curve', 'gain', 'horizontal', 'interval', 'step', 'errors')
+
+    def __init__(self, curve=None, gain=None, horizontal=True, max_rate_hz=60.0, high_resolution=True,
+                 errors=()):
+        if curve is None:
+            curve = ResponseCurve(SHAPE_AXIAL, dead_zone=int(DEFAULT_SCROLL['scroll_dead_zone']))
+        self.curve = curve
+        if gain is None:
+            # Na deflexão máxima, a mesma quantidade por frame (a REFERENCE_FPS) que int(eixo * LEGACY_SCROLL_FACTOR)
+            gain = LEGACY_SCROLL_FACTOR * AXIS_MAX / max(1, AXIS_MAX - curve.dead_zone) * REFERENCE_FPS
+        self.gain = gain # Unidades de roda por unidade de saída da curva, por segundo
+        self.horizontal = horizontal
+        self.interval = 1.0 / max_rate_hz # Segundos mínimos entre dois eventos
+        self.step = 1 if high_resolution else WHEEL_DELTA
+        self.errors = tuple(errors)
+
+
+class ScrollState:
+    """Acumulador de rolagem: guarda a fração ainda não emitida e o último evento de cada direção."""
+
+    __slots__ = ('x', 'y', 'last_emit_x', 'last_emit_y', 'events', 'clock')
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.x = 0.0
+        self.y = 0.0
+        # Cada direção tem o próprio limite de taxa: um evento horizontal não atrasa o vertical
+        self.last_emit_x = float('-inf')
+        self.last_emit_y = float('-inf')
+        self.events = 0 # Eventos de rolagem emitidos (vertical + horizontal)
+
+    def reset(self):
+        self.x = 0.0
+        self.y = 0.0
+
+    def update(self, spec, raw_x, raw_y, output, dt=NOMINAL_TICK_SECONDS):
+        """Acumula `dt` segundos dos eixos X/Y do analógico direito (-1..1) e emite o que couber.
+
+        Retorna True se o analógico estava fora da zona morta.
+        """
+        table = spec.curve.table
+        dy = table[int(raw_y * AXIS_MAX) + AXIAL_OFFSET]
+        dx = table[int(raw_x * AXIS_MAX) + AXIAL_OFFSET] if spec.horizontal else 0.0
+        active = dx != 0.0 or dy != 0.0
+        if active:
+            gain = spec.gain * dt
+            self.y += dy * gain
+            self.x += dx * gain
+        elif not self.x and not self.y:
+            return False
+
+        # Fora do intervalo mínimo de uma direção, ela só continua acumulando
+        now = self.clock()
+        step = spec.step
+        if now - self.last_emit_y >= spec.interval:
+            amount = int(self.y / step) * step
+            if amount:
+                output.scroll(amount)
+                self.y -= amount
+                self.events += 1
+                self.last_emit_y = now
+            if not active:
+                self.y = 0.0 # Analógico solto: a fração que sobrou não vira um evento atrasado
+        if now - self.last_emit_x >= spec.interval:
+            amount = int(self.x / step) * step
+            if amount:
+                output.hscroll(amount)
+                self.x -= amount
+                self.events += 1
+                self.last_emit_x = now
+            if not active:
+                self.x = 0.0
+        return active
+
+
+def compile_scroll(section):
+    """Compila as chaves scroll_* de uma seção do configparser em um ScrollSpec.
+
+    Valores inválidos são trocados pelo padrão e descritos em ScrollSpec.errors.
+    """
+    errors = []
+
+    def read(option, convert, valid=lambda value: True):
+        text = section.get(option, DEFAULT_SCROLL[option])
+        try:
+            value = convert(text)
+            if valid(value):
+                return value
+        except ValueError:
+            pass
+        errors.append(f"Valor inválido em '{option}': '{text}'")
+        return convert(DEFAULT_SCROLL[option])
+
+    def boolean(text):
+        text = text.strip().lower()
+        if text in ('true', 'yes', 'on', '1'):
+            return True
+        if text in ('false', 'no', 'off', '0'):
+            return False
+        raise ValueError(text)
+
+    def choice(text):
+        text = text.strip().lower()
+        if text not in CURVES:
+            raise ValueError(text)
+        return text
+
+    dead_zone = read('scroll_dead_zone', int, lambda v: 0 <= v < AXIS_MAX)
+    speed = read('scroll_speed', float, lambda v: v > 0.0)
+    curve_name = read('scroll_curve', choice)
+    exponent = read('scroll_curve_exponent', float, lambda v: v > 0.0)
+    horizontal = read('scroll_horizontal', boolean)
+    max_rate = read('scroll_max_rate_hz', float, lambda v: v > 0.0)
+    high_resolution = read('scroll_high_resolution', boolean)
+    points = ((0.0, 0.0), (1.0, 1.0))
+    if curve_name == CURVE_CUSTOM:
+        # A curva custom usa os mesmos pontos de stick_curve_points (erros já apontados por compile_curve)
+        try:
+            points = parse_points(section.get('stick_curve_points', DEFAULT_CURVE['stick_curve_points']))
+        except ValueError:
+            points = parse_points(DEFAULT_CURVE['stick_curve_points'])
+    curve = ResponseCurve(SHAPE_AXIAL, curve_name, dead_zone, exponent=exponent, points=points)
+    gain = speed * LEGACY_SCROLL_FACTOR * AXIS_MAX / max(1, AXIS_MAX - dead_zone) * REFERENCE_FPS
+    return ScrollSpec(curve, gain, horizontal, max_rate, high_resolution, errors)
+
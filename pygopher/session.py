@@ -0,0 +1,86 @@
+"""Gravação compacta de sessões do controle.
+
+Formato binário (little-endian):
+    cabeçalho: b'PYGS', versão (uint16), quantidade de eixos (uint16)
+    frame:     timestamp em ns desde o primeiro frame (int64),
+               eixos quantizados para int16 (-32767..32767),
+               máscara de botões (uint32)
+"""
+import struct
+import threading
+
+MAGIC = b'PYGS'
+VERSION = 1
+AXIS_COUNT = 6
+HEADER = struct.Struct('<4sHH')
+FRAME = struct.Struct(f'<q{AXIS_COUNT}hI')
+AXIS_SCALE = 32767
+FLUSH_EVERY = 256 # Frames acumulados em memória antes de escrever no arquivo
+
+
+def axis_to_int16(value):
+    """Quantiza um eixo (-1..1) para int16."""
+    scaled = int(round(value * AXIS_SCALE))
+    return max(-AXIS_SCALE, min(AXIS_SCALE, scaled))
+
+
+def int16_to_axis(value):
+    """Converte um eixo quantizado de volta para o intervalo -1..1."""
+    return value / AXIS_SCALE
+
+
+class SessionRecorder:
+    """Grava os frames lidos do controle em um arquivo de sessão."""
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, AXIS_COUNT))
+        self._buffer = bytearray()
+        self._t0 = None
+        self._lock = threading.Lock() # record() roda no thread do controle, close() no da interface
+
+    def record(self, t_ns, axes, button_mask):
+        """Acrescenta um frame: timestamp (perf_counter_ns), eixos (-1..1) e máscara de botões."""
+        with self._lock:
+            if self._file is None:
+                return
+            if self._t0 is None:
+                self._t0 = t_ns
+            self._buffer += FRAME.pack(t_ns - self._t0, *[axis_to_int16(a) for a in axes[:AXIS_COUNT]],
+                                       button_mask & 0xFFFFFFFF)
+            self.frames += 1
+            if self.frames % FLUSH_EVERY == 0:
+                self._file.write(self._buffer)
+                self._buffer.clear()
+
+    def close(self):
+        """Escreve o que falta e fecha o arquivo."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(self._buffer)
+            self._buffer.clear()
+            self._file.close()
+            self._file = None
+
+
+def read_session(path):
+    """Lê um arquivo de sessão e retorna a lista de frames (t_ns, eixos, máscara de botões)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"Arquivo de sessão inválido: '{path}'")
+    magic, version, axis_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or axis_count != AXIS_COUNT:
+        raise ValueError(f"Arquivo de sessão inválido ou de versão não suportada: '{path}'")
+
+    frames = []
+    body = memoryview(data)[HEADER.size:]
+    usable = len(body) - len(body) % FRAME.size # Ignora um frame final incompleto
+    for values in FRAME.iter_unpack(body[:usable]):
+        t_ns = values[0]
+        axes = [int16_to_axis(v) for v in values[1:1 + AXIS_COUNT]]
+        frames.append((t_ns, axes, values[1 + AXIS_COUNT]))
+    return frames
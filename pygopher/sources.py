@@ -0,0 +1,213 @@
+"""Fontes de entrada: de onde o motor por polling lê o estado de cada controle.
+
+Uma fonte preenche os AXIS_COUNT eixos (-1..1, na convenção do Pygame) e devolve
+(pacote, máscara de botões). O número do pacote só aumenta quando o controle relata
+dados novos, como o dwPacketNumber do XInput; com o pacote repetido e o controle em
+repouso, o motor pula todo o processamento do frame.
+
+    PygameSource    joystick do Pygame (o pacote muda quando alguma leitura muda)
+    XInputSource    XInputGetState direto (Windows), com o dwPacketNumber do driver
+    ScriptedSource  frames pré-definidos ou de uma sessão gravada (testes, sem dispositivo)
+"""
+import ctypes
+
+AXIS_COUNT = 6 # Mesmo valor de engine.AXIS_COUNT
+
+SOURCE_PYGAME = 'pygame'
+SOURCE_XINPUT = 'xinput'
+SOURCES = (SOURCE_PYGAME, SOURCE_XINPUT)
+
+# Chaves do gopher_config.ini e valores padrão
+DEFAULT_SOURCE_SETTINGS = {
+    'input_source': SOURCE_PYGAME, # pygame / xinput (só o motor por polling; vale ao reabrir os controles)
+}
+
+
+class InputSource:
+    """Interface das fontes. poll() retorna (pacote, máscara) ou None se o controle sumiu.
+
+    `axes` é sempre o mesmo buffer do controle: com o pacote repetido, a fonte pode deixá-lo intocado.
+    """
+
+    name = ''
+    guid = ''
+
+    def poll(self, axes):
+        """Preenche `axes` (no lugar) e retorna (pacote, máscara de botões)."""
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Faz o próximo poll() reescrever `axes` mesmo sem dados novos (ex: o buffer foi zerado)."""
+
+    def close(self):
+        pass
+
+
+class PygameSource(InputSource):
+    """Lê um joystick do Pygame; o número do pacote é mantido aqui, comparando as leituras."""
+
+    def __init__(self, joystick, button_count):
+        self.joystick = joystick
+        self.button_count = button_count
+        self.name = joystick.get_name()
+        self.guid = joystick.get_guid() if hasattr(joystick, 'get_guid') else ''
+        self._last = [0.0] * AXIS_COUNT
+        self._result = (0, 0)
+
+    def poll(self, axes):
+        joystick = self.joystick
+        last = self._last
+        changed = False
+        for i in range(AXIS_COUNT):
+            value = joystick.get_axis(i)
+            axes[i] = value
+            if value != last[i]:
+                last[i] = value
+                changed = True
+        mask = 0
+        for i in range(self.button_count):
+            if joystick.get_button(i):
+                mask |= 1 << i
+        if changed or mask != self._result[1]:
+            self._result = (self._result[0] + 1, mask)
+        return self._result
+
+    def close(self):
+        self.joystick.quit()
+
+
+# --- XInput (Windows) ---
+
+ERROR_SUCCESS = 0
+XUSER_MAX_COUNT = 4
+XINPUT_DLLS = ('xinput1_4', 'xinput1_3', 'xinput9_1_0')
+
+# Bit do wButtons -> índice de botão do Pygame/SDL para controles XInput (o D-pad é um hat no Pygame)
+XINPUT_BUTTONS = (
+    (0x1000, 0),  # A
+    (0x2000, 1),  # B
+    (0x4000, 2),  # X
+    (0x8000, 3),  # Y
+    (0x0100, 4),  # LB
+    (0x0200, 5),  # RB
+    (0x0020, 6),  # Back
+    (0x0010, 7),  # Start
+    (0x0040, 8),  # Analógico esquerdo
+    (0x0080, 9),  # Analógico direito
+)
+
+
+class XINPUT_GAMEPAD(ctypes.Structure):
+    _fields_ = [("wButtons", ctypes.c_ushort), ("bLeftTrigger", ctypes.c_ubyte), ("bRightTrigger", ctypes.c_ubyte),
+                ("sThumbLX", ctypes.c_short), ("sThumbLY", ctypes.c_short),
+                ("sThumbRX", ctypes.c_short), ("sThumbRY", ctypes.c_short)]
+
+
+class XINPUT_STATE(ctypes.Structure):
+    _fields_ = [("dwPacketNumber", ctypes.c_uint32), ("Gamepad", XINPUT_GAMEPAD)]
+
+
+def load_xinput():
+    """Retorna a função XInputGetState da primeira DLL disponível. Levanta OSError sem XInput."""
+    loader = getattr(ctypes, 'WinDLL', None)
+    if loader is None:
+        raise OSError("XInput só está disponível no Windows")
+    for name in XINPUT_DLLS:
+        try:
+            return loader(name).XInputGetState
+        except OSError:
+            continue
+    raise OSError("Nenhuma DLL do XInput encontrada")
+
+
+class XInputSource(InputSource):
+    """Lê uma porta do XInput (0 a 3); só converte o estado quando o dwPacketNumber muda."""
+
+    def __init__(self, user_index, get_state=None):
+        self.user_index = user_index
+        self.name = f"XInput #{user_index}"
+        self.guid = f"xinput{user_index}"
+        self._get_state = get_state or load_xinput()
+        self._state = XINPUT_STATE()
+        self._state_ref = ctypes.byref(self._state)
+        self._packet = None
+        self._result = (0, 0)
+
+    def invalidate(self):
+        self._packet = None
+
+    def connected(self):
+        return self._get_state(self.user_index, self._state_ref) == ERROR_SUCCESS
+
+    def poll(self, axes):
+        if self._get_state(self.user_index, self._state_ref) != ERROR_SUCCESS:
+            return None
+        state = self._state
+        if state.dwPacketNumber == self._packet:
+            return self._result # Nada novo: `axes` ainda guarda a última conversão
+        self._packet = state.dwPacketNumber
+        pad = state.Gamepad
+        # Mesma conversão do SDL: Y invertido (~v) e gatilhos de 0..255 para -1..1
+        axes[0] = pad.sThumbLX / 32768
+        axes[1] = ~pad.sThumbLY / 32768
+        axes[2] = pad.sThumbRX / 32768
+        axes[3] = ~pad.sThumbRY / 32768
+        axes[4] = (pad.bLeftTrigger * 257 - 32768) / 32768
+        axes[5] = (pad.bRightTrigger * 257 - 32768) / 32768
+        buttons = pad.wButtons
+        mask = 0
+        for bit, index in XINPUT_BUTTONS:
+            if buttons & bit:
+                mask |= 1 << index
+        self._result = (self._packet, mask)
+        return self._result
+
+
+def connected_xinput_ports(get_state=None):
+    """Portas do XInput com um controle conectado."""
+    get_state = get_state or load_xinput()
+    state = XINPUT_STATE()
+    return [index for index in range(XUSER_MAX_COUNT) if get_state(index, ctypes.byref(state)) == ERROR_SUCCESS]
+
+
+# --- Fonte roteirizada ---
+
+class ScriptedSource(InputSource):
+    """Reproduz uma sequência de (eixos, máscara), um item por poll(); repete o último no fim.
+
+    Como um driver real, o pacote só avança quando o estado muda.
+    """
+
+    def __init__(self, frames, name='Scripted', guid=''):
+        self.frames = list(frames)
+        self.name = name
+        self.guid = guid
+        self.index = 0
+        self._previous = None
+        self._result = (0, 0)
+
+    @classmethod
+    def from_session(cls, path, name='Sessão'):
+        """Fonte a partir de um arquivo .pgs gravado (ver pygopher.session)."""
+        from pygopher.session import read_session
+        return cls(((axes, mask) for _, axes, mask in read_session(path)), name)
+
+    def invalidate(self):
+        self._previous = None
+
+    @property
+    def finished(self):
+        return self.index >= len(self.frames)
+
+    def poll(self, axes):
+        if not self.frames:
+            return self._result
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        if frame != self._previous:
+            self._previous = frame
+            frame_axes, mask = frame
+            for i in range(AXIS_COUNT):
+                axes[i] = frame_axes[i]
+            self._result = (self._result[0] + 1, mask)
+        return self._result
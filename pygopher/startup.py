@@ -0,0 +1,32 @@
+"""Relatório de partida a frio: marca as etapas da inicialização e compara com um orçamento."""
+import time
+
+STARTUP_BUDGET_MS = 1500 # Orçamento total, do início do processo até estar pronto para ler o controle
+
+
+class StartupReport:
+    """Marcos de tempo da inicialização, em milissegundos desde t0."""
+
+    def __init__(self, t0=None, budget_ms=STARTUP_BUDGET_MS):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.budget_ms = budget_ms
+        self.marks = [] # (etapa, ms desde t0)
+
+    def mark(self, stage):
+        """Registra o fim de uma etapa."""
+        self.marks.append((stage, (time.perf_counter() - self.t0) * 1000))
+
+    @property
+    def total_ms(self):
+        return self.marks[-1][1] if self.marks else 0.0
+
+    @property
+    def over_budget(self):
+        return self.total_ms > self.budget_ms
+
+    def format(self):
+        """Resumo de uma linha, ex: 'imports 180 ms, janela 320 ms, controle 410 ms'."""
+        text = ', '.join(f"{stage} {ms:.0f} ms" for stage, ms in self.marks)
+        if self.over_budget:
+            text += f" - ACIMA DO ORÇAMENTO de {self.budget_ms} ms"
+        return text
@@ -0,0 +1,124 @@
+"""Amostras por frame para o visualizador da aba de Status, em um buffer circular sem trava.
+
+Opcional como o perfil de frames: com GopherEngine.telemetry = None (o padrão), o loop
+paga um único `if` por frame. Ligado, o fim de cada frame grava uma amostra do primeiro
+controle (instante, analógico esquerdo bruto e filtrado, duração do frame e máscara de
+botões) em colunas pré-alocadas, sem alocar nada. O loop é o único escritor e nunca
+espera o leitor: a interface copia as últimas amostras quando quiser, no seu próprio
+ritmo, e descarta as que o escritor sobrescreveu durante a cópia.
+
+O buffer é um bloco de bytes (um contador e as colunas): um bytearray com o motor no
+mesmo processo, ou um bloco de multiprocessing.shared_memory com o motor em um processo
+separado (ver pygopher.remote), lido pela interface do mesmo jeito.
+"""
+import struct
+from multiprocessing import shared_memory
+
+CAPACITY = 512 # Amostras guardadas (~3,4 s de frames a 150 FPS)
+
+# Colunas do bloco, na ordem: (nome, código de tipo do memoryview); todas de 8 bytes por amostra
+COLUMNS = (
+    ('times', 'q'),    # Início do frame, ns (perf_counter_ns)
+    ('raw_x', 'd'),    # Analógico esquerdo como lido do controle (-1..1)
+    ('raw_y', 'd'),
+    ('stick_x', 'd'),  # Analógico esquerdo depois dos filtros
+    ('stick_y', 'd'),
+    ('frame_ns', 'q'), # Duração do frame (leitura, processamento e injeção), ns
+    ('buttons', 'Q'),  # Máscara de botões e gatilhos (ControllerState.state_mask)
+)
+_HEADER = struct.Struct('<Q') # Amostras gravadas desde a criação; a posição no buffer é count & mask
+
+
+def ring_size(capacity=CAPACITY):
+    """Tamanho em bytes do bloco de um TelemetryRing com `capacity` amostras."""
+    return _HEADER.size + 8 * capacity * len(COLUMNS)
+
+
+class TelemetryRing:
+    """Buffer circular de amostras por frame, escrito só pelo thread do controle."""
+
+    __slots__ = ('memory', 'owner', 'mask', 'views', 'header', 'count',
+                 'times', 'raw_x', 'raw_y', 'stick_x', 'stick_y', 'frame_ns', 'buttons')
+
+    def __init__(self, capacity=CAPACITY, buffer=None, memory=None, owner=False):
+        if capacity & (capacity - 1):
+            raise ValueError("A capacidade precisa ser uma potência de dois")
+        if buffer is None:
+            buffer = bytearray(ring_size(capacity))
+        self.memory = memory # SharedMemory por trás do buffer, se houver
+        self.owner = owner # Quem criou o bloco compartilhado também o remove (unlink) ao fechar
+        self.mask = capacity - 1
+        base = memoryview(buffer)
+        self.header = base[:_HEADER.size].cast('Q')
+        self.views = [base, self.header]
+        offset = _HEADER.size
+        for name, code in COLUMNS:
+            column = base[offset:offset + 8 * capacity].cast(code)
+            setattr(self, name, column)
+            self.views.append(column)
+            offset += 8 * capacity
+        self.count = self.header[0] # Continua a contagem de um bloco já escrito (ex: processo reiniciado)
+
+    @classmethod
+    def create(cls, capacity=CAPACITY):
+        """Buffer em um bloco de memória compartilhada novo (o motor em outro processo o abre por attach)."""
+        memory = shared_memory.SharedMemory(create=True, size=ring_size(capacity))
+        memory.buf[:_HEADER.size] = bytes(_HEADER.size)
+        return cls(capacity, memory.buf, memory, owner=True)
+
+    @classmethod
+    def attach(cls, name, capacity=CAPACITY):
+        # Como em SharedState.attach: o resource_tracker é o da interface, que remove o bloco no unlink
+        memory = shared_memory.SharedMemory(name=name)
+        return cls(capacity, memory.buf, memory, owner=False)
+
+    @property
+    def name(self):
+        return self.memory.name if self.memory is not None else None
+
+    @property
+    def written(self):
+        """Amostras publicadas até agora (lido do bloco: vale também para o escritor em outro processo)."""
+        return self.header[0]
+
+    def record(self, t_ns, raw, filtered, frame_ns, buttons):
+        """Grava a amostra de um frame. raw e filtered são os eixos do controle (só os dois primeiros são lidos)."""
+        i = self.count & self.mask
+        self.times[i] = t_ns
+        self.raw_x[i] = raw[0]
+        self.raw_y[i] = raw[1]
+        self.stick_x[i] = filtered[0]
+        self.stick_y[i] = filtered[1]
+        self.frame_ns[i] = frame_ns
+        self.buttons[i] = buttons
+        self.count += 1
+        self.header[0] = self.count # Publica só depois da amostra completa
+
+    def samples(self, limit=CAPACITY):
+        """Cópia das últimas `limit` amostras, da mais antiga à mais nova: [(início, raw_x, raw_y, x, y, frame_ns, botões)].
+
+        Pode ser chamado de outro thread ou processo. As amostras que o escritor sobrescreveu
+        durante a cópia são descartadas, então a lista pode vir com menos de `limit` itens
+        (com o buffer cheio, `limit` = capacidade nunca inclui a mais antiga).
+        """
+        mask = self.mask
+        count = self.header[0]
+        first = max(0, count - min(limit, mask + 1))
+        indexes = [i & mask for i in range(first, count)]
+        times, raw_x, raw_y = self.times, self.raw_x, self.raw_y
+        stick_x, stick_y, frame_ns, buttons = self.stick_x, self.stick_y, self.frame_ns, self.buttons
+        copied = [(times[i], raw_x[i], raw_y[i], stick_x[i], stick_y[i], frame_ns[i], buttons[i]) for i in indexes]
+        # Posições reescritas enquanto a cópia era feita, mais a que o escritor pode estar gravando agora
+        overwritten = self.header[0] + 1 - (mask + 1) - first
+        return copied[overwritten:] if overwritten > 0 else copied
+
+    def close(self):
+        for view in reversed(self.views):
+            view.release() # O bloco compartilhado só fecha sem memoryviews abertos
+        self.views = []
+        if self.memory is not None:
+            self.memory.close()
+            if self.owner:
+                self.memory.unlink()
+            self.memory = None
+
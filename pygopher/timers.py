@@ -0,0 +1,152 @@
+"""Roda de temporizadores (hashed timer wheel) movida pelo tick do motor.
+
+Ações com tempo (toque/segurar, janela de acorde, turbo e repetição de tecla) não usam
+threads nem sleeps: cada uma é um Timer em uma roda de WHEEL_SLOTS posições de
+TICK_SECONDS. Timers mais distantes que uma volta esperam em um balde por volta e só
+entram na roda quando ela chega à volta deles, então cada posição visitada contém
+apenas os timers daquele tick. Agendar e cancelar custam O(1), e advance() custa O(1)
+por tick decorrido mais os timers que disparam, com quantos timers pendentes houver.
+
+Um timer nunca dispara antes do prazo; o atraso máximo é um tick mais o intervalo
+entre duas chamadas de advance() (um frame do motor).
+"""
+import math
+import time
+
+TICK_SECONDS = 0.002 # Resolução da roda
+WHEEL_BITS = 9
+WHEEL_SLOTS = 1 << WHEEL_BITS # Posições da roda; uma volta = WHEEL_SLOTS * TICK_SECONDS (~1 s)
+
+
+class Timer:
+    """Timer agendado em uma TimerWheel. cancel() é O(1): a posição o descarta ao ser visitada."""
+
+    __slots__ = ('deadline', 'tick', 'interval', 'callback', 'args', 'wheel')
+
+    def __init__(self, wheel, deadline, interval, callback, args):
+        self.wheel = wheel
+        self.deadline = deadline # Segundos, no relógio da roda
+        self.tick = 0
+        self.interval = interval # Período dos timers repetitivos (None = dispara uma vez)
+        self.callback = callback # None depois de cancelado ou disparado
+        self.args = args
+
+    @property
+    def active(self):
+        return self.callback is not None
+
+    def cancel(self):
+        if self.callback is not None:
+            self.callback = None
+            self.wheel.pending -= 1
+            self.wheel.cancelled += 1
+
+
+class TimerWheel:
+    """Roda de timers com relógio injetável (um relógio falso torna o disparo determinístico)."""
+
+    def __init__(self, tick=TICK_SECONDS, clock=time.perf_counter):
+        self.tick = tick
+        self.clock = clock
+        self.slots = [[] for _ in range(WHEEL_SLOTS)]
+        self.overflow = {} # Volta da roda -> timers daquela volta, ainda fora das posições
+        self.current = int(clock() / tick) # Último tick processado
+        self.pending = 0 # Timers ativos
+        self.fired = 0 # Disparos desde a criação
+        self.cancelled = 0 # Cancelamentos desde a última limpeza (entradas mortas nas posições)
+
+    def schedule(self, delay, callback, *args, interval=None):
+        """Chama callback(*args) daqui a `delay` segundos e depois a cada `interval`, se dado.
+
+        Os disparos repetitivos seguem os prazos (deadline += interval), sem acumular atrasos.
+        """
+        timer = Timer(self, self.clock() + delay, interval, callback, args)
+        self.pending += 1
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer):
+        tick = math.ceil(timer.deadline / self.tick)
+        if tick <= self.current:
+            tick = self.current + 1
+        timer.tick = tick
+        if tick - self.current <= WHEEL_SLOTS:
+            self.slots[tick & (WHEEL_SLOTS - 1)].append(timer)
+        else:
+            self.overflow.setdefault(tick >> WHEEL_BITS, []).append(timer)
+
+    def advance(self, now=None):
+        """Dispara os timers vencidos até `now` (padrão: o relógio). Retorna quantos dispararam."""
+        if now is None:
+            now = self.clock()
+        target = int(now / self.tick)
+        current = self.current
+        if target <= current:
+            return 0
+        if not self.pending:
+            if self.cancelled:
+                self._clear() # Só sobraram timers cancelados
+            self.current = target
+            return 0
+        if target - current > WHEEL_SLOTS:
+            return self._catch_up(target) # Ex: o sistema ficou suspenso
+
+        slots = self.slots
+        overflow = self.overflow
+        fired = 0
+        while current < target:
+            current += 1
+            self.current = current # Timers agendados pelos callbacks caem depois deste tick
+            index = current & (WHEEL_SLOTS - 1)
+            if not index and overflow:
+                # Começo de uma volta: os timers dela entram nas posições
+                for timer in overflow.pop(current >> WHEEL_BITS, ()):
+                    if timer.callback is not None:
+                        slots[timer.tick & (WHEEL_SLOTS - 1)].append(timer)
+            slot = slots[index]
+            if not slot:
+                continue
+            slots[index] = []
+            for timer in slot:
+                fired += self._fire(timer)
+        self.fired += fired
+        return fired
+
+    def _fire(self, timer):
+        callback = timer.callback
+        if callback is None:
+            return 0 # Cancelado
+        if timer.interval:
+            timer.deadline += timer.interval
+            self._insert(timer)
+        else:
+            timer.callback = None
+            self.pending -= 1
+        callback(*timer.args)
+        return 1
+
+    def _catch_up(self, target):
+        """Salto maior que uma volta: dispara em ordem de prazo tudo o que venceu e reagenda o resto."""
+        timers = [timer for slot in self.slots for timer in slot if timer.callback is not None]
+        timers += [timer for bucket in self.overflow.values() for timer in bucket if timer.callback is not None]
+        self._clear()
+        self.current = target
+        fired = 0
+        for timer in sorted(timers, key=lambda timer: timer.deadline):
+            if timer.tick > target:
+                self._insert(timer)
+                continue
+            if timer.interval:
+                # Um único disparo pelo período perdido; o próximo prazo fica no futuro
+                missed = max(1, math.ceil((target * self.tick - timer.deadline) / timer.interval))
+                timer.deadline += (missed - 1) * timer.interval
+            fired += self._fire(timer)
+        self.fired += fired
+        return fired
+
+    def _clear(self):
+        for slot in self.slots:
+            slot.clear()
+        self.overflow.clear()
+        self.cancelled = 0
+
@@ -0,0 +1,108 @@
+"""Perfil de frames por estágio, exportado no formato trace_event do Chrome.
+
+Opcional: com GopherEngine.tracer = None (o padrão), cada estágio do loop custa um único
+`if`. Ligado, cada estágio fecha um span (início, duração, controle) em um buffer
+circular pré-alocado, sem alocar nada por frame; os últimos CAPACITY spans podem ser
+gravados a qualquer momento como JSON para o chrome://tracing ou o Perfetto
+(ui.perfetto.dev). Os spans de um frame são contíguos: cada mark() fecha o estágio
+que começou no mark() anterior.
+"""
+import json
+import os
+import time
+from array import array
+
+# Estágios (índices em SPAN_NAMES)
+SPAN_FRAME = 0    # Frame inteiro (sem contar o sono)
+SPAN_PUMP = 1     # Eventos do Pygame (hotplug, ou a fila inteira no motor por eventos)
+SPAN_READ = 2     # Leitura dos controles (e gravação da sessão, se ligada)
+SPAN_FILTER = 3   # Filtros do analógico
+SPAN_MOTION = 4   # Curva de resposta e conta do movimento
+SPAN_CURSOR = 5   # Cursor virtual e chamadas ao sistema para mover o cursor
+SPAN_SCROLL = 6   # Rolagem
+SPAN_BUTTONS = 7  # Bordas e despacho de botões e gatilhos
+SPAN_TIMERS = 8   # Roda de timers (toque/segurar, turbo...)
+SPAN_INJECT = 9   # Entrega do lote de saída (SendInput / pyautogui)
+SPAN_NAMES = ('frame', 'pump', 'read', 'filter', 'motion', 'cursor', 'scroll', 'buttons', 'timers', 'inject')
+
+CAPACITY = 1 << 16 # Spans guardados (~6 s de frames a 150 FPS com um controle)
+NO_DEVICE = -(1 << 63) # Span sem controle (os ids de fontes sem Pygame já são negativos)
+
+
+class FrameTracer:
+    """Buffer circular de spans do loop do controle, escrito só pelo thread do controle."""
+
+    __slots__ = ('mask', 'stages', 'starts', 'durations', 'devices', 'count', 'last', 'frame_start', 'clock')
+
+    def __init__(self, capacity=CAPACITY, clock=time.perf_counter_ns):
+        if capacity & (capacity - 1):
+            raise ValueError("A capacidade precisa ser uma potência de dois")
+        self.mask = capacity - 1
+        self.stages = array('B', bytes(capacity))
+        self.starts = array('q', bytes(8 * capacity))    # ns (perf_counter_ns)
+        self.durations = array('q', bytes(8 * capacity)) # ns
+        self.devices = array('q', bytes(8 * capacity))   # instance_id do controle, ou NO_DEVICE
+        self.count = 0 # Spans gravados desde a criação; a posição no buffer é count & mask
+        self.clock = clock
+        self.last = self.frame_start = clock()
+
+    def begin(self):
+        """Início de um frame: o próximo mark() fecha o primeiro estágio."""
+        self.last = self.frame_start = self.clock()
+
+    def mark(self, stage, device=None):
+        """Fecha o estágio que começou no último begin()/mark()."""
+        now = self.clock()
+        i = self.count & self.mask
+        self.stages[i] = stage
+        self.starts[i] = self.last
+        self.durations[i] = now - self.last
+        self.devices[i] = NO_DEVICE if device is None else device
+        self.count += 1
+        self.last = now
+
+    def end(self):
+        """Fim do frame: grava o span do frame inteiro (até o último mark)."""
+        i = self.count & self.mask
+        self.stages[i] = SPAN_FRAME
+        self.starts[i] = self.frame_start
+        self.durations[i] = self.last - self.frame_start
+        self.devices[i] = NO_DEVICE
+        self.count += 1
+
+    def spans(self):
+        """Cópia dos spans guardados, do mais antigo ao mais novo: [(estágio, início, duração, controle)].
+
+        Pode ser chamado de outro thread; um span sendo escrito durante a cópia pode sair incompleto.
+        """
+        count = self.count
+        capacity = self.mask + 1
+        stages, starts, durations, devices = self.stages[:], self.starts[:], self.durations[:], self.devices[:]
+        first = max(0, count - capacity)
+        return [(stages[i & self.mask], starts[i & self.mask], durations[i & self.mask], devices[i & self.mask])
+                for i in range(first, count)]
+
+    def trace_events(self):
+        """Lista de eventos no formato trace_event ("X" = evento completo, tempos em µs)."""
+        spans = self.spans()
+        origin = min((start for _, start, _, _ in spans), default=0)
+        events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'PYGopher'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'loop do controle'}},
+        ]
+        for stage, start, duration, device in spans:
+            event = {'name': SPAN_NAMES[stage], 'cat': 'frame' if stage == SPAN_FRAME else 'stage', 'ph': 'X',
+                     'ts': (start - origin) / 1000, 'dur': duration / 1000, 'pid': 1, 'tid': 1}
+            if device != NO_DEVICE:
+                event['args'] = {'controle': device}
+            events.append(event)
+        return events
+
+    def dump(self, path):
+        """Grava os spans guardados em `path` (JSON do Chrome) de forma atômica. Retorna quantos foram gravados."""
+        events = self.trace_events()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, f)
+        os.replace(temp_path, path)
+        return len(events) - 2 # Sem os dois eventos de metadados
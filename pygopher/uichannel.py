@@ -0,0 +1,59 @@
+"""Canal de atualizações do thread do controle para a interface.
+
+O Tkinter não é thread-safe, então o thread do controle nunca toca na interface:
+ele só publica mensagens aqui, e a interface as consome em um timer do ``root.after``.
+Publicar nunca espera pela interface. Há dois tipos de mensagem:
+
+    estado  (post)        só o último valor de cada tipo importa; repetições antes do
+                          próximo consumo são fundidas (ex: a velocidade atual)
+    evento  (post_event)  cada ocorrência conta (ex: alternar a janela); ficam em uma
+                          fila limitada que descarta as mais antigas se a interface não consumir
+"""
+import threading
+from collections import deque
+
+EVENT_QUEUE_LIMIT = 64 # Eventos guardados no máximo entre dois consumos
+
+
+class UpdateChannel:
+    """Canal limitado e não bloqueante, com fusão de atualizações de estado."""
+
+    def __init__(self, event_limit=EVENT_QUEUE_LIMIT):
+        self._latest = {} # Tipo -> último valor publicado (ordem de chegada preservada)
+        self._events = deque(maxlen=event_limit)
+        # Seções críticas de poucas instruções (troca de referências); nunca há I/O ou Tk com a trava
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.coalesced = 0 # Atualizações de estado substituídas antes de serem consumidas
+        self.dropped = 0 # Eventos descartados com a fila cheia
+
+    def post(self, kind, value=None):
+        """Publica o estado atual de `kind`; substitui um valor ainda não consumido."""
+        with self._lock:
+            latest = self._latest
+            if kind in latest:
+                self.coalesced += 1
+                del latest[kind] # Reinsere no fim: a ordem reflete a atualização mais recente
+            latest[kind] = value
+            self.posted += 1
+
+    def post_event(self, kind, value=None):
+        """Publica um evento que deve ser entregue uma vez por ocorrência."""
+        with self._lock:
+            events = self._events
+            if len(events) == events.maxlen:
+                self.dropped += 1
+            events.append((kind, value))
+            self.posted += 1
+
+    def drain(self):
+        """Retorna e esvazia as mensagens pendentes: lista de (tipo, valor), eventos primeiro."""
+        with self._lock:
+            if not self._latest and not self._events:
+                return []
+            latest = self._latest
+            self._latest = {}
+            events = list(self._events)
+            self._events.clear()
+        events.extend(latest.items())
+        return events
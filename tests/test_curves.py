@@ -0,0 +1,88 @@
+"""Testes das curvas de resposta compiladas (pygopher.curves)."""
+import configparser
+
+import pytest
+
+from pygopher.curves import (AXIAL_OFFSET, AXIS_MAX, CURVE_CUSTOM, CURVE_EXPONENTIAL, RADIAL_SHIFT, RADIAL_SIZE,
+                             SHAPE_AXIAL, ResponseCurve, compile_curve, parse_points)
+
+DEAD_ZONE = 4000
+
+
+def _radial_output(curve):
+    """Comprimento de saída no centro de cada bucket da tabela radial."""
+    half_bucket = 1 << (RADIAL_SHIFT - 1)
+    lengths = [((index << RADIAL_SHIFT) + half_bucket) ** 0.5 for index in range(RADIAL_SIZE)]
+    return [curve.table[index] * length for index, length in enumerate(lengths)]
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'curve': CURVE_EXPONENTIAL, 'exponent': 2.5},
+    {'curve': CURVE_CUSTOM, 'points': ((0.0, 0.0), (0.5, 0.2), (1.0, 1.0))},
+    {'anti_dead_zone': 0.2, 'outer_dead_zone': 3000},
+])
+def test_radial_table_is_monotonic(options):
+    output = _radial_output(ResponseCurve(dead_zone=DEAD_ZONE, **options))
+    # Tolerância só para o arredondamento de escala × comprimento no trecho saturado
+    assert all(b >= a - 1e-6 for a, b in zip(output, output[1:]))
+    assert output[0] == 0.0
+
+
+@pytest.mark.parametrize('options', [{}, {'curve': CURVE_EXPONENTIAL}, {'anti_dead_zone': 0.3}])
+def test_axial_table_is_monotonic_and_odd(options):
+    curve = ResponseCurve(shape=SHAPE_AXIAL, dead_zone=DEAD_ZONE, **options)
+    table = curve.table
+    values = [table[AXIAL_OFFSET + v] for v in range(-AXIS_MAX, AXIS_MAX + 1)]
+    assert all(b >= a for a, b in zip(values, values[1:]))
+    assert all(table[AXIAL_OFFSET + v] == -table[AXIAL_OFFSET - v] for v in range(0, AXIS_MAX + 1, 97))
+
+
+def test_endpoints():
+    curve = ResponseCurve(dead_zone=DEAD_ZONE)
+    span = AXIS_MAX - DEAD_ZONE
+    assert curve.deltas(0, 0) == (0.0, 0.0)
+    assert not curve.active(DEAD_ZONE - 100, 0)
+    assert curve.active(DEAD_ZONE + 200, 0)
+    dx, dy = curve.deltas(AXIS_MAX, 0)
+    assert dx == pytest.approx(span, rel=1e-3) # Deflexão total = faixa útil inteira
+    assert dy == 0.0
+
+
+def test_linear_matches_old_formula():
+    curve = ResponseCurve(dead_zone=DEAD_ZONE)
+    for ix, iy in ((5000, 0), (-12000, 7000), (20000, -20000), (AXIS_MAX, AXIS_MAX)):
+        length = (ix * ix + iy * iy) ** 0.5
+        dx, dy = curve.deltas(ix, iy)
+        assert dx == pytest.approx(ix * (length - DEAD_ZONE) / length, rel=1e-2)
+        assert dy == pytest.approx(iy * (length - DEAD_ZONE) / length, rel=1e-2)
+
+
+def test_anti_dead_zone_and_outer_dead_zone():
+    curve = ResponseCurve(shape=SHAPE_AXIAL, dead_zone=DEAD_ZONE, outer_dead_zone=2767, anti_dead_zone=0.25)
+    span = AXIS_MAX - DEAD_ZONE - 2767
+    assert curve.deltas(DEAD_ZONE, 0)[0] == 0.0
+    assert curve.deltas(DEAD_ZONE + 1, 0)[0] == pytest.approx(0.25 * span, rel=1e-3)
+    # Na zona externa a saída já é a máxima
+    assert curve.deltas(AXIS_MAX - 2767, 0)[0] == pytest.approx(span)
+    assert curve.deltas(AXIS_MAX, 0)[0] == pytest.approx(span)
+
+
+def test_same_parameters_share_the_table():
+    assert ResponseCurve(dead_zone=1234).table is ResponseCurve(dead_zone=1234).table
+
+
+def test_parse_points():
+    assert parse_points('1:1, 0:0, 0.5:0.25') == ((0.0, 0.0), (0.5, 0.25), (1.0, 1.0))
+    for text in ('0:0', '0:0, 0.5', '0.1:0, 1:1', '0:0, 0.9:1'):
+        with pytest.raises(ValueError):
+            parse_points(text)
+
+
+def test_compile_curve_replaces_invalid_values():
+    config = configparser.ConfigParser()
+    config['DEFAULT'] = {'stick_dead_zone': '-5', 'stick_curve': 'Exponential', 'stick_curve_exponent': '3'}
+    curve = compile_curve(config['DEFAULT'])
+    assert curve.dead_zone == 4000
+    assert curve.curve == CURVE_EXPONENTIAL
+    assert curve.errors == ("Valor inválido em 'stick_dead_zone': '-5'",)
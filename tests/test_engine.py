@@ -0,0 +1,124 @@
+"""Testes do GopherEngine.poll_frame com um relógio falso: o movimento não depende da taxa de frames."""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from pygopher.devices import DeviceManager
+from pygopher.engine import GopherEngine, FPS, IDLE_FPS, IDLE_AFTER_SECONDS
+from pygopher.motion import MAX_TICK_SECONDS, FakeCursorBackend, VirtualCursor
+from pygopher.output import EV_SCROLL, RecordingSink
+from pygopher.scheduler import FrameScheduler
+from pygopher.scroll import ScrollState
+from pygopher.sources import ScriptedSource
+from pygopher.timers import TimerWheel
+
+SECONDS = 2.0
+AXES = (0.6, -0.3, 0.0, 0.5, -1.0, -1.0) # Analógico esquerdo inclinado, direito rolando
+RATES = (20, 60, 150, 250, 1000)
+
+
+def _hold_sticks(fps, jitter=0.0, pause=0.0, seed=1):
+    """Segura os analógicos por SECONDS a `fps`; retorna (deslocamento x, y, unidades de roda).
+
+    jitter sorteia cada intervalo em período × (1 ± jitter); pause para o loop por `pause` segundos no meio.
+    """
+    rng = random.Random(seed)
+    sink = RecordingSink()
+    backend = FakeCursorBackend()
+    engine = GopherEngine(sink, VirtualCursor(backend))
+    now = [0] # Relógio falso (ns)
+    engine.clock = lambda: now[0]
+    engine.timers = TimerWheel(clock=lambda: now[0] / 1e9)
+    engine.scroll_state = ScrollState(clock=lambda: now[0] / 1e9)
+    devices = DeviceManager(None, backend)
+    devices.add_source(ScriptedSource([(AXES, 0)]))
+    engine.prepare(devices)
+    scheduler = FrameScheduler(FPS, IDLE_FPS, IDLE_AFTER_SECONDS, clock=engine.clock)
+    end = int((SECONDS + pause) * 1e9)
+    t = 0.0
+    paused = False
+    while True:
+        now[0] = min(int(t * 1e9), end)
+        engine.poll_frame(devices, scheduler)
+        if now[0] >= end:
+            break
+        t += (1 + jitter * rng.uniform(-1.0, 1.0)) / fps
+        if pause and not paused and t >= SECONDS / 2:
+            t += pause
+            paused = True
+    scrolled = sum(amount for batch in sink.batches for kind, amount in batch if kind == EV_SCROLL)
+    return backend.x, backend.y, scrolled + engine.scroll_state.y
+
+
+@pytest.mark.parametrize('jitter', [0.0, 0.5])
+def test_displacement_and_scroll_do_not_depend_on_the_tick_rate(jitter):
+    reference = _hold_sticks(FPS)
+    assert reference[0] > 0 and reference[1] < 0 and reference[2] != 0
+    for fps in RATES:
+        x, y, wheel = _hold_sticks(fps, jitter)
+        assert x == pytest.approx(reference[0], abs=1), fps
+        assert y == pytest.approx(reference[1], abs=1), fps
+        assert wheel == pytest.approx(reference[2], abs=1), fps
+
+
+def test_a_stalled_loop_moves_at_most_one_long_tick():
+    reference = _hold_sticks(FPS)
+    x, y, _ = _hold_sticks(FPS, pause=3.0)
+    per_second = reference[0] / SECONDS
+    assert reference[0] <= x <= reference[0] + per_second * MAX_TICK_SECONDS + 1
+
+
+class FakeEventQueue:
+    """Fila de eventos do Pygame com capacidade limitada: cheia, o SDL descarta os eventos novos."""
+
+    def __init__(self, capacity, on_pump):
+        self.capacity = capacity
+        self.on_pump = on_pump # Chamado a cada get(), como o pump do SDL
+        self.queue = []
+        self.allowed = None # None = todos os tipos
+
+    def set_blocked(self, types):
+        assert types is None
+        self.allowed = set()
+
+    def set_allowed(self, types):
+        self.allowed = None if types is None else self.allowed | set(types)
+
+    def post(self, kind, **attributes):
+        if self.allowed is not None and kind not in self.allowed:
+            return
+        if len(self.queue) < self.capacity:
+            self.queue.append(SimpleNamespace(type=kind, **attributes))
+
+    def get(self, types):
+        self.on_pump()
+        taken = [event for event in self.queue if event.type in types]
+        self.queue = [event for event in self.queue if event.type not in types]
+        return taken
+
+
+def test_polling_loop_still_sees_hotplug_after_the_queue_would_fill():
+    pygame = SimpleNamespace(JOYDEVICEADDED=1, JOYDEVICEREMOVED=2, JOYAXISMOTION=3, JOYBUTTONDOWN=4,
+                             JOYBUTTONUP=5, JOYHATMOTION=6, WINDOWEVENT=7)
+    engine = GopherEngine(RecordingSink(), VirtualCursor(FakeCursorBackend()))
+    frames = [0]
+
+    def pump():
+        # Um controle mexido e a janela geram eventos que o motor por polling não consome
+        for _ in range(10):
+            pygame.event.post(pygame.JOYAXISMOTION)
+        pygame.event.post(pygame.WINDOWEVENT)
+        frames[0] += 1
+        if frames[0] == 20:
+            pygame.event.post(pygame.JOYDEVICEADDED, device_index=0)
+        if frames[0] == 25:
+            engine.running = False
+
+    pygame.event = FakeEventQueue(100, pump)
+    hotplug = []
+    engine.handle_device_event = hotplug.append
+    engine.running = True
+    engine.run(DeviceManager(pygame, FakeCursorBackend()))
+    assert [event.type for event in hotplug] == [pygame.JOYDEVICEADDED]
+    assert pygame.event.queue == []
@@ -0,0 +1,93 @@
+"""Testes dos filtros do analógico (pygopher.filters): respostas a degrau e compilação."""
+import configparser
+import math
+
+import pytest
+
+from pygopher.filters import (DEFAULT_FILTERS, STAGE_EMA, STAGE_JITTER, STAGE_ONE_EURO, EMAStage, FilterSpec,
+                              JitterStage, OneEuroStage, compile_filters)
+
+DT = 1 / 150
+
+
+def _step(stage, frames, before=10, level=0.8):
+    """Entrada em 0 por `before` frames e depois em `level`; retorna a saída X de cada frame após o degrau."""
+    axes = [0.0] * 6
+    t = 0.0
+    for _ in range(before):
+        axes[0] = axes[1] = 0.0
+        stage.apply(axes, t)
+        t += DT
+    output = []
+    for _ in range(frames):
+        axes[0], axes[1] = level, -level
+        stage.apply(axes, t)
+        output.append(axes[0])
+        assert axes[1] == pytest.approx(-axes[0]) # Os dois eixos passam pela mesma resposta
+        t += DT
+    return output
+
+
+def test_ema_step_response_follows_time_constant():
+    output = _step(EMAStage(20), 150)
+    assert all(b >= a for a, b in zip(output, output[1:]))
+    assert output[0] < 0.8
+    # Depois de uma constante de tempo (3 frames de 1/150 s ≈ 20 ms): 1 - 1/e do degrau
+    assert output[2] == pytest.approx(0.8 * (1 - math.exp(-3 * DT / 0.02)))
+    assert output[-1] == pytest.approx(0.8)
+
+
+def test_one_euro_step_response_converges_without_overshoot():
+    output = _step(OneEuroStage(1.0, 0.5, 1.0), 300)
+    assert 0.0 < output[0] < 0.8
+    assert all(value <= 0.8 + 1e-12 for value in output)
+    assert output[-1] == pytest.approx(0.8, abs=1e-3)
+
+
+def test_one_euro_reacts_faster_with_higher_beta():
+    slow = _step(OneEuroStage(1.0, 0.0, 1.0), 10)
+    fast = _step(OneEuroStage(1.0, 5.0, 1.0), 10)
+    assert fast[5] > slow[5]
+
+
+def test_jitter_holds_small_changes_and_trails_large_ones():
+    stage = JitterStage(0.05)
+    axes = [0.5, 0.0, 0, 0, 0, 0]
+    stage.apply(axes, 0.0)
+    axes[0] = 0.54
+    stage.apply(axes, DT)
+    assert axes[0] == 0.5 # Dentro do limiar: a saída não muda
+    output = _step(JitterStage(0.05), 3, level=0.5)
+    assert output[0] == pytest.approx(0.5 - 0.05 / math.sqrt(2)) # Fica a `threshold` de distância (radial)
+
+
+def test_reset_forgets_state():
+    stage = EMAStage(20)
+    _step(stage, 5)
+    stage.reset()
+    axes = [0.3, 0.3, 0, 0, 0, 0]
+    stage.apply(axes, 10.0)
+    assert tuple(stage.state[:2]) == (0.3, 0.3)
+
+
+def test_pipeline_only_touches_left_stick():
+    spec = FilterSpec((STAGE_JITTER, STAGE_ONE_EURO, STAGE_EMA), {
+        key: float(value) for key, value in DEFAULT_FILTERS.items() if key != 'stick_filters'})
+    pipeline = spec.create()
+    assert [type(stage) for stage in pipeline.stages] == [JitterStage, OneEuroStage, EMAStage]
+    axes = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+    pipeline.apply(axes, 0.0)
+    pipeline.apply(axes, DT)
+    assert axes[2:] == [0.3, 0.4, 0.5, 0.6]
+    assert FilterSpec().create() is None
+
+
+def test_compile_filters_reports_invalid_values():
+    config = configparser.ConfigParser()
+    config['DEFAULT'] = {'stick_filters': 'Jitter, median, ema', 'filter_ema_time_ms': '0',
+                         'filter_jitter_threshold': '0.5'}
+    spec = compile_filters(config['DEFAULT'])
+    assert spec.stages == (STAGE_JITTER, STAGE_EMA)
+    assert spec.params['filter_ema_time_ms'] == 20.0
+    assert spec.params['filter_jitter_threshold'] == 0.01
+    assert len(spec.errors) == 3
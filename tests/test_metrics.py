@@ -0,0 +1,86 @@
+"""Testes dos histogramas de latência (pygopher.metrics)."""
+import random
+
+from pygopher.metrics import (BUCKET_COUNT, MAX_TRACKABLE, STAGE_FRAME, STAGE_INPUT_TO_INJECT, STAGES,
+                              SUB_BUCKETS, FrameMetrics, LatencyHistogram, bucket_index, bucket_lower_bound)
+
+MAX_RELATIVE_ERROR = 1.0 / SUB_BUCKETS # Largura relativa máxima de um bucket
+
+
+def test_bucket_bounds_contain_the_value():
+    for value in list(range(0, 300)) + [1000, 4095, 4096, 123456, 10 ** 9, MAX_TRACKABLE]:
+        index = bucket_index(value)
+        assert 0 <= index < BUCKET_COUNT
+        lower = bucket_lower_bound(index)
+        assert lower <= value
+        assert value - lower <= lower * MAX_RELATIVE_ERROR
+        if index + 1 < BUCKET_COUNT:
+            assert value < bucket_lower_bound(index + 1)
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(100) == 10
+    assert histogram.max_value == 10
+
+
+def test_percentiles_stay_within_bucket_error():
+    rng = random.Random(7)
+    values = sorted(int(rng.lognormvariate(11, 1.2)) for _ in range(20000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    assert histogram.total == len(values)
+    for pct in (1, 25, 50, 90, 99, 99.9, 100):
+        exact = values[max(1, int(len(values) * pct / 100 + 0.5)) - 1]
+        estimate = histogram.percentile(pct)
+        assert estimate <= exact # Limite inferior do bucket
+        assert exact - estimate <= exact * MAX_RELATIVE_ERROR
+    assert histogram.max_value == values[-1]
+
+
+def test_values_above_range_saturate():
+    histogram = LatencyHistogram()
+    histogram.record(MAX_TRACKABLE * 4)
+    assert histogram.counts[bucket_index(MAX_TRACKABLE)] == 1
+    assert histogram.max_value == MAX_TRACKABLE * 4
+    assert histogram.percentile(50) <= MAX_TRACKABLE
+
+
+def test_repeated_values_above_range_saturate():
+    histogram = LatencyHistogram()
+    for _ in range(2):
+        histogram.record(1 << 41) # O segundo não muda max_value e também precisa saturar
+    histogram.record(1 << 42)
+    assert histogram.counts[bucket_index(MAX_TRACKABLE)] == 3
+    assert histogram.max_value == 1 << 42
+
+
+def test_empty_and_reset():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0
+    histogram.record(5000)
+    histogram.reset()
+    assert histogram.total == 0
+    assert histogram.max_value == 0
+
+
+def test_record_frame_splits_stages(tmp_path):
+    metrics = FrameMetrics()
+    metrics.record_frame(1000, 1010, 1030, 1060, 1100, had_output=False)
+    metrics.record_frame(2000, 2010, 2030, 2060, 2100, had_output=True)
+    assert metrics.summary('pump') == (10, 10, 10)
+    assert metrics.summary('read') == (20, 20, 20)
+    assert metrics.summary('compute') == (30, 30, 30)
+    assert metrics.summary('inject') == (40, 40, 40)
+    assert metrics.summary(STAGE_FRAME) == (100, 100, 100)
+    assert metrics.histograms[STAGE_INPUT_TO_INJECT].total == 1
+
+    path = tmp_path / 'metrics.csv'
+    metrics.export(path)
+    lines = path.read_text().splitlines()
+    assert lines[0] == "stage,samples,p50_ns,p99_ns,max_ns"
+    assert lines[1 + STAGES.index(STAGE_FRAME)] == "frame,2,100,100,100"
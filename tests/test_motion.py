@@ -0,0 +1,59 @@
+"""Testes do cursor virtual (pygopher.motion) com um cursor em memória."""
+from pygopher.motion import RESYNC_MOVES, FakeCursorBackend, VirtualCursor
+
+
+def test_subpixel_accumulates_until_a_whole_pixel():
+    backend = FakeCursorBackend(100, 200)
+    cursor = VirtualCursor(backend)
+    for _ in range(3):
+        cursor.move(0.3, 0.0)
+    assert backend.writes == 0 # 0,9 px ainda não completam um pixel
+    cursor.move(0.3, 0.0)
+    assert backend.trajectory == [(101, 200)]
+    assert abs(cursor.x - 101.2) < 1e-9
+
+
+def test_negative_direction_floors_instead_of_truncating():
+    backend = FakeCursorBackend(100, 100)
+    cursor = VirtualCursor(backend)
+    cursor.move(-0.25, -1.5)
+    # floor(-0.25) = -1: o resto 0,75 fica guardado, como no sentido positivo
+    assert backend.trajectory == [(99, 98)]
+    cursor.move(-0.5, 0.0)
+    assert backend.trajectory == [(99, 98)]
+    cursor.move(-0.5, 0.0)
+    assert backend.trajectory == [(99, 98), (98, 98)]
+    assert abs(cursor.x - 98.75) < 1e-9
+
+
+def test_long_motion_sums_exactly():
+    backend = FakeCursorBackend(0, 0)
+    cursor = VirtualCursor(backend)
+    for _ in range(1000):
+        cursor.move(0.375, -0.625) # Frações exatas em binário
+    assert (backend.x, backend.y) == (375, -625)
+
+
+def test_position_is_read_only_occasionally():
+    backend = FakeCursorBackend(50, 50)
+    cursor = VirtualCursor(backend)
+    for _ in range(RESYNC_MOVES):
+        cursor.move(1.0, 0.0)
+    assert backend.reads == 1
+    cursor.move(0.0, 0.0) # Parado: nenhuma chamada
+    assert backend.reads == 1
+    cursor.move(1.0, 0.0)
+    assert backend.reads == 2
+
+
+def test_external_move_is_picked_up_on_resync():
+    backend = FakeCursorBackend(10, 10)
+    cursor = VirtualCursor(backend)
+    cursor.move(1.5, 0.0)
+    backend.nudge(500, 400) # Mouse físico
+    for _ in range(RESYNC_MOVES - 1):
+        cursor.move(0.0, 1.0)
+    cursor.move(0.5, 0.0) # Lê a posição real e completa o pixel com o resto guardado
+    assert cursor.resyncs == 1
+    assert (backend.x, backend.y) == (501, 400 + RESYNC_MOVES - 1)
+    assert cursor.x == backend.x and cursor.y == backend.y
@@ -0,0 +1,60 @@
+"""Testes da gravação em segundo plano do .ini (pygopher.persist)."""
+import configparser
+
+from pygopher.persist import ConfigWriter
+
+
+def _read(path):
+    config = configparser.ConfigParser()
+    config.read(path)
+    return config
+
+
+def _write_ini(path):
+    config = configparser.ConfigParser()
+    config['DEFAULT'] = {'mouse_left': '0x0', 'sensitivity_multiplier': '1.0', 'stick_curve': 'linear'}
+    config['profile:game'] = {'apps': 'game.exe'}
+    with open(path, 'w') as f:
+        config.write(f)
+    return config
+
+
+def test_set_after_load_keeps_the_other_keys(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    config = _write_ini(path)
+    writer = ConfigWriter(path, debounce=0.01)
+    writer.load(config)
+    writer.set('sensitivity_multiplier', 2.5)
+    writer.close()
+    saved = _read(path)
+    assert saved['DEFAULT']['sensitivity_multiplier'] == '2.5'
+    assert saved['DEFAULT']['mouse_left'] == '0x0'
+    assert saved['DEFAULT']['stick_curve'] == 'linear'
+    assert saved['profile:game']['apps'] == 'game.exe'
+    assert writer.writes == 1
+
+
+def test_load_does_not_write(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    writer = ConfigWriter(path, debounce=0.01)
+    writer.load(_write_ini(path))
+    assert not writer.pending
+    writer.close()
+    assert writer.writes == 0 and writer.updates == 0
+
+
+def test_replace_writes_a_snapshot_once(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    config = _write_ini(path)
+    writer = ConfigWriter(path, debounce=3600)
+    writer.replace(config)
+    config['DEFAULT']['stick_curve'] = 'exponential' # Depois do replace: não faz parte da gravação
+    writer.set('mouse_left', '0x1')
+    writer.close() # Grava o pendente ao encerrar, sem esperar o debounce
+    saved = _read(path)
+    assert saved['DEFAULT']['stick_curve'] == 'linear'
+    assert saved['DEFAULT']['mouse_left'] == '0x1'
+    assert writer.writes == 1 and writer.updates == 2
+    with open(path) as f:
+        assert f.read() == writer.last_text
+    assert not (tmp_path / 'gopher_config.ini.tmp').exists()
@@ -0,0 +1,120 @@
+"""Testes dos perfis compilados (pygopher.profiles): troca atômica e cache das tabelas."""
+from pygopher import curves
+from pygopher.config import apply_config, default_config
+from pygopher.engine import GopherEngine
+from pygopher.motion import FakeCursorBackend, VirtualCursor
+from pygopher.output import RecordingSink
+from pygopher.profiles import (CACHE_SUFFIX, AutoSwitcher, FakeForegroundDetector, compile_profile_set,
+                               load_cached_tables, load_profile_set, write_table_cache)
+
+
+def _config():
+    config = default_config()
+    config['profile:game'] = {'stick_curve': 'exponential', 'stick_dead_zone': '6000', 'apps': 'game.exe'}
+    return config
+
+
+def _engine(config):
+    engine = GopherEngine(RecordingSink(), VirtualCursor(FakeCursorBackend()))
+    apply_config(engine, config)
+    return engine
+
+
+def test_activate_profile_publishes_one_reference():
+    engine = _engine(_config())
+    game = engine.profile_set.profiles['game']
+    engine.activate_profile('game')
+    assert engine.profile is game
+    assert engine.profile.curve.dead_zone == 6000
+
+
+def test_frame_keeps_the_profile_it_started_with():
+    engine = _engine(_config())
+    default = engine.profile
+    engine.process_frame([0.0] * 4 + [-1.0, -1.0], 0) # Início de um frame: lê o perfil ativo
+    engine.activate_profile('game') # Troca vinda de outro thread no meio do frame
+    assert engine.frame_profile.profile is default
+    assert engine.bindings_for(engine.device) is default.bindings
+    engine.process_frame([0.0] * 4 + [-1.0, -1.0], 0)
+    assert engine.frame_profile.profile is engine.profile_set.profiles['game']
+
+
+def test_frame_keeps_the_whole_set_it_started_with_across_a_reload():
+    engine = _engine(_config())
+    engine.device.profile_keys = ('pad',)
+    old = engine.active
+    engine.process_frame([0.0] * 4 + [-1.0, -1.0], 0)
+    config = _config()
+    config['DEFAULT']['profile_chord'] = '0x6, 0x7'
+    config['controller:pad'] = {'stick_filters': 'jitter'}
+    engine.set_profiles(compile_profile_set(config)) # Recarga vinda do vigia no meio do frame
+    # Bindings, filtros por controle e acorde continuam os do início do frame
+    assert engine.frame_profile is old
+    assert engine.bindings_for(engine.device) is old.bindings
+    assert engine.frame_profile.chord_mask == 0
+    engine.filter_axes([0.5, 0.5, 0.0, 0.0, -1.0, -1.0], 0.0)
+    assert engine.device.filter_spec is old.filters
+    engine.process_frame([0.0] * 4 + [-1.0, -1.0], 0)
+    frame = engine.frame_profile
+    assert frame is engine.active and frame.chord_mask == 0b11000000
+    assert engine.bindings_for(engine.device) is frame.controller_bindings['pad']
+
+
+def test_table_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    config = _config()
+    profile_set = load_profile_set(path, config)
+    write_table_cache(path, profile_set)
+    with open(path + CACHE_SUFFIX, 'rb') as f:
+        assert f.read(1) == b'{' # Cabeçalho JSON, sem nada executável
+    saved = profile_set.tables()
+    assert len(saved) == 2
+    curves._tables.clear()
+    loaded = load_cached_tables(path)
+    assert loaded == set(saved)
+    for key in loaded:
+        assert curves._tables[key] == saved[key]
+
+
+def test_invalid_cache_is_ignored(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    assert load_cached_tables(path) == set() # Sem cache
+    for content in (b'not json\n', b'{"version": 5}\n', b'[1, 2]\n',
+                    b'{"version": 5, "byteorder": "little", "tables": [[["radial", "linear", 1, 0, 0.0, 2.0, '
+                    b'[[0.0, 0.0], [1.0, 1.0]]], 65533]]}\n' + bytes(64)):
+        with open(path + CACHE_SUFFIX, 'wb') as f:
+            f.write(content)
+        assert load_cached_tables(path) == set()
+
+
+def test_tables_of_edited_profiles_are_dropped(tmp_path):
+    path = str(tmp_path / 'gopher_config.ini')
+    config = _config()
+    engine = _engine(config)
+    old_game = engine.profile_set.profiles['game'].curve.key
+    write_table_cache(path, engine.profile_set)
+    config['profile:game']['stick_dead_zone'] = '7000' # Edição: a curva antiga não é mais usada
+    profile_set = load_profile_set(path, config)
+    engine.set_profiles(profile_set)
+    assert set(curves._tables) == set(profile_set.tables())
+    assert old_game not in curves._tables
+    write_table_cache(path, profile_set)
+    curves._tables.clear()
+    assert load_cached_tables(path) == set(profile_set.tables())
+
+
+def test_auto_switcher_restores_the_manual_profile():
+    engine = _engine(_config())
+    detector = FakeForegroundDetector('game.exe')
+    switcher = AutoSwitcher(engine, detector)
+    assert switcher.poll() == 'game' and switcher.manual_profile == 'default'
+    detector.app = 'editor.exe'
+    assert switcher.poll() == 'default' and engine.profile.name == 'default'
+
+
+def test_auto_switcher_stop_waits_for_the_thread():
+    switcher = AutoSwitcher(_engine(_config()), FakeForegroundDetector('game.exe'), interval=0.001)
+    switcher.start()
+    switcher.stop()
+    # Depois de stop() nenhuma verificação em andamento ainda troca o perfil
+    assert not switcher._thread.is_alive()
@@ -0,0 +1,70 @@
+"""Testes do instantâneo em memória compartilhada (seqlock de pygopher.remote)."""
+import threading
+
+import pytest
+
+from pygopher.remote import SNAPSHOT_FIELDS, SharedState, _SEQUENCE
+
+PUBLISHES = 20000
+
+
+def _values(i):
+    # Todos os campos numéricos valem i: uma leitura rasgada mistura dois valores
+    return (True, False, True) + (i,) * (len(SNAPSHOT_FIELDS) - 3)
+
+
+@pytest.fixture
+def state():
+    state = SharedState.create()
+    yield state
+    state.close()
+
+
+def test_read_before_any_publish_is_none(state):
+    assert state.read() is None
+
+
+def test_publish_read_roundtrip_through_attach(state):
+    reader = SharedState.attach(state.name)
+    try:
+        state.publish(_values(7))
+        snapshot = reader.read()
+        assert snapshot.running and not snapshot.disabled and snapshot.idle
+        assert snapshot.buttons == 7 and snapshot.stick_x == 7.0 and snapshot.sensitivity == 7.0
+        state.publish(_values(8))
+        assert reader.read().rate == 8.0
+    finally:
+        reader.close()
+
+
+def test_read_gives_up_while_a_publish_is_in_progress(state):
+    state.publish(_values(1))
+    _SEQUENCE.pack_into(state.buffer, 0, state.sequence + 1) # Escritor parado no meio
+    assert state.read(retries=5) is None
+
+
+def test_reader_never_sees_a_torn_snapshot_under_a_concurrent_writer(state):
+    reader = SharedState.attach(state.name)
+    done = threading.Event()
+
+    def write():
+        for i in range(1, PUBLISHES + 1):
+            state.publish(_values(i))
+        done.set()
+
+    writer = threading.Thread(target=write)
+    seen = []
+    try:
+        writer.start()
+        while not done.is_set():
+            snapshot = reader.read()
+            if snapshot is not None:
+                assert len(set(snapshot[3:])) == 1, snapshot
+                seen.append(snapshot.buttons)
+        writer.join()
+        assert reader.read().buttons == PUBLISHES
+    finally:
+        done.set()
+        writer.join()
+        reader.close()
+    assert seen == sorted(seen) # Nunca volta para um instantâneo mais antigo
@@ -0,0 +1,71 @@
+"""Testes do replay de sessões (pygopher.replay) sobre o poll_frame do motor."""
+from pygopher.__main__ import main
+from pygopher.config import default_config
+from pygopher.output import EV_MOUSE_DOWN, EV_MOUSE_UP
+from pygopher.replay import START_POSITION, replay
+from pygopher.session import SessionRecorder, read_session
+
+FRAME_NS = 1_000_000_000 // 150
+REST = [0.0, 0.0, 0.0, 0.0, -1.0, -1.0]
+TILTED = [0.6, -0.3, 0.0, 0.0, -1.0, -1.0]
+
+
+def _session():
+    """30 frames parados, 60 com o analógico esquerdo inclinado e o botão 0 apertado no meio."""
+    frames = []
+    for n in range(120):
+        axes = TILTED if 30 <= n < 90 else REST
+        mask = 1 if 50 <= n < 60 else 0
+        frames.append((n * FRAME_NS, list(axes), mask))
+    return frames
+
+
+def _record(path, frames):
+    recorder = SessionRecorder(path)
+    for t_ns, axes, mask in frames:
+        recorder.record(t_ns, axes, mask)
+    recorder.close()
+
+
+def test_replay_clicks_and_moves():
+    result = replay(_session(), default_config())
+    assert result.frames == 120
+    assert [(frame, kind, arg) for frame, _, kind, arg in result.events] == [
+        (50, EV_MOUSE_DOWN, 'left'), (60, EV_MOUSE_UP, 'left')]
+    moving = [frame for frame, _, _, _ in result.trajectory]
+    assert moving and moving[0] >= 30 and moving[-1] < 90
+    _, _, x, y = result.trajectory[-1]
+    assert x > START_POSITION[0] and y < START_POSITION[1]
+
+
+def test_replay_is_deterministic():
+    frames = _session()
+    assert replay(frames, default_config()).lines() == replay(frames, default_config()).lines()
+
+
+def test_replay_of_recorded_file(tmp_path):
+    path = str(tmp_path / 'session.pgs')
+    _record(path, _session())
+    # Os eixos voltam quantizados em int16: o mesmo fluxo de cliques, trajetória quase igual
+    result = replay(read_session(path), default_config())
+    expected = replay(_session(), default_config())
+    assert result.events == expected.events
+    assert abs(result.trajectory[-1][2] - expected.trajectory[-1][2]) <= 1
+
+
+def test_realtime_replay_follows_the_recorded_timestamps():
+    frames = _session()[:30] # 0,2 s de gravação
+    assert replay(frames, default_config(), realtime=True).elapsed >= frames[-1][0] / 1e9
+    assert replay(frames, default_config()).lines() == replay(frames, default_config(), realtime=True).lines()
+
+
+def test_replay_command_line(tmp_path, capsys):
+    path = str(tmp_path / 'session.pgs')
+    output = tmp_path / 'events.txt'
+    _record(path, _session()[:40])
+    # Sem .ini, o replay usa os mapeamentos padrão
+    assert main(['--replay', path, '--realtime', '--output', str(output),
+                 '--config', str(tmp_path / 'missing.ini')]) == 0
+    assert '40 frames' in capsys.readouterr().out
+    lines = output.read_text().splitlines()
+    assert lines == replay(read_session(path), default_config()).lines()
@@ -0,0 +1,90 @@
+"""Testes da rolagem acumulada (pygopher.scroll) com um sink de gravação."""
+import pytest
+
+from pygopher.output import EV_HSCROLL, EV_SCROLL, PyAutoGUISink, RecordingSink
+from pygopher.scroll import WHEEL_DELTA, ScrollSpec, ScrollState
+
+FPS = 150
+
+
+def _run(spec, raw_x, raw_y, frames, fps=FPS):
+    clock = [0.0]
+    state = ScrollState(clock=lambda: clock[0])
+    sink = RecordingSink()
+    for frame in range(frames):
+        clock[0] = frame / fps
+        state.update(spec, raw_x, raw_y, sink, 1 / fps)
+        sink.flush()
+    return state, sink
+
+
+def _amounts(sink, kind):
+    return [amount for event, amount in sink.events if event == kind]
+
+
+def test_fractions_accumulate_and_are_rate_limited():
+    spec = ScrollSpec(max_rate_hz=30)
+    state, sink = _run(spec, 0.0, 0.4, 2 * FPS)
+    vertical = _amounts(sink, EV_SCROLL)
+    assert 0 < len(vertical) <= 2 * 30 + 1
+    expected = spec.curve.table[int(0.4 * 32767) + 32768] * spec.gain * 2 # 2 s de rolagem
+    assert sum(vertical) + state.y == pytest.approx(expected)
+
+
+def test_each_direction_has_its_own_rate_limit():
+    spec = ScrollSpec(max_rate_hz=30)
+    _, both = _run(spec, 0.6, 0.6, FPS)
+    _, vertical_only = _run(spec, 0.0, 0.6, FPS)
+    # A rolagem horizontal não consome a janela da vertical
+    assert len(_amounts(both, EV_SCROLL)) == len(_amounts(vertical_only, EV_SCROLL))
+    assert len(_amounts(both, EV_HSCROLL)) == len(_amounts(both, EV_SCROLL))
+
+
+def test_whole_notches_only_without_high_resolution():
+    _, sink = _run(ScrollSpec(high_resolution=False), 0.0, -1.0, FPS)
+    amounts = _amounts(sink, EV_SCROLL)
+    assert amounts and all(amount % WHEEL_DELTA == 0 and amount < 0 for amount in amounts)
+
+
+def test_release_drops_the_leftover_fraction():
+    spec = ScrollSpec(max_rate_hz=60)
+    clock = [0.0]
+    state = ScrollState(clock=lambda: clock[0])
+    sink = RecordingSink()
+    state.update(spec, 0.3, 0.3, sink, 1 / FPS)
+    sink.flush()
+    emitted = len(sink.events)
+    clock[0] = 1 / FPS # Dentro da janela do evento anterior: a fração ainda espera
+    assert state.update(spec, 0.0, 0.0, sink, 1 / FPS) is False
+    assert state.y != 0.0
+    clock[0] = 1 / 30
+    state.update(spec, 0.0, 0.0, sink, 1 / FPS)
+    sink.flush()
+    assert (state.x, state.y) == (0.0, 0.0)
+    assert len(sink.events) == emitted # Menos de uma unidade: nada de evento atrasado
+
+
+class _FakePyAutoGUI:
+    """Só grava as chamadas de rolagem."""
+
+    def __init__(self):
+        self.calls = []
+
+    def scroll(self, clicks):
+        self.calls.append(('scroll', clicks))
+
+    def hscroll(self, clicks):
+        self.calls.append(('hscroll', clicks))
+
+
+def test_pyautogui_sink_converts_wheel_units_to_clicks():
+    backend = _FakePyAutoGUI()
+    sink = PyAutoGUISink(backend)
+    sink.units_per_click = WHEEL_DELTA
+    for _ in range(5):
+        sink.scroll(50)
+        sink.hscroll(-100)
+        sink.flush()
+    # 250 unidades = 2 entalhes (+ 10 guardadas); -500 = -4 entalhes (-20 guardadas)
+    assert [clicks for kind, clicks in backend.calls if kind == 'scroll'] == [1, 1]
+    assert [clicks for kind, clicks in backend.calls if kind == 'hscroll'] == [-1, -1, -1, -1]
@@ -0,0 +1,108 @@
+"""Testes do buffer circular de telemetria (pygopher.telemetry)."""
+import threading
+
+import pytest
+
+from pygopher.telemetry import TelemetryRing, ring_size
+
+CAPACITY = 8
+
+
+def _record(ring, n):
+    # Todas as colunas derivam de n: uma amostra rasgada mistura dois valores
+    ring.record(n, (n, -n), (2 * n, -2 * n), 3 * n, n)
+
+
+def _check(sample):
+    t, raw_x, raw_y, x, y, frame_ns, buttons = sample
+    assert (raw_x, raw_y, x, y, frame_ns, buttons) == (t, -t, 2 * t, -2 * t, 3 * t, t), sample
+
+
+def test_capacity_must_be_a_power_of_two():
+    with pytest.raises(ValueError):
+        TelemetryRing(12)
+    assert len(TelemetryRing(CAPACITY, bytearray(ring_size(CAPACITY))).times) == CAPACITY
+
+
+def test_samples_before_the_ring_fills():
+    ring = TelemetryRing(CAPACITY)
+    assert ring.samples() == []
+    for n in range(5):
+        _record(ring, n)
+    samples = ring.samples()
+    assert ring.written == 5
+    assert [sample[0] for sample in samples] == [0, 1, 2, 3, 4]
+    for sample in samples:
+        _check(sample)
+    assert [sample[0] for sample in ring.samples(2)] == [3, 4]
+
+
+def test_wraparound_keeps_the_newest_samples_oldest_first():
+    ring = TelemetryRing(CAPACITY)
+    for n in range(3 * CAPACITY + 3):
+        _record(ring, n)
+    assert ring.written == 3 * CAPACITY + 3
+    samples = ring.samples(CAPACITY - 1)
+    assert [sample[0] for sample in samples] == list(range(2 * CAPACITY + 4, 3 * CAPACITY + 3))
+    for sample in samples:
+        _check(sample)
+    assert [sample[0] for sample in ring.samples(3)] == [24, 25, 26]
+
+
+def test_a_full_read_skips_the_slot_the_writer_reuses_next():
+    ring = TelemetryRing(CAPACITY)
+    for n in range(2 * CAPACITY):
+        _record(ring, n)
+    # A amostra mais antiga é a próxima a ser sobrescrita: sem trava, ela não é confiável
+    assert [sample[0] for sample in ring.samples()] == list(range(CAPACITY + 1, 2 * CAPACITY))
+
+
+def test_a_new_ring_on_a_written_buffer_continues_the_count():
+    buffer = bytearray(ring_size(CAPACITY))
+    writer = TelemetryRing(CAPACITY, buffer)
+    for n in range(10):
+        _record(writer, n)
+    reader = TelemetryRing(CAPACITY, buffer)
+    assert reader.written == 10 and reader.count == 10
+    assert [sample[0] for sample in reader.samples(3)] == [7, 8, 9]
+
+
+def test_shared_memory_roundtrip():
+    ring = TelemetryRing.create(CAPACITY)
+    reader = TelemetryRing.attach(ring.name, CAPACITY)
+    try:
+        assert reader.written == 0
+        for n in range(CAPACITY + 2):
+            _record(ring, n)
+        assert reader.written == CAPACITY + 2
+        assert reader.samples(4) == ring.samples(4)
+        assert [sample[0] for sample in reader.samples(4)] == [6, 7, 8, 9]
+    finally:
+        reader.close()
+        ring.close()
+    assert ring.name is None
+
+
+def test_reader_never_returns_torn_samples_under_a_concurrent_writer():
+    buffer = bytearray(ring_size(CAPACITY))
+    writer = TelemetryRing(CAPACITY, buffer)
+    reader = TelemetryRing(CAPACITY, buffer)
+    done = threading.Event()
+
+    def write():
+        for n in range(1, 50001):
+            _record(writer, n)
+        done.set()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        while not done.is_set():
+            samples = reader.samples()
+            for sample in samples:
+                _check(sample)
+            times = [sample[0] for sample in samples]
+            assert times == list(range(times[0], times[0] + len(times))) if times else True
+    finally:
+        done.set()
+        thread.join()
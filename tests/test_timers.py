@@ -0,0 +1,132 @@
+"""Testes da roda de timers (pygopher.timers) com um relógio falso."""
+import random
+
+from pygopher.timers import TICK_SECONDS, WHEEL_SLOTS, TimerWheel
+
+FRAME = 1 / 150
+TURN = WHEEL_SLOTS * TICK_SECONDS # Uma volta da roda
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wheel():
+    clock = FakeClock()
+    return clock, TimerWheel(clock=clock)
+
+
+def _run(clock, wheel, until, step=FRAME):
+    while clock.now < until:
+        clock.now += step
+        wheel.advance()
+
+
+def test_timers_never_fire_early_and_are_at_most_a_tick_and_a_frame_late():
+    clock, wheel = _wheel()
+    rng = random.Random(1)
+    lateness = []
+    for _ in range(2000):
+        delay = rng.uniform(0.0, 3 * TURN) # Inclui timers além de uma volta
+        wheel.schedule(delay, lambda deadline: lateness.append(clock.now - deadline), delay)
+    _run(clock, wheel, 3 * TURN + 1.0)
+    assert len(lateness) == 2000 and wheel.pending == 0
+    assert min(lateness) >= 0.0
+    assert max(lateness) <= TICK_SECONDS + FRAME + 1e-9
+
+
+def test_cancelled_timer_does_not_fire():
+    clock, wheel = _wheel()
+    fired = []
+    timer = wheel.schedule(0.1, fired.append, 'a')
+    wheel.schedule(0.2, fired.append, 'b')
+    timer.cancel()
+    timer.cancel() # Cancelar de novo não muda as contas
+    assert not timer.active and wheel.pending == 1
+    _run(clock, wheel, 0.5)
+    assert fired == ['b']
+    assert wheel.fired == 1
+
+
+def test_wheel_with_only_cancelled_timers_is_cleared():
+    clock, wheel = _wheel()
+    for delay in (0.1, 5 * TURN):
+        wheel.schedule(delay, int).cancel()
+    clock.now = 0.05
+    wheel.advance()
+    assert wheel.cancelled == 0 and not wheel.overflow
+    assert not any(wheel.slots)
+
+
+def test_repeating_timer_follows_its_deadlines_without_drift():
+    clock, wheel = _wheel()
+    fires = []
+    timer = wheel.schedule(1 / 12, lambda: fires.append(clock.now), interval=1 / 12)
+    _run(clock, wheel, 10.0)
+    timer.cancel()
+    assert len(fires) == 120
+    for n, when in enumerate(fires, 1):
+        assert n / 12 <= when <= n / 12 + TICK_SECONDS + FRAME
+    assert wheel.pending == 0
+
+
+def test_far_timer_waits_in_overflow_and_enters_on_its_turn():
+    clock, wheel = _wheel()
+    fired = []
+    delay = 2.5 * TURN
+    wheel.schedule(delay, lambda: fired.append(clock.now))
+    assert sum(len(bucket) for bucket in wheel.overflow.values()) == 1
+    assert not any(wheel.slots)
+    _run(clock, wheel, delay - FRAME)
+    assert fired == []
+    _run(clock, wheel, delay + 2 * FRAME)
+    assert len(fired) == 1 and delay <= fired[0] <= delay + TICK_SECONDS + FRAME
+
+
+def test_slot_index_wraps_around_the_wheel():
+    clock, wheel = _wheel()
+    clock.now = TURN - 0.01 # Perto do fim de uma volta: o prazo cai no começo da seguinte
+    wheel.advance()
+    fired = []
+    wheel.schedule(0.02, lambda: fired.append(clock.now))
+    _run(clock, wheel, TURN + 0.05, step=TICK_SECONDS)
+    assert len(fired) == 1 and fired[0] >= TURN + 0.01 - 1e-9
+
+
+def test_jump_longer_than_a_turn_fires_in_deadline_order():
+    clock, wheel = _wheel()
+    order = []
+    for delay in (0.9, 0.1, 3 * TURN, 0.5):
+        wheel.schedule(delay, order.append, delay)
+    repeating = wheel.schedule(0.2, order.append, 'periódico', interval=0.2)
+    later = wheel.schedule(10 * TURN, order.append, 'depois')
+    clock.now = 4 * TURN # Ex: volta da suspensão
+    wheel.advance()
+    assert order == [0.1, 'periódico', 0.5, 0.9, 3 * TURN]
+    assert repeating.deadline > clock.now # Um único disparo pelo período perdido
+    assert later.active
+    _run(clock, wheel, 10 * TURN + 0.1, step=0.05)
+    assert order[-1] == 'depois'
+
+
+def test_callback_can_schedule_without_firing_in_the_same_tick():
+    clock, wheel = _wheel()
+    fired = []
+
+    def chain():
+        fired.append(clock.now)
+        if len(fired) < 3:
+            wheel.schedule(0.0, chain)
+
+    wheel.schedule(0.01, chain)
+    clock.now = 0.05
+    wheel.advance()
+    # O 1º (tick 5) reagenda para o prazo 0,05 (tick 25), que ainda vence nesta chamada; o 2º, já no
+    # tick 25, cai no tick seguinte ao que está sendo processado e fica para a próxima
+    assert len(fired) == 2
+    _run(clock, wheel, 0.1, step=TICK_SECONDS)
+    assert len(fired) == 3